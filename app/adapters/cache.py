@@ -0,0 +1,345 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, NamedTuple
+
+from django.conf import settings
+from django.core.cache import cache as default_cache
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+from app.adapters.event_bus import get_event_bus
+from app.ports.events import EventBusPort
+
+INVALIDATION_TOPIC = "cache:invalidate"
+_VERSION_KEY_PREFIX = "cachever:"
+_VERSION_CHECK_SECONDS = 30.0
+
+
+@dataclass(frozen=True)
+class CacheFamily:
+    """A group of keys sharing lifetimes and an invalidation version.
+
+    `timeout` is the shared (Redis) lifetime, `local_timeout` how long a process may serve the value from memory.
+    With `soft_timeout` set, a shared entry counts as fresh only that long; between the soft and the hard
+    (`timeout`) deadline it is still handed out by `get_stale()` so the caller can answer at once and refresh in the
+    background. `negative_timeout` is how long a `TOMBSTONE` ("upstream says this does not exist") is kept.
+    Families with `shared=False` only live in process memory (the source of truth is already the database).
+    `clone` copies values in and out of L1 so callers never share mutable objects.
+    """
+
+    name: str
+    timeout: int | None
+    local_timeout: float
+    max_entries: int = 1024
+    shared: bool = True
+    clone: Callable[[Any], Any] = copy.deepcopy
+    soft_timeout: int | None = None
+    negative_timeout: int = 60
+
+
+class _Tombstone:
+    def __repr__(self) -> str:
+        return "TOMBSTONE"
+
+    def __reduce__(self) -> str:
+        # Unpickles to the module singleton, so `value is TOMBSTONE` holds for values read back from Redis.
+        return "TOMBSTONE"
+
+
+TOMBSTONE = _Tombstone()
+
+
+class _Envelope(NamedTuple):
+    soft_until: float
+    value: Any
+
+
+def _shared(value: Any) -> Any:
+    # Immutable values (interned `Pokemon`) are handed out as they are.
+    return value
+
+
+POKEMON = CacheFamily("poke", timeout=24 * 3600, local_timeout=3600, max_entries=2048, clone=_shared, soft_timeout=3600)
+POKEMON_PAGES = CacheFamily(
+    "pokelist", timeout=3600, local_timeout=60, max_entries=256, clone=list, soft_timeout=10 * 60
+)
+TYPE_CHART = CacheFamily(
+    "typechart", timeout=7 * 24 * 3600, local_timeout=24 * 3600, max_entries=64, clone=dict, soft_timeout=24 * 3600
+)
+SPECIES = CacheFamily("species", timeout=None, local_timeout=3600, max_entries=4096, shared=False, clone=_shared)
+
+
+class _Counters:
+    __slots__ = ("l1_hits", "l2_hits", "stale_hits", "negative_hits", "misses", "sets", "evictions", "invalidations")
+
+    def __init__(self):
+        for name in self.__slots__:
+            setattr(self, name, 0)
+
+    def as_dict(self) -> dict[str, int]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class TieredCache:
+    """Bounded per-process LRU (L1) in front of Django's cache (L2).
+
+    Every family carries a version kept in L2. L2 entries are written under that version (Django's cache key
+    versioning), and L1 entries remember the version they were filled at, so `invalidate()` retires both tiers
+    everywhere. Other processes learn about a bump through the event bus, or at the latest on their next periodic
+    version check.
+
+    Soft deadlines are wall-clock times stored with the shared entry, so every process agrees on when it went stale.
+    """
+
+    def __init__(
+        self,
+        backend=None,
+        events: EventBusPort | None = None,
+        *,
+        version_check_seconds: float = _VERSION_CHECK_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+        wall_clock: Callable[[], float] = time.time,
+    ):
+        self.backend = backend if backend is not None else default_cache
+        self.events = events
+        self.version_check_seconds = version_check_seconds
+        self.clock = clock
+        self.wall_clock = wall_clock
+        self._lock = threading.Lock()
+        self._local: dict[str, OrderedDict[str, tuple[float, int, Any]]] = {}
+        self._versions: dict[str, int] = {}
+        self._versions_checked_at = clock()
+        self._counters: dict[str, _Counters] = {}
+
+    def _family_state(self, family: CacheFamily) -> tuple[OrderedDict, _Counters]:
+        entries = self._local.get(family.name)
+        if entries is None:
+            entries = self._local[family.name] = OrderedDict()
+        counters = self._counters.get(family.name)
+        if counters is None:
+            counters = self._counters[family.name] = _Counters()
+        return entries, counters
+
+    def refresh_versions(self) -> None:
+        names = list(self._versions)
+        if not names:
+            return
+        stored = self.backend.get_many([_VERSION_KEY_PREFIX + name for name in names])
+        with self._lock:
+            self._versions_checked_at = self.clock()
+            for name in names:
+                version = int(stored.get(_VERSION_KEY_PREFIX + name) or 1)
+                if version != self._versions.get(name):
+                    self._versions[name] = version
+                    self._local.pop(name, None)
+
+    def _version(self, family: CacheFamily) -> int:
+        if self.clock() - self._versions_checked_at >= self.version_check_seconds:
+            self.refresh_versions()
+        version = self._versions.get(family.name)
+        if version is None:
+            version = int(self.backend.get(_VERSION_KEY_PREFIX + family.name) or 1)
+            with self._lock:
+                version = self._versions.setdefault(family.name, version)
+        return version
+
+    def _get_local(self, family: CacheFamily, key: str, version: int) -> tuple[bool, Any]:
+        with self._lock:
+            entries, counters = self._family_state(family)
+            entry = entries.get(key)
+            if entry is None:
+                return False, None
+            expires_at, entry_version, value = entry
+            if entry_version != version:
+                del entries[key]
+                return False, None
+            if expires_at <= self.clock():
+                # Expired entries stay until evicted so `get_stale()` can still serve them while upstream is down.
+                return False, None
+            entries.move_to_end(key)
+            if value is TOMBSTONE:
+                counters.negative_hits += 1
+            else:
+                counters.l1_hits += 1
+        return True, _clone(family, value)
+
+    def _set_local(self, family: CacheFamily, items: dict[str, tuple[Any, float]], version: int) -> None:
+        """`items` maps keys to (value, seconds it may be served as fresh)."""
+        now = self.clock()
+        with self._lock:
+            entries, counters = self._family_state(family)
+            for key, (value, fresh_for) in items.items():
+                entries[key] = (now + min(fresh_for, family.local_timeout), version, _clone(family, value))
+                entries.move_to_end(key)
+            while len(entries) > family.max_entries:
+                entries.popitem(last=False)
+                counters.evictions += 1
+
+    def _count(self, family: CacheFamily, field: str, amount: int = 1) -> None:
+        if amount:
+            with self._lock:
+                counters = self._family_state(family)[1]
+                setattr(counters, field, getattr(counters, field) + amount)
+
+    def get(self, family: CacheFamily, key: str) -> Any | None:
+        return self.get_many(family, [key]).get(key)
+
+    def get_many(self, family: CacheFamily, keys: list[str]) -> dict[str, Any]:
+        version = self._version(family)
+        found: dict[str, Any] = {}
+        missing: list[str] = []
+        for key in keys:
+            hit, value = self._get_local(family, key, version)
+            if hit:
+                found[key] = value
+            else:
+                missing.append(key)
+        if not missing:
+            return found
+
+        fresh: dict[str, tuple[Any, float]] = {}
+        stale: dict[str, tuple[Any, float]] = {}
+        if family.shared:
+            now = self.wall_clock()
+            for key, stored in self.backend.get_many(missing, version=version).items():
+                if stored is TOMBSTONE:
+                    fresh[key] = (stored, float(family.negative_timeout))
+                elif not isinstance(stored, _Envelope):
+                    fresh[key] = (stored, family.local_timeout)
+                elif stored.soft_until > now:
+                    fresh[key] = (stored.value, stored.soft_until - now)
+                else:
+                    # Past its soft deadline: keep it in L1 for `get_stale()`, but report a miss.
+                    stale[key] = (stored.value, 0.0)
+            if fresh or stale:
+                self._set_local(family, {**stale, **fresh}, version)
+                found.update({key: value for key, (value, _) in fresh.items()})
+        negative = sum(1 for value, _ in fresh.values() if value is TOMBSTONE)
+        self._count(family, "l2_hits", len(fresh) - negative)
+        self._count(family, "negative_hits", negative)
+        self._count(family, "misses", len(missing) - len(fresh))
+        return found
+
+    def get_stale(self, family: CacheFamily, key: str) -> Any | None:
+        """Last value this process held for `key`, even past its local lifetime (but not across invalidations).
+
+        Tombstones are never served stale: once one lapses, the next lookup asks upstream again.
+        """
+        version = self._version(family)
+        with self._lock:
+            entry = self._family_state(family)[0].get(key)
+            if entry is None or entry[1] != version or entry[2] is TOMBSTONE:
+                return None
+            self._counters[family.name].stale_hits += 1
+            value = entry[2]
+        return family.clone(value)
+
+    def set(self, family: CacheFamily, key: str, value: Any) -> None:
+        self.set_many(family, {key: value})
+
+    def set_many(self, family: CacheFamily, items: dict[str, Any]) -> None:
+        if not items:
+            return
+        version = self._version(family)
+        fresh_for = float(family.soft_timeout or family.timeout or family.local_timeout)
+        if family.shared:
+            if family.soft_timeout:
+                soft_until = self.wall_clock() + family.soft_timeout
+                stored = {key: _Envelope(soft_until, value) for key, value in items.items()}
+            else:
+                stored = items
+            self.backend.set_many(stored, timeout=family.timeout, version=version)
+        self._set_local(family, {key: (value, fresh_for) for key, value in items.items()}, version)
+        self._count(family, "sets", len(items))
+
+    def set_missing(self, family: CacheFamily, keys: list[str]) -> None:
+        """Remembers for `negative_timeout` seconds that upstream has nothing under `keys`."""
+        if not keys:
+            return
+        version = self._version(family)
+        if family.shared:
+            self.backend.set_many(dict.fromkeys(keys, TOMBSTONE), timeout=family.negative_timeout, version=version)
+        self._set_local(family, {key: (TOMBSTONE, float(family.negative_timeout)) for key in keys}, version)
+
+    def delete_many(self, family: CacheFamily, keys: list[str]) -> None:
+        """Drops keys from this process (and L2); other processes keep theirs until expiry or `invalidate()`."""
+        version = self._version(family)
+        if family.shared:
+            self.backend.delete_many(keys, version=version)
+        with self._lock:
+            entries = self._family_state(family)[0]
+            for key in keys:
+                entries.pop(key, None)
+
+    def invalidate(self, family: CacheFamily) -> None:
+        key = _VERSION_KEY_PREFIX + family.name
+        self.backend.add(key, 1, timeout=None)
+        try:
+            version = int(self.backend.incr(key))
+        except ValueError:
+            # The version key was evicted between add() and incr(); start a fresh sequence.
+            version = int(self.clock() * 1000)
+            self.backend.set(key, version, timeout=None)
+        with self._lock:
+            self._versions[family.name] = version
+            self._local.pop(family.name, None)
+            self._family_state(family)[1].invalidations += 1
+        if self.events is not None:
+            self.events.publish(INVALIDATION_TOPIC)
+
+    def clear_local(self) -> None:
+        with self._lock:
+            self._local.clear()
+            self._versions.clear()
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        with self._lock:
+            out = {}
+            for name, counters in self._counters.items():
+                out[name] = counters.as_dict()
+                out[name]["l1_entries"] = len(self._local.get(name, ()))
+            return out
+
+
+def _clone(family: CacheFamily, value: Any) -> Any:
+    return value if value is TOMBSTONE else family.clone(value)
+
+
+def _listen_for_invalidations(tiered: TieredCache) -> None:
+    while True:
+        try:
+            with tiered.events.listen(INVALIDATION_TOPIC) as subscription:
+                woke = subscription.wait(tiered.version_check_seconds)
+            if woke:
+                tiered.refresh_versions()
+        except Exception:
+            time.sleep(1.0)
+
+
+_tiered: TieredCache | None = None
+_tiered_lock = threading.Lock()
+
+
+def get_tiered_cache() -> TieredCache:
+    global _tiered
+    if _tiered is None:
+        with _tiered_lock:
+            if _tiered is None:
+                tiered = TieredCache(events=get_event_bus())
+                if settings.REDIS_URL:
+                    # Redis pub/sub is the only way other workers publish a bump; without Redis every worker is
+                    # its own process-local world and `invalidate()` already updated it.
+                    threading.Thread(
+                        target=_listen_for_invalidations, args=(tiered,), name="cache-invalidation", daemon=True
+                    ).start()
+                _tiered = tiered
+    return _tiered
+
+
+@receiver(setting_changed)
+def _reset_tiered_cache(setting, **kwargs) -> None:
+    if setting == "CACHES" and _tiered is not None:
+        _tiered.clear_local()
@@ -0,0 +1,189 @@
+import logging
+import struct
+from typing import Any
+
+from django.core.cache.backends.redis import RedisSerializer
+
+from app.adapters.cache import TOMBSTONE, _Envelope
+from app.domain.entities import Pokemon, Stats
+
+logger = logging.getLogger(__name__)
+
+# Every compact value starts with MAGIC + SCHEMA_VERSION; anything else in Redis is a pickle (or a bare int).
+# Changing a layout or a table below needs a new SCHEMA_VERSION, and decode() must keep reading the old one until
+# those entries have expired from Redis.
+MAGIC = b"\x00K"
+SCHEMA_VERSION = 1
+
+# Append-only: the index of a name is what is stored.
+TYPE_NAMES = (
+    "normal",
+    "fire",
+    "water",
+    "electric",
+    "grass",
+    "ice",
+    "fighting",
+    "poison",
+    "ground",
+    "flying",
+    "psychic",
+    "bug",
+    "rock",
+    "ghost",
+    "dragon",
+    "dark",
+    "steel",
+    "fairy",
+    "stellar",
+    "unknown",
+    "shadow",
+)
+_TYPE_IDS = {name: i for i, name in enumerate(TYPE_NAMES)}
+MULTIPLIERS = (0.0, 0.25, 0.5, 1.0, 2.0, 4.0)
+_MULTIPLIER_IDS = {m: i for i, m in enumerate(MULTIPLIERS)}
+
+_POKEMON, _ENVELOPE, _TOMBSTONE, _INDEX, _ID_LIST, _TYPE_ROW = range(1, 7)
+
+_HEADER = struct.Struct("<2sBB")
+_POKEMON_HEAD = struct.Struct("<I4HBB")  # id, hp, attack, defense, speed, name length, type count
+_SOFT_UNTIL = struct.Struct("<d")
+_COUNT = struct.Struct("<I")
+
+
+def _encode_pokemon(p: Pokemon) -> bytes | None:
+    if not 0 <= p.id < 2**32:
+        return None
+    stats = [p.stats.hp, p.stats.attack, p.stats.defense, p.stats.speed]
+    name = p.name.encode("utf-8")
+    if any(type(v) is not int or not 0 <= v < 2**16 for v in stats) or len(name) > 255 or len(p.types) > 255:
+        return None
+    type_ids = [_TYPE_IDS.get(t) for t in p.types]
+    if None in type_ids:
+        return None
+    return _POKEMON_HEAD.pack(p.id, *stats, len(name), len(type_ids)) + name + bytes(type_ids)
+
+
+def _decode_pokemon(data: memoryview) -> Pokemon:
+    pokemon_id, hp, attack, defense, speed, name_len, type_count = _POKEMON_HEAD.unpack_from(data)
+    offset = _POKEMON_HEAD.size
+    name = bytes(data[offset : offset + name_len]).decode("utf-8")
+    types = [TYPE_NAMES[i] for i in data[offset + name_len : offset + name_len + type_count]]
+    return Pokemon.of(pokemon_id, name, types, Stats(hp, attack, defense, speed))
+
+
+def _pack_ids(ids: list) -> bytes | None:
+    if any(type(x) is not int or not 0 <= x < 2**32 for x in ids):
+        return None
+    width = "H" if max(ids, default=0) < 2**16 else "I"
+    return _COUNT.pack(len(ids)) + width.encode() + struct.pack(f"<{len(ids)}{width}", *ids)
+
+
+def _unpack_ids(data: memoryview) -> tuple[tuple[int, ...], int]:
+    """Returns the ids and the number of bytes they took."""
+    (count,) = _COUNT.unpack_from(data)
+    fmt = f"<{count}{chr(data[_COUNT.size])}"
+    return struct.unpack_from(fmt, data, _COUNT.size + 1), _COUNT.size + 1 + struct.calcsize(fmt)
+
+
+def _encode_index(entries: list) -> bytes | None:
+    # Ids as one packed array and names as one newline-joined blob: decoding is two C-level calls, not a loop.
+    if any(type(e) is not tuple or len(e) != 2 or type(e[1]) is not str or "\n" in e[1] for e in entries):
+        return None
+    ids = _pack_ids([e[0] for e in entries])
+    if ids is None:
+        return None
+    return ids + "\n".join(e[1] for e in entries).encode("utf-8")
+
+
+def _decode_index(data: memoryview) -> list[tuple[int, str]]:
+    ids, used = _unpack_ids(data)
+    names = bytes(data[used:]).decode("utf-8").split("\n") if ids else []
+    return list(zip(ids, names))
+
+
+def _decode_id_list(data: memoryview) -> list[int]:
+    return list(_unpack_ids(data)[0])
+
+
+def _encode_type_row(row: dict) -> bytes | None:
+    pairs = [(_TYPE_IDS.get(t), _MULTIPLIER_IDS.get(m)) for t, m in row.items()]
+    if len(pairs) > 255 or any(t is None or m is None for t, m in pairs):
+        return None
+    return bytes([len(pairs)]) + bytes(b for pair in pairs for b in pair)
+
+
+def _decode_type_row(data: memoryview) -> dict[str, float]:
+    count = data[0]
+    return {TYPE_NAMES[data[1 + 2 * i]]: MULTIPLIERS[data[2 + 2 * i]] for i in range(count)}
+
+
+def encode(value: Any) -> bytes | None:
+    """Compact bytes for the shapes the PokeAPI caches hold, or None if `value` is anything else."""
+    if value is TOMBSTONE:
+        kind, body = _TOMBSTONE, b""
+    elif type(value) is _Envelope:
+        inner = encode(value.value)
+        if inner is None:
+            return None
+        kind, body = _ENVELOPE, _SOFT_UNTIL.pack(value.soft_until) + inner
+    elif type(value) is Pokemon:
+        kind, body = _POKEMON, _encode_pokemon(value)
+    elif type(value) is list and value and type(value[0]) is tuple:
+        kind, body = _INDEX, _encode_index(value)
+    elif type(value) is list:
+        kind, body = _ID_LIST, _pack_ids(value)
+    elif type(value) is dict and all(type(m) is float for m in value.values()):
+        kind, body = _TYPE_ROW, _encode_type_row(value)
+    else:
+        return None
+    if body is None:
+        return None
+    return _HEADER.pack(MAGIC, SCHEMA_VERSION, kind) + body
+
+
+def decode(data: bytes) -> Any:
+    magic, version, kind = _HEADER.unpack_from(data)
+    if magic != MAGIC or version != SCHEMA_VERSION:
+        raise ValueError(f"Unsupported cache encoding {magic!r} v{version}.")
+    body = memoryview(data)[_HEADER.size :]
+    if kind == _TOMBSTONE:
+        return TOMBSTONE
+    if kind == _ENVELOPE:
+        (soft_until,) = _SOFT_UNTIL.unpack_from(body)
+        return _Envelope(soft_until, decode(bytes(body[_SOFT_UNTIL.size :])))
+    if kind == _POKEMON:
+        return _decode_pokemon(body)
+    if kind == _INDEX:
+        return _decode_index(body)
+    if kind == _ID_LIST:
+        return _decode_id_list(body)
+    if kind == _TYPE_ROW:
+        return _decode_type_row(body)
+    raise ValueError(f"Unknown cache record kind {kind}.")
+
+
+class CompactRedisSerializer(RedisSerializer):
+    """Django's Redis serializer, with struct-packed records for Pokémon, name index, id pages and type chart rows.
+
+    Other values (and anything that does not fit a record layout) still go through pickle, and bare ints stay
+    plain so `incr()` keeps working.
+    """
+
+    def dumps(self, obj):
+        if type(obj) is not int:
+            packed = encode(obj)
+            if packed is not None:
+                return packed
+        return super().dumps(obj)
+
+    def loads(self, data):
+        if isinstance(data, bytes) and data[:2] == MAGIC:
+            try:
+                return decode(data)
+            except (ValueError, struct.error) as exc:
+                # Written by a release with another SCHEMA_VERSION (rolling deploy): read it as a miss so the
+                # caller reloads and overwrites it in this release's format.
+                logger.warning("Treating unreadable cache record as a miss: %s", exc)
+                return None
+        return super().loads(data)
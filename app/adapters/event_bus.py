@@ -0,0 +1,124 @@
+import threading
+import time
+
+import redis
+from django.conf import settings
+
+from app.ports.events import EventBusPort, EventSubscription
+
+_CHANNEL_PREFIX = "pokus:events:"
+
+
+class _LocalSubscription(EventSubscription):
+    def __init__(self, bus: "EventBusLocal", topic: str):
+        self.bus = bus
+        self.topic = topic
+        self.seen = bus._generation(topic)
+
+    def wait(self, timeout: float) -> bool:
+        deadline = time.monotonic() + max(0.0, float(timeout))
+        with self.bus._cond:
+            while self.bus._generations.get(self.topic, 0) == self.seen:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self.bus._cond.wait(remaining)
+            self.seen = self.bus._generations.get(self.topic, 0)
+            return True
+
+    def close(self) -> None:
+        return
+
+    def __enter__(self) -> "_LocalSubscription":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class EventBusLocal(EventBusPort):
+    """In-process wakeups; only reaches waiters inside the same worker process."""
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._generations: dict[str, int] = {}
+
+    def _generation(self, topic: str) -> int:
+        with self._cond:
+            return self._generations.get(topic, 0)
+
+    def publish(self, topic: str) -> None:
+        with self._cond:
+            self._generations[topic] = self._generations.get(topic, 0) + 1
+            self._cond.notify_all()
+
+    def listen(self, topic: str) -> _LocalSubscription:
+        return _LocalSubscription(self, topic)
+
+
+class _RedisSubscription(EventSubscription):
+    def __init__(self, client: redis.Redis, topic: str):
+        self.pubsub = client.pubsub(ignore_subscribe_messages=True)
+        try:
+            self.pubsub.subscribe(_CHANNEL_PREFIX + topic)
+        except redis.RedisError:
+            self.close()
+            self.pubsub = None
+
+    def wait(self, timeout: float) -> bool:
+        deadline = time.monotonic() + max(0.0, float(timeout))
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            if self.pubsub is None:
+                # Redis is unreachable: degrade to a plain sleep so callers fall back to re-polling.
+                time.sleep(remaining)
+                return False
+            try:
+                if self.pubsub.get_message(timeout=remaining) is not None:
+                    return True
+            except redis.RedisError:
+                self.close()
+                self.pubsub = None
+
+    def close(self) -> None:
+        if self.pubsub is None:
+            return
+        try:
+            self.pubsub.close()
+        except redis.RedisError:
+            return
+
+    def __enter__(self) -> "_RedisSubscription":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class EventBusRedis(EventBusPort):
+    def __init__(self, url: str | None = None):
+        self.client = redis.Redis.from_url(url or settings.REDIS_URL)
+
+    def publish(self, topic: str) -> None:
+        try:
+            self.client.publish(_CHANNEL_PREFIX + topic, "1")
+        except redis.RedisError:
+            return
+
+    def listen(self, topic: str) -> _RedisSubscription:
+        return _RedisSubscription(self.client, topic)
+
+
+_bus: EventBusPort | None = None
+_bus_lock = threading.Lock()
+
+
+def get_event_bus() -> EventBusPort:
+    global _bus
+    if _bus is None:
+        with _bus_lock:
+            if _bus is None:
+                _bus = EventBusRedis() if settings.REDIS_URL else EventBusLocal()
+    return _bus
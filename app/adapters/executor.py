@@ -0,0 +1,119 @@
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Iterable
+
+from django.conf import settings
+
+
+class ExecutorSaturated(RuntimeError):
+    """The shared I/O pool and its queue are full; the caller should shed the request (HTTP 503)."""
+
+
+class BoundedExecutor:
+    """One process-wide thread pool for outbound I/O fan-out.
+
+    At most `max_workers + max_queue` tasks are admitted at a time; beyond that `submit()` raises
+    `ExecutorSaturated` immediately instead of letting work (and request latency) pile up behind a slow upstream.
+    `map()` runs one share of the work on the calling thread and caps how many pool slots a single call may take.
+    """
+
+    def __init__(self, max_workers: int = 16, max_queue: int = 64, name: str = "io"):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue)
+        self._lock = threading.Lock()
+        self._admitted = 0
+        self._running = 0
+        self._peak_admitted = 0
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._wait_ms_total = 0.0
+
+    def _admit(self, count: int) -> None:
+        taken = 0
+        while taken < count and self._slots.acquire(blocking=False):
+            taken += 1
+        if taken < count:
+            for _ in range(taken):
+                self._slots.release()
+            with self._lock:
+                self._rejected += 1
+            raise ExecutorSaturated("I/O pool is saturated.")
+        with self._lock:
+            self._admitted += count
+            self._submitted += count
+            self._peak_admitted = max(self._peak_admitted, self._admitted)
+
+    def _wrap(self, fn: Callable[..., Any], args: tuple) -> Callable[[], Any]:
+        queued_at = time.monotonic()
+
+        def run() -> Any:
+            with self._lock:
+                self._running += 1
+                self._wait_ms_total += (time.monotonic() - queued_at) * 1000
+            failed = False
+            try:
+                return fn(*args)
+            except BaseException:
+                failed = True
+                raise
+            finally:
+                with self._lock:
+                    self._running -= 1
+                    self._admitted -= 1
+                    self._completed += 1
+                    self._failed += int(failed)
+                self._slots.release()
+
+        return run
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> Future:
+        self._admit(1)
+        return self._pool.submit(self._wrap(fn, args))
+
+    def map(self, fn: Callable[[Any], Any], items: Iterable[Any], *, max_parallel: int = 6) -> list[Any]:
+        items = list(items)
+        shares = max(1, min(max_parallel, len(items)))
+        if shares == 1:
+            return [fn(item) for item in items]
+
+        chunks = [items[i::shares] for i in range(shares)]
+        self._admit(shares - 1)
+        futures = [self._pool.submit(self._wrap(lambda chunk: [fn(x) for x in chunk], (c,))) for c in chunks[1:]]
+        results: list[Any] = [None] * len(items)
+        results[0::shares] = [fn(x) for x in chunks[0]]
+        for i, future in enumerate(futures, 1):
+            results[i::shares] = future.result()
+        return results
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "running": self._running,
+                "queued": self._admitted - self._running,
+                "peak_admitted": self._peak_admitted,
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "failed": self._failed,
+                "rejected": self._rejected,
+                "queue_wait_ms_avg": round(self._wait_ms_total / self._completed, 2) if self._completed else 0.0,
+            }
+
+
+_executor: BoundedExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def get_io_executor() -> BoundedExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = BoundedExecutor(settings.IO_EXECUTOR_WORKERS, settings.IO_EXECUTOR_QUEUE)
+    return _executor
@@ -0,0 +1,193 @@
+import random
+import threading
+import time
+from typing import Any, Callable
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+_RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """Raised without touching the network while a host's breaker is open."""
+
+
+class CircuitBreaker:
+    """Opens after `failure_threshold` consecutive failures, then lets one probe through every `reset_seconds`."""
+
+    def __init__(
+        self, failure_threshold: int = 5, reset_seconds: float = 30.0, clock: Callable[[], float] = time.monotonic
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if self._probing or self.clock() - self._opened_at >= self.reset_seconds:
+                return "half-open"
+            return "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if self._probing or self.clock() - self._opened_at < self.reset_seconds:
+                return False
+            self._probing = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._probing or self._failures >= self.failure_threshold:
+                self._opened_at = self.clock()
+            self._probing = False
+
+
+class _HostStats:
+    __slots__ = ("requests", "errors", "retries", "short_circuits", "latency_ms_total", "latency_ms_max")
+
+    def __init__(self):
+        for name in self.__slots__:
+            setattr(self, name, 0)
+
+    def as_dict(self) -> dict[str, float]:
+        out = {name: getattr(self, name) for name in self.__slots__}
+        out["latency_ms_avg"] = round(self.latency_ms_total / self.requests, 2) if self.requests else 0.0
+        return out
+
+
+class PooledHttpClient:
+    """Keep-alive HTTP client shared by a process: pooled connections, bounded retries with full jitter and a
+    circuit breaker per host.
+
+    Only connection errors, timeouts and 429/5xx responses are retried or count against the breaker; other 4xx
+    answers are the upstream working as intended and are raised straight away.
+    """
+
+    def __init__(
+        self,
+        *,
+        pool_size: int = 32,
+        retries: int = 2,
+        backoff_seconds: float = 0.2,
+        failure_threshold: int = 5,
+        reset_seconds: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.retries = retries
+        self.backoff_seconds = backoff_seconds
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.clock = clock
+        self.sleep = sleep
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._lock = threading.Lock()
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self._stats: dict[str, _HostStats] = {}
+
+    def breaker(self, host: str) -> CircuitBreaker:
+        with self._lock:
+            breaker = self._breakers.get(host)
+            if breaker is None:
+                breaker = self._breakers[host] = CircuitBreaker(self.failure_threshold, self.reset_seconds, self.clock)
+                self._stats[host] = _HostStats()
+            return breaker
+
+    def _count(self, host: str, **deltas: float) -> None:
+        with self._lock:
+            stats = self._stats[host]
+            for name, delta in deltas.items():
+                setattr(stats, name, getattr(stats, name) + delta)
+
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(0, self.backoff_seconds * (2**attempt))
+
+    def get(self, url: str, *, timeout: float = 5) -> requests.Response:
+        host = urlsplit(url).netloc
+        breaker = self.breaker(host)
+        if not breaker.allow():
+            self._count(host, short_circuits=1)
+            raise CircuitOpenError(f"Circuit open for {host}.")
+
+        attempt = 0
+        while True:
+            started = self.clock()
+            error: requests.RequestException | None = None
+            resp: requests.Response | None = None
+            try:
+                resp = self.session.get(url, timeout=timeout)
+            except (requests.ConnectionError, requests.Timeout) as exc:
+                error = exc
+            except requests.RequestException:
+                breaker.record_failure()
+                raise
+            elapsed_ms = (self.clock() - started) * 1000
+            with self._lock:
+                stats = self._stats[host]
+                stats.requests += 1
+                stats.latency_ms_total += elapsed_ms
+                stats.latency_ms_max = max(stats.latency_ms_max, elapsed_ms)
+
+            retryable = error is not None or resp.status_code in _RETRYABLE_STATUSES
+            if not retryable:
+                breaker.record_success()
+                resp.raise_for_status()
+                return resp
+
+            self._count(host, errors=1)
+            if attempt >= self.retries:
+                breaker.record_failure()
+                if error is not None:
+                    raise error
+                resp.raise_for_status()
+                return resp
+            attempt += 1
+            self._count(host, retries=1)
+            self.sleep(self._backoff(attempt - 1))
+
+    def get_json(self, url: str, *, timeout: float = 5) -> Any:
+        return self.get(url, timeout=timeout).json()
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        with self._lock:
+            hosts = dict(self._stats)
+            breakers = dict(self._breakers)
+        out = {}
+        for host, stats in hosts.items():
+            out[host] = stats.as_dict()
+            out[host]["circuit"] = breakers[host].state
+        return out
+
+
+_client: PooledHttpClient | None = None
+_client_lock = threading.Lock()
+
+
+def get_http_client() -> PooledHttpClient:
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = PooledHttpClient()
+    return _client
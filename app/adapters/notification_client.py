@@ -1,21 +1,57 @@
 import requests
 from django.conf import settings
 
-from app.ports.notification import NotificationPort
+from app.adapters.http_client import get_http_client
+from app.ports.notification import Notification, NotificationPort
+
+# Mirrors maxBatchEvents in notification/http_notify.go.
+MAX_BATCH = 500
+
+
+def _event_body(n: Notification) -> dict:
+    target = {"user_id": n.user_id} if n.battle_id is None else {"battle_id": n.battle_id}
+    return {**target, "event": n.event, "payload": n.payload}
 
 
 class NotificationHttp(NotificationPort):
-    def __init__(self, base_url: str | None = None, token: str | None = None):
+    """Client of the Go notify service over the process-wide keep-alive session."""
+
+    def __init__(self, base_url: str | None = None, token: str | None = None, session: requests.Session | None = None):
         self.base_url = base_url or settings.NOTIFICATION_SERVICE_URL
         self.token = token or settings.NOTIFICATION_SERVICE_TOKEN
+        self.session = session or get_http_client().session
+
+    def _post(self, path: str, body) -> requests.Response:
+        response = self.session.post(
+            f"{self.base_url}{path}", json=body, headers={"Authorization": f"Bearer {self.token}"}, timeout=3
+        )
+        response.raise_for_status()
+        return response
+
+    def deliver(self, user_id: int, event: str, payload: dict) -> None:
+        """Posts one notification; raises `requests.RequestException` on network errors and non-2xx replies."""
+        self._post("/notify", {"user_id": user_id, "event": event, "payload": payload})
+
+    def deliver_many(self, notifications: list[Notification]) -> list[int]:
+        """Posts notifications in `/notify/batch` calls of MAX_BATCH; returns the indexes the service rejected.
+
+        The service rejects notifications it considers invalid. Raises `requests.RequestException` like `deliver()`,
+        in which case none of them should be considered sent.
+        """
+        rejected: list[int] = []
+        for start in range(0, len(notifications), MAX_BATCH):
+            body = [_event_body(n) for n in notifications[start : start + MAX_BATCH]]
+            rejected += [start + int(i) for i in self._post("/notify/batch", body).json().get("rejected") or []]
+        return rejected
 
     def send(self, user_id: int, event: str, payload: dict) -> None:
         try:
-            requests.post(
-                f"{self.base_url}/notify",
-                json={"user_id": user_id, "event": event, "payload": payload},
-                headers={"Authorization": f"Bearer {self.token}"},
-                timeout=3,
-            )
+            self.deliver(user_id, event, payload)
+        except Exception:
+            return
+
+    def send_many(self, notifications: list[Notification]) -> None:
+        try:
+            self.deliver_many(notifications)
         except Exception:
             return
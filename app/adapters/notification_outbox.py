@@ -0,0 +1,189 @@
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Callable
+
+import redis
+import requests
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from app.adapters.notification_client import NotificationHttp
+from app.adapters.notification_redis import NotificationRedis
+from app.models import NotificationOutbox
+from app.ports.notification import Notification, NotificationPort
+
+logger = logging.getLogger(__name__)
+
+_MAX_BACKOFF_SECONDS = 300
+
+
+def notify_transport() -> NotificationHttp | NotificationRedis:
+    """The configured way to reach the notify service; plain HTTP unless NOTIFY_TRANSPORT=redis and Redis is set up."""
+    if settings.NOTIFY_TRANSPORT == "redis" and settings.REDIS_URL:
+        return NotificationRedis()
+    return NotificationHttp()
+
+
+class OutboxNotifier(NotificationPort):
+    """Queues notifications in `NotificationOutbox` inside the caller's transaction; never talks to the notify service.
+
+    A rolled-back battle change takes its notifications with it, and a committed one cannot lose them.
+    """
+
+    def send(self, user_id: int, event: str, payload: dict) -> None:
+        self.send_many([Notification(user_id, event, payload)])
+
+    def send_many(self, notifications: list[Notification]) -> None:
+        if not notifications:
+            return
+        NotificationOutbox.objects.bulk_create(
+            [
+                NotificationOutbox(user_id=n.user_id, battle_id=n.battle_id, event=n.event, payload=n.payload)
+                for n in notifications
+            ]
+        )
+        if settings.NOTIFY_OUTBOX_DISPATCHER == "thread":
+            transaction.on_commit(get_outbox_dispatcher().wake)
+
+
+class OutboxDispatcher:
+    """Delivers queued notifications in batches, at least once.
+
+    `drain_once()` claims up to `batch_size` due rows (leasing them for `lease_seconds`, so concurrent dispatchers in
+    other workers skip them and a crashed one's rows come back), sends them in one call (`/notify/batch` or one
+    Redis pipeline), deletes the delivered ones and reschedules the batch with exponential backoff if the call
+    fails. After `max_attempts`, or when the service rejects a row as invalid, the row is left in the table with its
+    `last_error` and not retried.
+    """
+
+    def __init__(
+        self,
+        transport: NotificationHttp | NotificationRedis | None = None,
+        batch_size: int | None = None,
+        max_attempts: int | None = None,
+        lease_seconds: float = 30.0,
+        poll_interval: float = 5.0,
+        clock: Callable[[], datetime] = timezone.now,
+    ):
+        self.transport = transport or notify_transport()
+        self.batch_size = max(1, batch_size or settings.NOTIFY_OUTBOX_BATCH)
+        self.max_attempts = max(1, max_attempts or settings.NOTIFY_OUTBOX_MAX_ATTEMPTS)
+        self.lease = timedelta(seconds=lease_seconds)
+        self.poll_interval = poll_interval
+        self.clock = clock
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self._sent = 0
+        self._retried = 0
+        self._dead = 0
+        self._errors = 0
+
+    def _claim(self) -> list[NotificationOutbox]:
+        now = self.clock()
+        with transaction.atomic():
+            rows = list(
+                NotificationOutbox.objects.select_for_update(skip_locked=True)
+                .filter(available_at__lte=now, attempts__lt=self.max_attempts)
+                .order_by("id")[: self.batch_size]
+            )
+            if rows:
+                NotificationOutbox.objects.filter(id__in=[row.id for row in rows]).update(
+                    available_at=now + self.lease, attempts=F("attempts") + 1
+                )
+        return rows
+
+    def _reschedule(self, rows: list[NotificationOutbox], exc: Exception) -> None:
+        now = self.clock()
+        by_attempts: dict[int, list[int]] = {}
+        for row in rows:
+            by_attempts.setdefault(row.attempts + 1, []).append(row.id)
+        for attempts, ids in by_attempts.items():
+            NotificationOutbox.objects.filter(id__in=ids).update(
+                available_at=now + timedelta(seconds=min(2**attempts, _MAX_BACKOFF_SECONDS)), last_error=str(exc)[:500]
+            )
+        dead = sum(len(ids) for attempts, ids in by_attempts.items() if attempts >= self.max_attempts)
+        with self._lock:
+            self._dead += dead
+            self._retried += len(rows) - dead
+
+    def _reject(self, rows: list[NotificationOutbox]) -> None:
+        NotificationOutbox.objects.filter(id__in=[row.id for row in rows]).update(
+            attempts=self.max_attempts, last_error="Rejected by the notify service."
+        )
+        with self._lock:
+            self._dead += len(rows)
+
+    def drain_once(self) -> int:
+        """Delivers one batch; returns how many rows it claimed."""
+        rows = self._claim()
+        if not rows:
+            return 0
+        try:
+            rejected = set(
+                self.transport.deliver_many([Notification(r.user_id, r.event, r.payload, r.battle_id) for r in rows])
+            )
+        except (requests.RequestException, redis.RedisError) as exc:
+            self._reschedule(rows, exc)
+            return len(rows)
+        if rejected:
+            self._reject([row for i, row in enumerate(rows) if i in rejected])
+        delivered = [row.id for i, row in enumerate(rows) if i not in rejected]
+        NotificationOutbox.objects.filter(id__in=delivered).delete()
+        with self._lock:
+            self._sent += len(delivered)
+        return len(rows)
+
+    def drain(self) -> None:
+        while self.drain_once() >= self.batch_size:
+            pass
+
+    def run(self) -> None:
+        """Drains on every wake-up and at least every `poll_interval` seconds (for retries) until `stop()`."""
+        while not self._stop.is_set():
+            self._wakeup.clear()
+            close_old_connections()
+            try:
+                self.drain()
+            except Exception:
+                # Claimed rows come back when their lease runs out; the thread must outlive any one bad batch.
+                logger.exception("Notification outbox drain failed")
+                with self._lock:
+                    self._errors += 1
+            self._wakeup.wait(self.poll_interval)
+        close_old_connections()
+
+    def wake(self) -> None:
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self.run, name="notify-outbox", daemon=True)
+                    self._thread.start()
+        self._wakeup.set()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wakeup.set()
+
+    def stats(self) -> dict:
+        with self._lock:
+            counters = {"sent": self._sent, "retried": self._retried, "dead": self._dead, "errors": self._errors}
+        queued = NotificationOutbox.objects.filter(attempts__lt=self.max_attempts).count()
+        return {**counters, "queued": queued, "dead_letters": NotificationOutbox.objects.count() - queued}
+
+
+_dispatcher: OutboxDispatcher | None = None
+_dispatcher_lock = threading.Lock()
+
+
+def get_outbox_dispatcher() -> OutboxDispatcher:
+    global _dispatcher
+    if _dispatcher is None:
+        with _dispatcher_lock:
+            if _dispatcher is None:
+                _dispatcher = OutboxDispatcher()
+    return _dispatcher
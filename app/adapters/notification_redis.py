@@ -0,0 +1,53 @@
+import json
+
+import redis
+from django.conf import settings
+
+from app.ports.notification import Notification, NotificationPort
+
+# notification/redis_sub.go subscribes to USER_CHANNEL_PREFIX + "*" and BATTLE_CHANNEL_PREFIX + "*".
+USER_CHANNEL_PREFIX = "pokus:notify:user:"
+BATTLE_CHANNEL_PREFIX = "pokus:notify:battle:"
+
+
+def user_channel(user_id: int) -> str:
+    return f"{USER_CHANNEL_PREFIX}{int(user_id)}"
+
+
+def battle_channel(battle_id: int) -> str:
+    return f"{BATTLE_CHANNEL_PREFIX}{int(battle_id)}"
+
+
+class NotificationRedis(NotificationPort):
+    """Publishes notifications on per-user (or per-battle, for spectators) Redis channels; every notify replica
+    subscribes and delivers to the WebSockets it holds. Same surface as `NotificationHttp`, so the outbox dispatcher
+    can use either."""
+
+    def __init__(self, url: str | None = None, client: redis.Redis | None = None):
+        self.client = client or redis.Redis.from_url(url or settings.REDIS_URL)
+
+    def deliver(self, user_id: int, event: str, payload: dict) -> None:
+        self.deliver_many([Notification(user_id, event, payload)])
+
+    def deliver_many(self, notifications: list[Notification]) -> list[int]:
+        """PUBLISHes all of them in one round trip; raises `redis.RedisError` if Redis is unreachable.
+
+        Nothing is ever rejected here: the notify service drops unsupported events on its side.
+        """
+        if not notifications:
+            return []
+        pipe = self.client.pipeline(transaction=False)
+        for n in notifications:
+            channel = user_channel(n.user_id) if n.battle_id is None else battle_channel(n.battle_id)
+            pipe.publish(channel, json.dumps({"event": n.event, "payload": n.payload}))
+        pipe.execute()
+        return []
+
+    def send(self, user_id: int, event: str, payload: dict) -> None:
+        self.send_many([Notification(user_id, event, payload)])
+
+    def send_many(self, notifications: list[Notification]) -> None:
+        try:
+            self.deliver_many(notifications)
+        except redis.RedisError:
+            return
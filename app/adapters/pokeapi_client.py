@@ -1,39 +1,207 @@
+import threading
+import uuid
+from typing import Any, Callable
+
 import requests
+from django.conf import settings
 from django.core.cache import cache
 
+from app.adapters.cache import (
+    POKEMON,
+    POKEMON_PAGES,
+    TOMBSTONE,
+    TYPE_CHART,
+    CacheFamily,
+    TieredCache,
+    get_tiered_cache,
+)
+from app.adapters.executor import ExecutorSaturated, get_io_executor
+from app.adapters.http_client import PooledHttpClient, get_http_client
+from app.adapters.search_index import NameSearchIndex
+from app.adapters.single_flight import SingleFlight
 from app.domain.entities import Pokemon
 from app.ports.pokeapi import PokeApiPort
 
+FETCH_WORKERS = 6
+_POKEMON_NOT_FOUND = "Pokémon not found."
+
+# (stamp of the cached index it was built from, index); shared by every PokeApiHttp in the process.
+_name_index: tuple[str, NameSearchIndex] | None = None
+_name_index_lock = threading.Lock()
+
+# One upstream fetch per key per expiry, whichever worker notices first; stale values are refreshed off-request.
+_flight = SingleFlight()
+_INDEX_FLIGHT = SingleFlight(lock_seconds=30, wait_seconds=20)
+
+
+def _id_from_url(url: str) -> int | None:
+    try:
+        return int(url.rstrip("/").split("/")[-1])
+    except ValueError:
+        return None
+
+
+def _parse_pokemon(data: dict) -> Pokemon:
+    stats = {s["stat"]["name"]: s["base_stat"] for s in data["stats"]}
+    types = [t["type"]["name"] for t in data["types"]]
+    return Pokemon.of(data["id"], data["name"], types, stats)
+
+
+def _parse_ids(data: dict) -> list[int]:
+    ids: list[int] = []
+    for item in data.get("results", []):
+        pokemon_id = _id_from_url(str(item.get("url") or ""))
+        if pokemon_id is not None:
+            ids.append(pokemon_id)
+    return ids
+
+
+def _parse_type_chart(data: dict) -> dict[str, float]:
+    rel = data.get("damage_relations", {})
+    chart: dict[str, float] = {}
+    for entry in rel.get("double_damage_to", []):
+        chart[entry["name"]] = 2.0
+    for entry in rel.get("half_damage_to", []):
+        chart[entry["name"]] = 0.5
+    for entry in rel.get("no_damage_to", []):
+        chart[entry["name"]] = 0.0
+    return chart
+
+
+def _is_not_found(exc: requests.HTTPError) -> bool:
+    return exc.response is not None and exc.response.status_code == 404
+
+
+def _found(value: Any, not_found: str) -> Any:
+    if value is TOMBSTONE:
+        raise ValueError(not_found)
+    return value
+
+
+def _submit_refresh(fn: Callable[..., Any], *args: Any) -> None:
+    try:
+        get_io_executor().submit(fn, *args)
+    except ExecutorSaturated:
+        # The pool is busy with user-facing work; the stale copy stays until the next miss.
+        return
+
 
 class PokeApiHttp(PokeApiPort):
     _INDEX_CACHE_KEY = "poke:index:v1"
+    _INDEX_STAMP_KEY = "poke:index:v1:stamp"
     _INDEX_TTL_SECONDS = 24 * 3600
 
-    def _all_pokemon_index(self) -> list[tuple[int, str]]:
+    def __init__(
+        self,
+        http: PooledHttpClient | None = None,
+        base_url: str | None = None,
+        tiered: TieredCache | None = None,
+    ):
+        self.http = http or get_http_client()
+        self.base_url = (base_url or settings.POKEAPI_BASE_URL).rstrip("/")
+        self.tiered = tiered or get_tiered_cache()
+
+    def _cached_fetch(
+        self,
+        family: CacheFamily,
+        key: str,
+        path: str,
+        parse: Callable[[dict], Any],
+        *,
+        aliases: Callable[[Any], list[str]] | None = None,
+        not_found: str = "Not found.",
+        revalidate: bool = False,
+    ) -> Any:
+        tiered = self.tiered
+        cached = tiered.get(family, key)
+        if cached is not None:
+            return _found(cached, not_found)
+
+        def load() -> Any:
+            try:
+                value = parse(self.http.get_json(f"{self.base_url}/{path}", timeout=5))
+            except requests.HTTPError as exc:
+                if not _is_not_found(exc):
+                    raise
+                # Remember the 404 briefly so repeated bogus lookups stay off the upstream.
+                tiered.set_missing(family, [key])
+                return TOMBSTONE
+            keys = [key] + (aliases(value) if aliases else [])
+            tiered.set_many(family, {k: value for k in keys})
+            return value
+
+        stale = None if revalidate else tiered.get_stale(family, key)
+        if stale is not None:
+            # Stale-while-revalidate: answer now, refresh once in the background.
+            if not _flight.in_flight(key):
+                _submit_refresh(self._refresh, key, load, lambda: tiered.get(family, key))
+            return stale
+        return _found(_flight.do(key, load, check=lambda: tiered.get(family, key)), not_found)
+
+    @staticmethod
+    def _refresh(key: str, load: Callable[[], Any], check: Callable[[], Any]) -> None:
+        try:
+            _flight.do(key, load, check=check)
+        except requests.RequestException:
+            # PokeAPI is down or its circuit is open: keep serving the outdated copy.
+            return
+
+    def pokemon_index(self) -> list[tuple[int, str]]:
+        """All (id, name) pairs, sorted by id; downloads and shares the index on a miss, so calling it warms it."""
         cached = cache.get(self._INDEX_CACHE_KEY)
         if cached is not None:
             return cached
+        return _INDEX_FLIGHT.do(
+            self._INDEX_CACHE_KEY, self._download_index, check=lambda: cache.get(self._INDEX_CACHE_KEY)
+        )
 
-        resp = requests.get("https://pokeapi.co/api/v2/pokemon?limit=100000&offset=0", timeout=10)
-        resp.raise_for_status()
-        data = resp.json()
+    def _download_index(self) -> list[tuple[int, str]]:
+        data = self.http.get_json(f"{self.base_url}/pokemon?limit=100000&offset=0", timeout=10)
 
         index: list[tuple[int, str]] = []
         for item in data.get("results", []):
             name = str(item.get("name") or "").strip().lower()
-            url = str(item.get("url") or "")
-            if not name or not url:
-                continue
-            try:
-                pokemon_id = int(url.rstrip("/").split("/")[-1])
-            except ValueError:
+            pokemon_id = _id_from_url(str(item.get("url") or ""))
+            if not name or pokemon_id is None:
                 continue
             index.append((pokemon_id, name))
 
         index.sort(key=lambda it: it[0])
         cache.set(self._INDEX_CACHE_KEY, index, timeout=self._INDEX_TTL_SECONDS)
+        cache.set(self._INDEX_STAMP_KEY, uuid.uuid4().hex, timeout=self._INDEX_TTL_SECONDS)
         return index
 
+    def _name_index(self) -> NameSearchIndex:
+        # The stamp is a few bytes, so checking it per search is far cheaper than unpickling the whole index.
+        stamp = cache.get(self._INDEX_STAMP_KEY)
+        current = _name_index
+        if current is not None and stamp is not None and current[0] == stamp:
+            return current[1]
+        if current is not None and stamp is None and cache.get(self._INDEX_CACHE_KEY) is None:
+            # The shared index expired: keep searching the one we have while a single worker downloads it again.
+            if not _INDEX_FLIGHT.in_flight(self._INDEX_CACHE_KEY):
+                _submit_refresh(self._refresh_index)
+            return current[1]
+
+        return self._name_index_from(self.pokemon_index())
+
+    def _name_index_from(self, entries: list[tuple[int, str]]) -> NameSearchIndex:
+        global _name_index
+        stamp = cache.get(self._INDEX_STAMP_KEY)
+        if stamp is None:
+            stamp = uuid.uuid4().hex
+            cache.set(self._INDEX_STAMP_KEY, stamp, timeout=self._INDEX_TTL_SECONDS)
+        index = NameSearchIndex(entries)
+        with _name_index_lock:
+            _name_index = (stamp, index)
+        return index
+
+    def _refresh_index(self) -> None:
+        try:
+            self._name_index_from(self.pokemon_index())
+        except requests.RequestException:
+            return
+
     def search_pokemon_ids(self, query: str, limit: int = 20, offset: int = 0) -> list[int]:
         query = str(query or "").strip().lower()
         if not query:
@@ -42,96 +210,101 @@ class PokeApiHttp(PokeApiPort):
         limit = max(1, min(int(limit), 50))
         offset = max(0, int(offset))
 
-        index = self._all_pokemon_index()
-        matches = [pokemon_id for pokemon_id, name in index if query in name]
-        return matches[offset : offset + limit]
+        return self._name_index().search(query, limit=limit, offset=offset)
 
     def fetch_pokemon_by_name(self, name: str) -> Pokemon:
         name = str(name or "").strip().lower()
         if not name:
             raise ValueError("Pokemon name is required.")
 
-        cached = cache.get(f"poke:name:{name}")
-        if cached is not None:
-            return cached
-
-        resp = requests.get(f"https://pokeapi.co/api/v2/pokemon/{name}", timeout=5)
-        resp.raise_for_status()
-        data = resp.json()
-        stats = {s["stat"]["name"]: s["base_stat"] for s in data["stats"]}
-        types = [t["type"]["name"] for t in data["types"]]
-        pokemon = Pokemon(
-            id=data["id"],
-            name=data["name"],
-            types=types,
-            stats={"hp": stats["hp"], "attack": stats["attack"], "defense": stats["defense"], "speed": stats["speed"]},
+        return self._cached_fetch(
+            POKEMON,
+            f"poke:name:{name}",
+            f"pokemon/{name}",
+            _parse_pokemon,
+            aliases=lambda p: [f"poke:{p.id}"],
+            not_found=_POKEMON_NOT_FOUND,
         )
-        cache.set(f"poke:{pokemon.id}", pokemon, timeout=3600)
-        cache.set(f"poke:name:{name}", pokemon, timeout=3600)
-        return pokemon
 
-    def list_pokemon_ids(self, limit: int = 20, offset: int = 0) -> list[int]:
+    def list_pokemon_ids(self, limit: int = 20, offset: int = 0, *, revalidate: bool = False) -> list[int]:
+        """`revalidate=True` reloads a soft-expired page before returning instead of in the background."""
         limit = max(1, min(int(limit), 50))
         offset = max(0, int(offset))
 
-        cache_key = f"pokelist:{limit}:{offset}"
-        cached = cache.get(cache_key)
-        if cached is not None:
-            return cached
-
-        resp = requests.get(f"https://pokeapi.co/api/v2/pokemon?limit={limit}&offset={offset}", timeout=5)
-        resp.raise_for_status()
-        data = resp.json()
-        ids: list[int] = []
-        for item in data.get("results", []):
-            url = str(item.get("url") or "")
-            if not url:
-                continue
-            try:
-                pokemon_id = int(url.rstrip("/").split("/")[-1])
-            except ValueError:
-                continue
-            ids.append(pokemon_id)
-
-        cache.set(cache_key, ids, timeout=10 * 60)
-        return ids
+        return self._cached_fetch(
+            POKEMON_PAGES,
+            f"pokelist:{limit}:{offset}",
+            f"pokemon?limit={limit}&offset={offset}",
+            _parse_ids,
+            revalidate=revalidate,
+        )
 
-    def fetch_pokemon(self, pokemon_id: int) -> Pokemon:
-        cached = cache.get(f"poke:{pokemon_id}")
-        if cached is not None:
-            return cached
-        resp = requests.get(f"https://pokeapi.co/api/v2/pokemon/{pokemon_id}", timeout=5)
-        resp.raise_for_status()
-        data = resp.json()
-        stats = {s["stat"]["name"]: s["base_stat"] for s in data["stats"]}
-        types = [t["type"]["name"] for t in data["types"]]
-        pokemon = Pokemon(
-            id=data["id"],
-            name=data["name"],
-            types=types,
-            stats={"hp": stats["hp"], "attack": stats["attack"], "defense": stats["defense"], "speed": stats["speed"]},
+    def fetch_pokemon(self, pokemon_id: int, *, revalidate: bool = False) -> Pokemon:
+        """`revalidate=True` reloads a soft-expired entry before returning instead of in the background."""
+        return self._cached_fetch(
+            POKEMON,
+            f"poke:{pokemon_id}",
+            f"pokemon/{pokemon_id}",
+            _parse_pokemon,
+            not_found=_POKEMON_NOT_FOUND,
+            revalidate=revalidate,
         )
-        cache.set(f"poke:{pokemon_id}", pokemon, timeout=3600)
+
+    def _load_pokemon(self, pokemon_id: int, *, store: bool = False) -> Any:
+        key = f"poke:{pokemon_id}"
+        try:
+            pokemon = _parse_pokemon(self.http.get_json(f"{self.base_url}/pokemon/{pokemon_id}", timeout=5))
+        except requests.HTTPError as exc:
+            if not _is_not_found(exc):
+                raise
+            self.tiered.set_missing(POKEMON, [key])
+            return TOMBSTONE
+        if store:
+            self.tiered.set(POKEMON, key, pokemon)
         return pokemon
 
-    def fetch_type_chart(self, attack_type: str) -> dict[str, float]:
-        attack_type = attack_type.lower()
-        cached = cache.get(f"typechart:{attack_type}")
-        if cached is not None:
-            return cached
+    def _refresh_pokemons(self, pokemon_ids: list[int]) -> None:
+        for pokemon_id in pokemon_ids:
+            key = f"poke:{pokemon_id}"
+            self._refresh(
+                key, lambda: self._load_pokemon(pokemon_id, store=True), lambda: self.tiered.get(POKEMON, key)
+            )
 
-        resp = requests.get(f"https://pokeapi.co/api/v2/type/{attack_type}", timeout=5)
-        resp.raise_for_status()
-        data = resp.json()
-        rel = data.get("damage_relations", {})
-
-        chart: dict[str, float] = {}
-        for entry in rel.get("double_damage_to", []):
-            chart[entry["name"]] = 2.0
-        for entry in rel.get("half_damage_to", []):
-            chart[entry["name"]] = 0.5
-        for entry in rel.get("no_damage_to", []):
-            chart[entry["name"]] = 0.0
-
-        cache.set(f"typechart:{attack_type}", chart, timeout=24 * 3600)
-        return chart
+    def fetch_pokemons(self, pokemon_ids: list[int]) -> list[Pokemon]:
+        ids = [int(x) for x in pokemon_ids]
+        keys = {pokemon_id: f"poke:{pokemon_id}" for pokemon_id in ids}
+        cached = self.tiered.get_many(POKEMON, list(keys.values()))
+        found = {pokemon_id: cached[key] for pokemon_id, key in keys.items() if key in cached}
+
+        stale_ids: list[int] = []
+        for pokemon_id, key in keys.items():
+            if pokemon_id not in found and (stale := self.tiered.get_stale(POKEMON, key)) is not None:
+                found[pokemon_id] = stale
+                if not _flight.in_flight(key):
+                    stale_ids.append(pokemon_id)
+        if stale_ids:
+            _submit_refresh(self._refresh_pokemons, stale_ids)
+
+        missing = [pokemon_id for pokemon_id in keys if pokemon_id not in found]
+
+        def fetch(pokemon_id: int) -> Any:
+            key = keys[pokemon_id]
+            # Stored inside the flight, so workers waiting on its lock find the value as soon as it is released.
+            return _flight.do(
+                key, lambda: self._load_pokemon(pokemon_id, store=True), check=lambda: self.tiered.get(POKEMON, key)
+            )
+
+        found.update(zip(missing, get_io_executor().map(fetch, missing, max_parallel=FETCH_WORKERS)))
+        return [_found(found[pokemon_id], _POKEMON_NOT_FOUND) for pokemon_id in ids]
+
+    def fetch_type_chart(self, attack_type: str, *, revalidate: bool = False) -> dict[str, float]:
+        """`revalidate=True` reloads a soft-expired row before returning instead of in the background."""
+        attack_type = attack_type.lower()
+        return self._cached_fetch(
+            TYPE_CHART,
+            f"typechart:{attack_type}",
+            f"type/{attack_type}",
+            _parse_type_chart,
+            not_found="Type not found.",
+            revalidate=revalidate,
+        )
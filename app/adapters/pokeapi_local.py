@@ -0,0 +1,109 @@
+import threading
+import time
+
+from django.conf import settings
+
+from app.adapters.pokeapi_client import PokeApiHttp
+from app.adapters.search_index import NameSearchIndex
+from app.domain.entities import Pokemon
+from app.models import Species, TypeEffectiveness
+from app.ports.pokeapi import PokeApiPort
+
+_SNAPSHOT_TTL_SECONDS = 5 * 60
+
+
+class _Snapshot:
+    def __init__(self):
+        self.by_id: dict[int, Pokemon] = {}
+        self.by_name: dict[str, Pokemon] = {}
+        self.ids: list[int] = []
+        self.type_chart: dict[str, dict[str, float]] = {}
+        for row in Species.objects.order_by("id").only("id", "name", "stats", "types"):
+            pokemon = Pokemon.of(row.id, row.name, row.types, row.stats)
+            self.by_id[pokemon.id] = pokemon
+            self.by_name[pokemon.name] = pokemon
+            self.ids.append(pokemon.id)
+        for attack_type, defender_type, multiplier in TypeEffectiveness.objects.values_list(
+            "attack_type", "defender_type", "multiplier"
+        ):
+            self.type_chart.setdefault(attack_type, {})[defender_type] = float(multiplier)
+        self.name_index = NameSearchIndex([(p.id, p.name) for p in self.by_id.values()])
+        self.loaded_at = time.monotonic()
+
+
+_snapshot: _Snapshot | None = None
+_snapshot_lock = threading.Lock()
+
+
+def invalidate_local_species() -> None:
+    global _snapshot
+    with _snapshot_lock:
+        _snapshot = None
+
+
+def _get_snapshot() -> _Snapshot:
+    global _snapshot
+    current = _snapshot
+    if current is not None and time.monotonic() - current.loaded_at < _SNAPSHOT_TTL_SECONDS:
+        return current
+    with _snapshot_lock:
+        if _snapshot is None or time.monotonic() - _snapshot.loaded_at >= _SNAPSHOT_TTL_SECONDS:
+            _snapshot = _Snapshot()
+        return _snapshot
+
+
+class PokeApiLocal(PokeApiPort):
+    """Serves species and type data imported by `manage.py import_species`, without network.
+
+    The tables are small and effectively static, so each process keeps one in-memory snapshot and refreshes it
+    every few minutes (or immediately after an import in the same process).
+    """
+
+    def fetch_pokemon(self, pokemon_id: int) -> Pokemon:
+        pokemon = _get_snapshot().by_id.get(int(pokemon_id))
+        if pokemon is None:
+            raise ValueError("Pokémon not found.")
+        return pokemon
+
+    def fetch_pokemons(self, pokemon_ids: list[int]) -> list[Pokemon]:
+        by_id = _get_snapshot().by_id
+        out: list[Pokemon] = []
+        for pokemon_id in pokemon_ids:
+            pokemon = by_id.get(int(pokemon_id))
+            if pokemon is None:
+                raise ValueError("Pokémon not found.")
+            out.append(pokemon)
+        return out
+
+    def fetch_pokemon_by_name(self, name: str) -> Pokemon:
+        name = str(name or "").strip().lower()
+        if not name:
+            raise ValueError("Pokemon name is required.")
+        pokemon = _get_snapshot().by_name.get(name)
+        if pokemon is None:
+            raise ValueError("Pokémon not found.")
+        return pokemon
+
+    def search_pokemon_ids(self, query: str, limit: int = 20, offset: int = 0) -> list[int]:
+        query = str(query or "").strip().lower()
+        if not query:
+            raise ValueError("Search query is required.")
+
+        limit = max(1, min(int(limit), 50))
+        offset = max(0, int(offset))
+        return _get_snapshot().name_index.search(query, limit=limit, offset=offset)
+
+    def list_pokemon_ids(self, limit: int = 20, offset: int = 0) -> list[int]:
+        limit = max(1, min(int(limit), 50))
+        offset = max(0, int(offset))
+        return _get_snapshot().ids[offset : offset + limit]
+
+    def fetch_type_chart(self, attack_type: str) -> dict[str, float]:
+        return dict(_get_snapshot().type_chart.get(attack_type.lower(), {}))
+
+
+def pokeapi_source() -> PokeApiPort:
+    """The configured PokeAPI adapter: the local `Species` tables with POKEAPI_SOURCE=local, pokeapi.co otherwise."""
+    if settings.POKEAPI_SOURCE == "local":
+        return PokeApiLocal()
+    return PokeApiHttp()
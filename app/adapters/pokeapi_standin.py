@@ -0,0 +1,144 @@
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+from app.adapters.species_dataset import DEFAULT_DATASET_PATH, load_species_file
+from app.domain.entities import Pokemon
+
+_API_PREFIX = "/api/v2"
+_RELATIONS = (("double_damage_to", 2.0), ("half_damage_to", 0.5), ("no_damage_to", 0.0))
+
+
+def _pokemon_payload(pokemon: Pokemon, base_url: str) -> dict:
+    return {
+        "id": pokemon.id,
+        "name": pokemon.name,
+        "stats": [{"base_stat": value, "stat": {"name": name}} for name, value in pokemon.stats.items()],
+        "types": [
+            {"slot": slot, "type": {"name": t, "url": f"{base_url}/type/{t}/"}}
+            for slot, t in enumerate(pokemon.types, 1)
+        ],
+    }
+
+
+def _type_payload(name: str, row: dict[str, float]) -> dict:
+    relations = {
+        relation: [{"name": defender} for defender, m in sorted(row.items()) if m == multiplier]
+        for relation, multiplier in _RELATIONS
+    }
+    return {"name": name, "damage_relations": relations}
+
+
+class PokeApiStandin:
+    """Local imitation of the parts of pokeapi.co that `PokeApiHttp` calls, backed by a species dump.
+
+    Serves `/pokemon?limit=&offset=`, `/pokemon/{id or name}` and `/type/{name}` (with or without the `/api/v2`
+    prefix). Every response is delayed by `latency_ms` plus up to `jitter_ms`, and a share `error_rate` of requests
+    is answered with `error_status` instead, so load tests see a slow and flaky upstream.
+    """
+
+    def __init__(
+        self,
+        dataset: str | Path = DEFAULT_DATASET_PATH,
+        *,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        seed: int | None = None,
+    ):
+        species, type_chart = load_species_file(dataset)
+        self.species = sorted(species, key=lambda p: p.id)
+        self.by_id = {p.id: p for p in self.species}
+        self.by_name = {p.name: p for p in self.species}
+        self.type_chart = type_chart
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+
+        standin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                status, body = standin.handle(self.path)
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                return
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        bound_host, bound_port = self.server.server_address[:2]
+        self.url = f"http://{bound_host}:{bound_port}{_API_PREFIX}"
+
+    def _delay_and_fail(self) -> bool:
+        with self._lock:
+            self.requests += 1
+            delay = self.latency_ms + self._random.uniform(0, self.jitter_ms)
+            failed = self._random.random() < self.error_rate
+            self.errors += int(failed)
+        if delay > 0:
+            time.sleep(delay / 1000)
+        return failed
+
+    def handle(self, raw_path: str) -> tuple[int, dict]:
+        if self._delay_and_fail():
+            return self.error_status, {"detail": "Injected failure."}
+
+        parts = urlsplit(raw_path)
+        path = parts.path.removeprefix(_API_PREFIX).strip("/").split("/")
+        if path == ["pokemon"]:
+            query = parse_qs(parts.query)
+            try:
+                limit = int(query.get("limit", ["20"])[0])
+                offset = int(query.get("offset", ["0"])[0])
+            except ValueError:
+                return 400, {"detail": "Bad limit/offset."}
+            page = self.species[max(0, offset) : max(0, offset) + max(0, limit)]
+            results = [{"name": p.name, "url": f"{self.url}/pokemon/{p.id}/"} for p in page]
+            return 200, {"count": len(self.species), "results": results}
+        if len(path) == 2 and path[0] == "pokemon":
+            key = path[1].lower()
+            pokemon = self.by_id.get(int(key)) if key.isdigit() else self.by_name.get(key)
+            if pokemon is None:
+                return 404, {"detail": "Not found."}
+            return 200, _pokemon_payload(pokemon, self.url)
+        if len(path) == 2 and path[0] == "type":
+            name = path[1].lower()
+            if name not in self.type_chart:
+                return 404, {"detail": "Not found."}
+            return 200, _type_payload(name, self.type_chart[name])
+        return 404, {"detail": "Not found."}
+
+    def start(self) -> "PokeApiStandin":
+        threading.Thread(target=self.server.serve_forever, name="pokeapi-standin", daemon=True).start()
+        return self
+
+    def serve_forever(self) -> None:
+        self.server.serve_forever()
+
+    def close(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"requests": self.requests, "errors": self.errors}
@@ -7,28 +7,61 @@ from typing import Dict, List
 
 from django.contrib.auth import get_user_model
 from django.conf import settings
-from django.core.cache import cache
 from django.db import IntegrityError, transaction
 from django.db.models import Case, Count, IntegerField, Q, Sum, Value, When
 from django.db.models.functions import TruncDate
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.utils import timezone
 
+from app.adapters.cache import SPECIES, get_tiered_cache
+from app.adapters.event_bus import get_event_bus
+from app.adapters.type_chart import get_type_chart_store
 from app.domain.entities import BattleContext, BattleSeed, LobbyEntry as LobbyEntryEntity, Pokemon
-from app.models import ActivePokemon, ActiveTeam, Battle, BattleEvent, LobbyEntry, Statistics, UserPokemon
+from app.models import ActivePokemon, ActiveTeam, Battle, BattleEvent, LobbyEntry, Species, Statistics, UserPokemon
+from app.ports.events import EventBusPort, battle_topic, user_topic
 from app.ports.repos import BattleRepoPort, CatalogPort, LobbyPort
 from app.ports.stats import StatsPort
 from app.ports.users import BOT_USERNAME, UserPort
 
 
+def _species_to_pokemon(instance: Species) -> Pokemon:
+    return Pokemon.of(instance.id, instance.name, instance.types, instance.stats)
+
+
 def _to_pokemon(instance: UserPokemon) -> Pokemon:
-    return Pokemon(id=instance.pokemon_id, name=instance.name, types=instance.types, stats=instance.stats.copy())
+    return _species_to_pokemon(instance.pokemon)
+
+
+def _battle_type_chart(result: dict) -> dict[str, dict[str, float]]:
+    version = result.get("type_chart_version")
+    if not version:
+        # Battles created before charts were versioned carry their own copy.
+        return result.get("type_chart", {})
+    chart = get_type_chart_store().get(version)
+    if chart is None:
+        # Playing on with an empty chart would silently make every multiplier 1.0.
+        raise RuntimeError(f"Unknown type chart version {version!r}; is TYPE_CHART_PATH up to date?")
+    return chart
+
+
+def _species_key(pokemon_id: int) -> str:
+    return f"species:{int(pokemon_id)}"
 
 
-_USER_POKEMON_CACHE_TTL_SECONDS = 24 * 3600
+def invalidate_species_cache(pokemon_ids: List[int] | None = None) -> None:
+    # Species rows never change outside of `import_species`, so every process keeps the ones it has seen; a full
+    # invalidation is broadcast to the other workers.
+    tiered = get_tiered_cache()
+    if pokemon_ids is None:
+        tiered.invalidate(SPECIES)
+        return
+    tiered.delete_many(SPECIES, [_species_key(pokemon_id) for pokemon_id in pokemon_ids])
 
 
-def _user_pokemon_cache_key(user_id: int, pokemon_id: int) -> str:
-    return f"userpoke:v1:{user_id}:{pokemon_id}"
+@receiver([post_save, post_delete], sender=Species)
+def _species_changed(sender, instance: Species, **kwargs) -> None:
+    invalidate_species_cache([instance.id])
 
 
 def _replay_signature(replay: dict) -> str:
@@ -37,33 +70,64 @@ def _replay_signature(replay: dict) -> str:
 
 
 class CatalogRepository(CatalogPort):
+    def get_species(self, pokemon_ids: List[int]) -> Dict[int, Pokemon]:
+        ids = [int(x) for x in pokemon_ids]
+        tiered = get_tiered_cache()
+        cached = tiered.get_many(SPECIES, [_species_key(pokemon_id) for pokemon_id in ids])
+        found: Dict[int, Pokemon] = {}
+        missing: List[int] = []
+        for pokemon_id in ids:
+            pokemon = cached.get(_species_key(pokemon_id))
+            if pokemon is not None:
+                found[pokemon_id] = pokemon
+            else:
+                missing.append(pokemon_id)
+        if missing:
+            rows = [_species_to_pokemon(s) for s in Species.objects.filter(id__in=missing)]
+            tiered.set_many(SPECIES, {_species_key(pokemon.id): pokemon for pokemon in rows})
+            for pokemon in rows:
+                found[pokemon.id] = pokemon
+        return found
+
+    def save_species(self, pokemons: List[Pokemon]) -> None:
+        if not pokemons:
+            return
+        # Existing rows are left untouched, so nothing cached can go stale here.
+        Species.objects.bulk_create(
+            [Species(id=p.id, name=p.name, stats=dict(p.stats), types=list(p.types)) for p in pokemons],
+            ignore_conflicts=True,
+        )
+
     def list_user_pokemon(self, user_id: int) -> List[Pokemon]:
-        pokes = [_to_pokemon(p) for p in UserPokemon.objects.filter(user_id=user_id).order_by("pokemon_id")]
-        for p in pokes:
-            cache.set(_user_pokemon_cache_key(user_id, p.id), p, timeout=_USER_POKEMON_CACHE_TTL_SECONDS)
-        return pokes
+        rows = UserPokemon.objects.filter(user_id=user_id).select_related("pokemon").order_by("pokemon_id")
+        return [_to_pokemon(p) for p in rows]
 
     def get_user_pokemon(self, user_id: int, pokemon_id: int) -> Pokemon | None:
-        cached = cache.get(_user_pokemon_cache_key(user_id, pokemon_id))
-        if isinstance(cached, Pokemon):
-            return cached
-
-        instance = UserPokemon.objects.filter(user_id=user_id, pokemon_id=pokemon_id).first()
+        instance = UserPokemon.objects.filter(user_id=user_id, pokemon_id=pokemon_id).select_related("pokemon").first()
         if not instance:
             return None
-        pokemon = _to_pokemon(instance)
-        cache.set(_user_pokemon_cache_key(user_id, pokemon_id), pokemon, timeout=_USER_POKEMON_CACHE_TTL_SECONDS)
-        return pokemon
+        return _to_pokemon(instance)
+
+    def get_user_pokemons(self, user_id: int, pokemon_ids: List[int]) -> Dict[int, Pokemon]:
+        ids = [int(x) for x in pokemon_ids]
+        if not ids:
+            return {}
+        owned = UserPokemon.objects.filter(user_id=user_id, pokemon_id__in=ids).values_list("pokemon_id", flat=True)
+        return self.get_species(list(owned))
 
     def upsert_user_pokemon(self, user_id: int, pokemon: Pokemon) -> Pokemon:
-        instance, _ = UserPokemon.objects.update_or_create(
-            user_id=user_id,
-            pokemon_id=pokemon.id,
-            defaults={"name": pokemon.name, "stats": pokemon.stats, "types": pokemon.types},
+        return self.upsert_user_pokemons(user_id, [pokemon])[0]
+
+    def upsert_user_pokemons(self, user_id: int, pokemons: List[Pokemon]) -> List[Pokemon]:
+        if not pokemons:
+            return []
+        self.save_species(pokemons)
+        UserPokemon.objects.bulk_create(
+            [UserPokemon(user_id=user_id, pokemon_id=p.id) for p in pokemons],
+            ignore_conflicts=True,
         )
-        stored = _to_pokemon(instance)
-        cache.set(_user_pokemon_cache_key(user_id, pokemon.id), stored, timeout=_USER_POKEMON_CACHE_TTL_SECONDS)
-        return stored
+        species = self.get_species([p.id for p in pokemons])
+        return [species.get(p.id, p) for p in pokemons]
 
     def set_active(self, user_id: int, pokemon_id: int) -> None:
         pokemon = UserPokemon.objects.get(user_id=user_id, pokemon_id=pokemon_id)
@@ -98,6 +162,16 @@ class CatalogRepository(CatalogPort):
 
 
 class BattleRepository(BattleRepoPort):
+    def __init__(self, events: EventBusPort | None = None):
+        self.events = events or get_event_bus()
+
+    def _publish_on_commit(self, *topics: str) -> None:
+        def _publish():
+            for topic in topics:
+                self.events.publish(topic)
+
+        transaction.on_commit(_publish)
+
     def create_battle(
         self,
         p1: int,
@@ -105,7 +179,7 @@ class BattleRepository(BattleRepoPort):
         p1_team: List[Pokemon],
         p2_team: List[Pokemon],
         seed: int,
-        type_chart: dict[str, dict[str, float]],
+        type_chart_version: str,
         order: List[str],
         initiative: Dict,
     ) -> int:
@@ -144,17 +218,22 @@ class BattleRepository(BattleRepoPort):
                     "next_actor": order[0],
                     "initiative": initiative,
                 },
-                "type_chart": type_chart,
+                "type_chart_version": type_chart_version,
                 "teams": {
-                    "a": [{"id": p.id, "name": p.name, "types": p.types, "stats": p.stats} for p in p1_team],
-                    "b": [{"id": p.id, "name": p.name, "types": p.types, "stats": p.stats} for p in p2_team],
+                    "a": [
+                        {"id": p.id, "name": p.name, "types": list(p.types), "stats": dict(p.stats)} for p in p1_team
+                    ],
+                    "b": [
+                        {"id": p.id, "name": p.name, "types": list(p.types), "stats": dict(p.stats)} for p in p2_team
+                    ],
                 },
             },
         )
+        self._publish_on_commit(user_topic(p1), user_topic(p2))
         return battle.id
 
-    def load_battle(self, battle_id: int) -> BattleContext:
-        b = Battle.objects.get(id=battle_id)
+    def load_battle(self, battle_id: int, for_update: bool = False) -> BattleContext:
+        b = (Battle.objects.select_for_update() if for_update else Battle.objects).get(id=battle_id)
         result = b.result or {}
         teams = result.get("teams") or {}
 
@@ -166,13 +245,15 @@ class BattleRepository(BattleRepoPort):
                     if not isinstance(item, dict):
                         continue
                     try:
-                        pid = int(item.get("id"))
-                    except (TypeError, ValueError):
+                        pokemon = Pokemon.of(
+                            item.get("id"),
+                            str(item.get("name") or ""),
+                            item.get("types") or [],
+                            item.get("stats") or {},
+                        )
+                    except (KeyError, TypeError, ValueError):
                         continue
-                    name = str(item.get("name") or "")
-                    types = list(item.get("types") or [])
-                    stats = dict(item.get("stats") or {})
-                    out.append(Pokemon(id=pid, name=name, types=types, stats=stats))
+                    out.append(pokemon)
                 if out:
                     return out
             return []
@@ -182,12 +263,12 @@ class BattleRepository(BattleRepoPort):
 
         if not p1_team:
             ids = b.p1_team_ids or [b.p1_pokemon_id]
-            rows = UserPokemon.objects.filter(user_id=b.p1_id, pokemon_id__in=ids)
+            rows = UserPokemon.objects.filter(user_id=b.p1_id, pokemon_id__in=ids).select_related("pokemon")
             by_id = {r.pokemon_id: r for r in rows}
             p1_team = [_to_pokemon(by_id[pokemon_id]) for pokemon_id in ids if pokemon_id in by_id]
         if not p2_team:
             ids = b.p2_team_ids or [b.p2_pokemon_id]
-            rows = UserPokemon.objects.filter(user_id=b.p2_id, pokemon_id__in=ids)
+            rows = UserPokemon.objects.filter(user_id=b.p2_id, pokemon_id__in=ids).select_related("pokemon")
             by_id = {r.pokemon_id: r for r in rows}
             p2_team = [_to_pokemon(by_id[pokemon_id]) for pokemon_id in ids if pokemon_id in by_id]
 
@@ -198,16 +279,8 @@ class BattleRepository(BattleRepoPort):
         b_active = int(b_state.get("active", 0)) if isinstance(b_state, dict) else 0
         a_active = max(0, min(a_active, max(0, len(p1_team) - 1)))
         b_active = max(0, min(b_active, max(0, len(p2_team) - 1)))
-        p1_active = (
-            p1_team[a_active]
-            if p1_team
-            else _to_pokemon(UserPokemon.objects.get(user_id=b.p1_id, pokemon_id=b.p1_pokemon_id))
-        )
-        p2_active = (
-            p2_team[b_active]
-            if p2_team
-            else _to_pokemon(UserPokemon.objects.get(user_id=b.p2_id, pokemon_id=b.p2_pokemon_id))
-        )
+        p1_active = p1_team[a_active] if p1_team else _species_to_pokemon(Species.objects.get(id=b.p1_pokemon_id))
+        p2_active = p2_team[b_active] if p2_team else _species_to_pokemon(Species.objects.get(id=b.p2_pokemon_id))
 
         return BattleContext(
             id=b.id,
@@ -219,7 +292,7 @@ class BattleRepository(BattleRepoPort):
             p1_pokemon=p1_active,
             p2_pokemon=p2_active,
             seed=BattleSeed(b.seed),
-            type_chart=result.get("type_chart", {}),
+            type_chart=_battle_type_chart(result),
             pending_actions=result.get("pending_actions", {"a": None, "b": None}),
             log=[],
             state=state,
@@ -228,12 +301,20 @@ class BattleRepository(BattleRepoPort):
 
     def save_turn(self, battle_id: int, turn: Dict) -> None:
         BattleEvent.objects.create(battle_id=battle_id, turn=turn.get("turn", 0), payload=turn)
+        self._publish_on_commit(battle_topic(battle_id))
+
+    def save_turns(self, battle_id: int, turns: List[Dict]) -> None:
+        BattleEvent.objects.bulk_create(
+            [BattleEvent(battle_id=battle_id, turn=turn.get("turn", 0), payload=turn) for turn in turns]
+        )
+        self._publish_on_commit(battle_topic(battle_id))
 
     def update_state(self, battle_id: int, state: Dict) -> None:
         battle = Battle.objects.get(id=battle_id)
         result = battle.result or {}
         result["state"] = state
         Battle.objects.filter(id=battle_id).update(result=result)
+        self._publish_on_commit(battle_topic(battle_id))
 
     def finish(self, battle_id: int, result: Dict) -> None:
         battle = Battle.objects.get(id=battle_id)
@@ -242,6 +323,7 @@ class BattleRepository(BattleRepoPort):
         if "replay" in prev:
             prev["replay_sig"] = _replay_signature(prev["replay"])
         Battle.objects.filter(id=battle_id).update(status="finished", result=prev)
+        self._publish_on_commit(battle_topic(battle_id))
 
     def update_pending_actions(self, battle_id: int, pending_actions: Dict[str, Dict | None]) -> None:
         battle = Battle.objects.get(id=battle_id)
@@ -273,6 +355,26 @@ class BattleRepository(BattleRepoPort):
     def list_events(self, battle_id: int) -> List[Dict]:
         return [evt.payload for evt in BattleEvent.objects.filter(battle_id=battle_id).order_by("id")]
 
+    def list_events_since(self, battle_id: int, after: int) -> List[Dict]:
+        after = max(0, int(after))
+        rows = BattleEvent.objects.filter(battle_id=battle_id).order_by("id").values_list("payload", flat=True)
+        return list(rows[after:])
+
+    def get_status(self, battle_id: int) -> str | None:
+        return Battle.objects.filter(id=battle_id).values_list("status", flat=True).first()
+
+    def find_active_battle(self, user_id: int, after_battle_id: int = 0) -> Dict | None:
+        b = (
+            Battle.objects.filter(Q(p1_id=user_id) | Q(p2_id=user_id), status="active", id__gt=int(after_battle_id))
+            .order_by("-id")
+            .only("id", "p1_id", "p2_id")
+            .first()
+        )
+        if not b:
+            return None
+        role = "a" if b.p1_id == user_id else "b"
+        return {"battle_id": b.id, "role": role, "opponent_id": b.p2_id if role == "a" else b.p1_id}
+
     def get_replay(self, battle_id: int) -> Dict | None:
         battle = Battle.objects.get(id=battle_id)
         result = battle.result or {}
@@ -310,6 +412,35 @@ class BattleRepository(BattleRepoPort):
             "created_at": b.created_at.isoformat(),
         }
 
+    def get_spectator_view(self, battle_id: int) -> Dict | None:
+        try:
+            b = Battle.objects.select_related("p1", "p2").get(id=battle_id)
+        except Battle.DoesNotExist:
+            return None
+
+        result = b.result or {}
+        return {
+            "id": b.id,
+            "status": b.status,
+            "players": {
+                "a": {"id": b.p1_id, "username": str(b.p1.username)},
+                "b": {"id": b.p2_id, "username": str(b.p2.username)},
+            },
+            "teams": result.get("teams") or {},
+            "state": result.get("state") or {},
+            "outcome": result.get("outcome"),
+            "created_at": b.created_at.isoformat(),
+        }
+
+    def list_battles_awaiting(self, user_id: int) -> List[int]:
+        """Active battles in which it is `user_id`'s move."""
+        rows = (
+            Battle.objects.filter(Q(p1_id=user_id) | Q(p2_id=user_id), status="active")
+            .order_by("id")
+            .values_list("id", "p1_id", "result__state__next_actor")
+        )
+        return [battle_id for battle_id, p1_id, next_actor in rows if next_actor == ("a" if p1_id == user_id else "b")]
+
 
 class LobbyRepository(LobbyPort):
     def enqueue(self, user_id: int, pokemon_ids: List[int]) -> None:
@@ -474,10 +605,7 @@ class StatisticsRepository(StatsPort):
             per_pokemon.values(), key=lambda r: (-int(r["battles"]), -int(r["wins"]), int(r["pokemon_id"]))
         )[:3]
         top_ids = [row["pokemon_id"] for row in top_rows if isinstance(row.get("pokemon_id"), int)]
-        names_by_id = {
-            p.pokemon_id: p.name
-            for p in UserPokemon.objects.filter(user_id=user_id, pokemon_id__in=top_ids).only("pokemon_id", "name")
-        }
+        names_by_id = dict(Species.objects.filter(id__in=top_ids).values_list("id", "name"))
         top_pokemons = []
         for row in top_rows:
             pokemon_id = row.get("pokemon_id")
@@ -0,0 +1,133 @@
+from bisect import bisect_left
+
+_EXACT, _PREFIX, _SUBSTRING, _FUZZY = range(4)
+
+
+def _trigrams(text: str) -> set[str]:
+    padded = f"  {text} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def _max_edits(query: str) -> int:
+    if len(query) < 5:
+        return 0
+    return 1 if len(query) < 9 else 2
+
+
+def _edit_distance(a: str, b: str, limit: int) -> int:
+    """Optimal-string-alignment distance (adjacent swaps count once); gives up once `limit` is exceeded."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    prev_prev: list[int] | None = None
+    prev = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        cur = [i] + [0] * len(b)
+        row_min = i
+        for j, cb in enumerate(b, 1):
+            cost = 0 if ca == cb else 1
+            value = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + cost)
+            if prev_prev is not None and i > 1 and j > 1 and ca == b[j - 2] and a[i - 2] == cb:
+                value = min(value, prev_prev[j - 2] + 1)
+            cur[j] = value
+            row_min = min(row_min, value)
+        if row_min > limit:
+            return limit + 1
+        prev_prev, prev = prev, cur
+    return prev[-1]
+
+
+class NameSearchIndex:
+    """Immutable in-memory index over (pokemon_id, name) pairs.
+
+    Results are ranked exact > prefix > substring > typo-tolerant match, then by id. Prefix lookups use a sorted
+    name list, substring and fuzzy candidates come from a trigram inverted index, so a query only touches the
+    handful of names that share its trigrams.
+    """
+
+    def __init__(self, entries: list[tuple[int, str]]):
+        by_id: dict[int, str] = {}
+        for pokemon_id, name in entries:
+            name = str(name or "").strip().lower()
+            if name:
+                by_id[int(pokemon_id)] = name
+        self.ids: tuple[int, ...] = tuple(sorted(by_id))
+        self.names: tuple[str, ...] = tuple(by_id[pokemon_id] for pokemon_id in self.ids)
+        self._sorted: list[tuple[str, int]] = sorted((name, pos) for pos, name in enumerate(self.names))
+        self._sorted_names = [name for name, _pos in self._sorted]
+
+        postings: dict[str, list[int]] = {}
+        for pos, name in enumerate(self.names):
+            for gram in _trigrams(name):
+                postings.setdefault(gram, []).append(pos)
+        self._postings: dict[str, tuple[int, ...]] = {gram: tuple(items) for gram, items in postings.items()}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _prefix_positions(self, query: str) -> list[int]:
+        start = bisect_left(self._sorted_names, query)
+        out: list[int] = []
+        for name, pos in self._sorted[start:]:
+            if not name.startswith(query):
+                break
+            out.append(pos)
+        return out
+
+    def _substring_positions(self, query: str) -> list[int]:
+        if len(query) < 3:
+            return [pos for pos, name in enumerate(self.names) if query in name]
+        # Inner trigrams only: the padded edge trigrams would restrict matches to word boundaries.
+        grams = [query[i : i + 3] for i in range(len(query) - 2)]
+        lists = sorted((self._postings.get(gram, ()) for gram in grams), key=len)
+        if not lists[0]:
+            return []
+        candidates = set(lists[0])
+        for items in lists[1:]:
+            candidates.intersection_update(items)
+            if not candidates:
+                return []
+        return [pos for pos in candidates if query in self.names[pos]]
+
+    def _fuzzy_positions(self, query: str, exclude: set[int]) -> list[tuple[int, int]]:
+        limit = _max_edits(query)
+        if not limit:
+            return []
+        grams = _trigrams(query)
+        counts: dict[int, int] = {}
+        for gram in grams:
+            for pos in self._postings.get(gram, ()):
+                counts[pos] = counts.get(pos, 0) + 1
+        # Each edit destroys at most three trigrams (plus the end marker when matching a name prefix),
+        # so anything sharing fewer cannot be within `limit`.
+        min_shared = max(1, len(grams) - 3 * limit - 1)
+        out: list[tuple[int, int]] = []
+        for pos, shared in counts.items():
+            if shared < min_shared or pos in exclude:
+                continue
+            name = self.names[pos]
+            distance = min(
+                _edit_distance(query, name, limit),
+                _edit_distance(query, name[: len(query)], limit) if len(name) > len(query) else limit + 1,
+            )
+            if distance <= limit:
+                out.append((distance, pos))
+        return out
+
+    def search(self, query: str, limit: int = 20, offset: int = 0, *, fuzzy: bool = True) -> list[int]:
+        query = str(query or "").strip().lower()
+        if not query or not self.ids:
+            return []
+
+        ranked: dict[int, int] = {}
+        for pos in self._substring_positions(query):
+            ranked[pos] = _SUBSTRING
+        for pos in self._prefix_positions(query):
+            ranked[pos] = _EXACT if self.names[pos] == query else _PREFIX
+
+        keys = [(tier, 0, pos) for pos, tier in ranked.items()]
+        # Typo matches always rank last, so skip them when the requested page is already full.
+        if fuzzy and len(keys) < offset + limit:
+            keys.extend((_FUZZY, distance, pos) for distance, pos in self._fuzzy_positions(query, set(ranked)))
+        # Positions follow id order, so sorting on (tier, distance, position) ranks ties by id.
+        keys.sort()
+        return [self.ids[pos] for _tier, _distance, pos in keys[offset : offset + limit]]
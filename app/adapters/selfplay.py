@@ -0,0 +1,121 @@
+import gzip
+import json
+import os
+import random
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import BinaryIO, Callable, Iterator, Sequence
+
+from app.domain.entities import Pokemon
+from app.domain.services import TypeChart
+from app.domain.simulation import BattleSim, SimState
+
+# Battles per worker task: large enough to amortize pickling and gzip headers, small enough to keep memory flat.
+CHUNK_BATTLES = 500
+
+_species: Sequence[Pokemon] = ()
+_chart: TypeChart = {}
+
+
+def _init_worker(species: Sequence[Pokemon], chart: TypeChart) -> None:
+    global _species, _chart
+    _species, _chart = species, chart
+
+
+def play_chunk(
+    seed: int, first_battle: int, battles: int, team_size: int = 3, epsilon: float = 0.0
+) -> tuple[int, int, bytes]:
+    """Plays `battles` bot-vs-bot battles; returns (battles, rows, gzip member with one NDJSON row per action).
+
+    Chunk `first_battle` always gets the same random stream for a given `seed`, so output does not depend on the
+    number of workers. With `epsilon`, each move is a random legal action with that probability instead of the
+    heuristic's best attack, to cover more of the game than the heuristic alone plays.
+    """
+    rng = random.Random(seed * 1_000_003 + first_battle)
+    lines: list[str] = []
+    dumps = json.JSONEncoder(separators=(",", ":")).encode
+    for battle in range(first_battle, first_battle + battles):
+        team_a, team_b = rng.sample(_species, team_size), rng.sample(_species, team_size)
+        sim = BattleSim(team_a, team_b, _chart)
+        state = SimState.new(team_a, team_b, sim.order_for(0, 0, rng))
+        rows = []
+        for _ in range(1000):
+            if state.winner is not None:
+                break
+            role = state.next_actor
+            if epsilon and rng.random() < epsilon:
+                action = rng.choice(sim.legal_actions(state, role))
+            else:
+                action = sim.best_attack(state, role)
+            actor = sim.active(state, role).id
+            target = sim.active(state, "b" if role == "a" else "a").id
+            turn, phase = state.turn + 1, state.phase
+            strike = sim.step(state, action, rng)
+            row = {"battle": battle, "turn": turn, "phase": phase, "actor": role, "species": actor, "target": target}
+            row["action"] = action["type"]
+            if strike is not None:
+                row.update(strike._asdict())
+            elif action["type"] == "switch":
+                row["to"] = sim.teams[role][action["to"]].id
+            rows.append(row)
+        for row in rows:
+            row["winner"] = state.winner
+            lines.append(dumps(row))
+    body = ("\n".join(lines) + "\n").encode() if lines else b""
+    return battles, len(lines), gzip.compress(body, compresslevel=1)
+
+
+def _chunks(total: int, chunk: int) -> Iterator[tuple[int, int]]:
+    for first in range(0, total, chunk):
+        yield first, min(chunk, total - first)
+
+
+def generate(
+    out: BinaryIO,
+    species: Sequence[Pokemon],
+    chart: TypeChart,
+    battles: int,
+    *,
+    workers: int | None = None,
+    seed: int = 1,
+    team_size: int = 3,
+    epsilon: float = 0.0,
+    on_chunk: Callable[[int, int], None] | None = None,
+) -> tuple[int, int]:
+    """Plays `battles` battles in a process pool and appends their rows to `out` as concatenated gzip members.
+
+    At most two chunks per worker are in flight and each is written (in order) as soon as it is done, so memory
+    stays flat however many battles are asked for. Returns (battles, rows).
+    """
+    if len(species) < team_size:
+        raise ValueError(f"Need at least {team_size} species to draw teams from.")
+    workers = max(1, workers or os.cpu_count() or 1)
+    played = rows = 0
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(species, chart)) as pool:
+        pending: deque[Future] = deque()
+        limit = 2 * workers
+        for first, count in _chunks(battles, CHUNK_BATTLES):
+            pending.append(pool.submit(play_chunk, seed, first, count, team_size, epsilon))
+            if len(pending) >= limit:
+                played, rows = _write(out, pending.popleft(), played, rows, on_chunk)
+        while pending:
+            played, rows = _write(out, pending.popleft(), played, rows, on_chunk)
+    return played, rows
+
+
+def _write(out: BinaryIO, future: Future, played: int, rows: int, on_chunk) -> tuple[int, int]:
+    battles, chunk_rows, data = future.result()
+    out.write(data)
+    played, rows = played + battles, rows + chunk_rows
+    if on_chunk is not None:
+        on_chunk(played, rows)
+    return played, rows
+
+
+def read_rows(path: str | Path) -> Iterator[dict]:
+    """Iterates the rows of a file written by `generate()`; gzip reads concatenated members as one stream."""
+    with gzip.open(path, "rt", encoding="utf-8") as fh:
+        for line in fh:
+            if line.strip():
+                yield json.loads(line)
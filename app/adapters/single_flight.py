@@ -0,0 +1,82 @@
+import threading
+import time
+import uuid
+from concurrent.futures import Future
+from typing import Any, Callable
+
+from django.core.cache import cache as default_cache
+
+_LOCK_PREFIX = "flight:"
+
+
+class SingleFlight:
+    """Collapses concurrent loads of the same key into one.
+
+    Inside a process the first caller runs `fn` and everyone else waits on its future. Across processes the leader
+    also takes a short lock in the shared cache; a process that finds the lock taken polls `check()` (usually "is
+    the value in the cache yet?") instead of calling upstream itself, and only runs `fn` if the lock holder has
+    not delivered within `wait_seconds`.
+    """
+
+    def __init__(
+        self,
+        backend=None,
+        *,
+        lock_seconds: float = 10.0,
+        wait_seconds: float = 5.0,
+        poll_seconds: float = 0.05,
+    ):
+        self.backend = backend if backend is not None else default_cache
+        self.lock_seconds = lock_seconds
+        self.wait_seconds = wait_seconds
+        self.poll_seconds = poll_seconds
+        self._lock = threading.Lock()
+        self._inflight: dict[str, Future] = {}
+
+    def in_flight(self, key: str) -> bool:
+        with self._lock:
+            return key in self._inflight
+
+    def do(self, key: str, fn: Callable[[], Any], check: Callable[[], Any] | None = None) -> Any:
+        with self._lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+        if not leader:
+            return future.result()
+
+        try:
+            value = self._run_shared(key, fn, check)
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(value)
+            return value
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def _run_shared(self, key: str, fn: Callable[[], Any], check: Callable[[], Any] | None) -> Any:
+        lock_key = _LOCK_PREFIX + key
+        token = uuid.uuid4().hex
+        if self.backend.add(lock_key, token, timeout=self.lock_seconds):
+            try:
+                return fn()
+            finally:
+                if self.backend.get(lock_key) == token:
+                    self.backend.delete(lock_key)
+
+        if check is not None:
+            deadline = time.monotonic() + self.wait_seconds
+            while time.monotonic() < deadline:
+                time.sleep(self.poll_seconds)
+                lock_released = self.backend.get(lock_key) is None
+                value = check()
+                if value is not None:
+                    return value
+                if lock_released:
+                    break
+        # The other worker failed, or is still stuck past our patience: load it ourselves.
+        return fn()
@@ -0,0 +1,102 @@
+import csv
+import json
+from pathlib import Path
+
+from django.db import transaction
+from django.utils import timezone
+
+from app.adapters.pokeapi_local import invalidate_local_species
+from app.adapters.repositories import invalidate_species_cache
+from app.domain.entities import Pokemon
+from app.models import Species, TypeEffectiveness
+
+DEFAULT_DATASET_PATH = Path(__file__).resolve().parent.parent / "data" / "species.json"
+
+_STAT_KEYS = ("hp", "attack", "defense", "speed")
+
+
+def _parse_species(item: dict) -> Pokemon:
+    try:
+        pokemon_id = int(item["id"])
+        name = str(item["name"]).strip().lower()
+        raw_types = item.get("types") or []
+        if isinstance(raw_types, str):
+            raw_types = raw_types.replace("|", " ").replace(",", " ").split()
+        types = [str(t).strip().lower() for t in raw_types if str(t).strip()]
+        raw_stats = item.get("stats") if isinstance(item.get("stats"), dict) else item
+        stats = {key: int(raw_stats[key]) for key in _STAT_KEYS}
+    except (KeyError, TypeError, ValueError) as exc:
+        raise ValueError(f"Invalid species record: {item!r}") from exc
+    if not name or not types:
+        raise ValueError(f"Invalid species record: {item!r}")
+    return Pokemon.of(pokemon_id, name, types, stats)
+
+
+def _parse_type_chart(raw: dict) -> dict[str, dict[str, float]]:
+    chart: dict[str, dict[str, float]] = {}
+    for attack_type, row in (raw or {}).items():
+        if not isinstance(row, dict):
+            raise ValueError(f"Invalid type chart row for {attack_type!r}.")
+        chart[str(attack_type).lower()] = {str(d).lower(): float(m) for d, m in row.items()}
+    return chart
+
+
+def load_species_file(path: str | Path) -> tuple[list[Pokemon], dict[str, dict[str, float]]]:
+    """Reads a JSON dump (species + type_chart) or a species CSV (id,name,types,hp,attack,defense,speed)."""
+    path = Path(path)
+    if path.suffix.lower() == ".csv":
+        with path.open(newline="", encoding="utf-8") as fh:
+            return [_parse_species(row) for row in csv.DictReader(fh)], {}
+
+    with path.open(encoding="utf-8") as fh:
+        data = json.load(fh)
+    if isinstance(data, list):
+        return [_parse_species(item) for item in data], {}
+    species = [_parse_species(item) for item in data.get("species", [])]
+    return species, _parse_type_chart(data.get("type_chart") or {})
+
+
+def load_type_chart_csv(path: str | Path) -> dict[str, dict[str, float]]:
+    """Reads a type matrix CSV with attack_type,defender_type,multiplier columns."""
+    chart: dict[str, dict[str, float]] = {}
+    with Path(path).open(newline="", encoding="utf-8") as fh:
+        for row in csv.DictReader(fh):
+            try:
+                attack_type = str(row["attack_type"]).strip().lower()
+                defender_type = str(row["defender_type"]).strip().lower()
+                multiplier = float(row["multiplier"])
+            except (KeyError, TypeError, ValueError) as exc:
+                raise ValueError(f"Invalid type chart record: {row!r}") from exc
+            chart.setdefault(attack_type, {})[defender_type] = multiplier
+    return chart
+
+
+@transaction.atomic
+def import_species(species: list[Pokemon], type_chart: dict[str, dict[str, float]]) -> tuple[int, int]:
+    now = timezone.now()
+    rows = [Species(id=p.id, name=p.name, stats=dict(p.stats), types=list(p.types), updated_at=now) for p in species]
+    if rows:
+        # Names are unique, so move rows whose name now belongs to another id out of the way first. Rows users own
+        # are protected from deletion, so those keep their id (and the users' catalog) under a freed-up name.
+        stale = Species.objects.filter(name__in=[r.name for r in rows]).exclude(id__in=[r.id for r in rows])
+        stale.filter(owners__isnull=True).delete()
+        for pk, name in stale.values_list("id", "name"):
+            Species.objects.filter(id=pk).update(name=f"{name}#{pk}")
+        Species.objects.bulk_create(
+            rows,
+            update_conflicts=True,
+            unique_fields=["id"],
+            update_fields=["name", "stats", "types", "updated_at"],
+        )
+
+    relations = [
+        TypeEffectiveness(attack_type=attack_type, defender_type=defender_type, multiplier=multiplier)
+        for attack_type, row in type_chart.items()
+        for defender_type, multiplier in row.items()
+    ]
+    if relations:
+        TypeEffectiveness.objects.filter(attack_type__in=list(type_chart.keys())).delete()
+        TypeEffectiveness.objects.bulk_create(relations)
+    invalidate_local_species()
+    invalidate_species_cache()
+    return len(rows), len(type_chart)
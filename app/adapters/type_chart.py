@@ -0,0 +1,105 @@
+import hashlib
+import json
+import threading
+from pathlib import Path
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+from app.ports.type_chart import TypeChartPort
+
+TypeChart = dict[str, dict[str, float]]
+
+
+def chart_version(chart: TypeChart) -> str:
+    canonical = json.dumps(chart, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:12]
+
+
+def _read(path: Path) -> tuple[str | None, dict[str, TypeChart]]:
+    try:
+        with path.open(encoding="utf-8") as fh:
+            data = json.load(fh)
+    except FileNotFoundError:
+        return None, {}
+    versions = {
+        str(version): {a: {d: float(m) for d, m in row.items()} for a, row in chart.items()}
+        for version, chart in (data.get("versions") or {}).items()
+    }
+    current = data.get("current")
+    return (str(current) if current in versions else None), versions
+
+
+def write_type_chart(path: str | Path, chart: TypeChart) -> tuple[str, bool]:
+    """Makes `chart` the current version in `path`; returns (version, whether it was new).
+
+    Earlier versions are kept so battles created with them still resolve after a rebuild.
+    """
+    if not chart:
+        raise ValueError("Type chart is empty.")
+    path = Path(path)
+    version = chart_version(chart)
+    _current, versions = _read(path)
+    created = version not in versions
+    versions[version] = chart
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with tmp.open("w", encoding="utf-8") as fh:
+        json.dump({"current": version, "versions": versions}, fh, sort_keys=True, indent=1)
+        fh.write("\n")
+    tmp.replace(path)
+    return version, created
+
+
+class TypeChartStore(TypeChartPort):
+    """Every built type chart version, held in memory for the life of the process.
+
+    Battles store only the version they were created with. Charts are shared between battles and must be treated as
+    read-only.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._current, self._versions = _read(self.path)
+
+    def current(self) -> tuple[str, TypeChart]:
+        if self._current is None:
+            raise RuntimeError(f"No type chart at {self.path}; run `manage.py build_type_chart`.")
+        return self._current, self._versions[self._current]
+
+    def get(self, version: str) -> TypeChart | None:
+        """Re-reads the file for a version this process has not seen, e.g. one built after it started."""
+        version = str(version)
+        chart = self._versions.get(version)
+        if chart is None:
+            _current, versions = _read(self.path)
+            with _store_lock:
+                self._versions = {**versions, **self._versions}
+            chart = self._versions.get(version)
+        return chart
+
+
+_store: TypeChartStore | None = None
+_store_lock = threading.Lock()
+
+
+def get_type_chart_store() -> TypeChartStore:
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = TypeChartStore(settings.TYPE_CHART_PATH)
+    return _store
+
+
+def reload_type_chart_store() -> None:
+    global _store
+    with _store_lock:
+        _store = None
+
+
+@receiver(setting_changed)
+def _reset_type_chart_store(setting, **kwargs) -> None:
+    if setting == "TYPE_CHART_PATH":
+        reload_type_chart_store()
@@ -1,18 +1,47 @@
+import copy
 import random
 import time
-from concurrent.futures import ThreadPoolExecutor
 from typing import Dict
 
+from app.domain.lookahead import LookaheadBot
 from app.domain.services import BattleEngine, type_multiplier
-from app.ports.notification import NotificationPort
+from app.domain.simulation import BattleSim, SimState
+from app.ports.bots import BotTeamPort, BotTurnPort
+from app.ports.events import EventBusPort, battle_topic, user_topic
+from app.ports.notification import Notification, NotificationPort
 from app.ports.repos import BattleRepoPort, CatalogPort, LobbyPort
 from app.ports.pokeapi import PokeApiPort
 from app.ports.stats import StatsPort
+from app.ports.type_chart import TypeChartPort
 from app.ports.users import BOT_USERNAME, UserPort
 
 BATTLE_TTL_SECONDS = 15 * 60
-POKEAPI_FETCH_WORKERS = 6
 TURN_SEED_STRIDE = 3
+LONG_POLL_MAX_SECONDS = 25
+LONG_POLL_RECHECK_SECONDS = 5
+
+
+def _resolve_species(catalog: CatalogPort, pokeapi: PokeApiPort, pokemon_ids: list[int]) -> list:
+    """Returns species in `pokemon_ids` order; only species never seen before are fetched and stored."""
+    pokes_by_id = catalog.get_species(pokemon_ids)
+    missing_ids = [pokemon_id for pokemon_id in pokemon_ids if pokemon_id not in pokes_by_id]
+    if missing_ids:
+        fetched = pokeapi.fetch_pokemons(missing_ids)
+        catalog.save_species(fetched)
+        for pokemon in fetched:
+            pokes_by_id[pokemon.id] = pokemon
+    return [pokes_by_id[pokemon_id] for pokemon_id in pokemon_ids if pokemon_id in pokes_by_id]
+
+
+def _prefetch_team(catalog: CatalogPort, pokeapi: PokeApiPort, user_id: int, pokemon_ids: list[int] | None) -> set[int]:
+    """Stores the species of the team a battle will use and returns their ids.
+
+    Run it before the transaction that starts the battle, so that one finds every species in the catalog and holds no
+    locks across PokeAPI round-trips.
+    """
+    ids = [int(x) for x in pokemon_ids] if pokemon_ids is not None else catalog.get_active_team_ids(user_id)
+    _resolve_species(catalog, pokeapi, ids)
+    return set(ids)
 
 
 class CatalogUC:
@@ -21,22 +50,13 @@ class CatalogUC:
         self.pokeapi = pokeapi
         self.seed_limit = seed_limit
 
-    def _fetch_pokemons(self, pokemon_ids: list[int]):
-        if not pokemon_ids:
-            return []
-
-        max_workers = min(POKEAPI_FETCH_WORKERS, len(pokemon_ids))
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            return list(executor.map(self.pokeapi.fetch_pokemon, pokemon_ids))
-
     def list(self, user_id: int):
         current = self.catalog.list_user_pokemon(user_id)
         if current:
             return current
 
         pokemon_ids = self.pokeapi.list_pokemon_ids(limit=self.seed_limit, offset=0)
-        for pokemon in self._fetch_pokemons(pokemon_ids):
-            self.catalog.upsert_user_pokemon(user_id, pokemon)
+        self.catalog.upsert_user_pokemons(user_id, _resolve_species(self.catalog, self.pokeapi, pokemon_ids))
 
         return self.catalog.list_user_pokemon(user_id)
 
@@ -45,21 +65,7 @@ class CatalogUC:
         offset = max(0, int(offset))
 
         pokemon_ids = self.pokeapi.list_pokemon_ids(limit=limit, offset=offset)
-
-        pokes_by_id = {}
-        missing_ids: list[int] = []
-        for pokemon_id in pokemon_ids:
-            existing = self.catalog.get_user_pokemon(user_id, pokemon_id)
-            if existing:
-                pokes_by_id[pokemon_id] = existing
-            else:
-                missing_ids.append(pokemon_id)
-
-        for pokemon in self._fetch_pokemons(missing_ids):
-            stored = self.catalog.upsert_user_pokemon(user_id, pokemon)
-            pokes_by_id[stored.id] = stored
-
-        return [pokes_by_id[pokemon_id] for pokemon_id in pokemon_ids if pokemon_id in pokes_by_id]
+        return _resolve_species(self.catalog, self.pokeapi, pokemon_ids)
 
 
 class GetPokemonUC:
@@ -69,11 +75,10 @@ class GetPokemonUC:
 
     def execute(self, user_id: int, pokemon_id: int):
         pokemon_id = int(pokemon_id)
-        existing = self.catalog.get_user_pokemon(user_id, pokemon_id)
-        if existing:
-            return existing
-        pokemon = self.pokeapi.fetch_pokemon(pokemon_id)
-        return self.catalog.upsert_user_pokemon(user_id, pokemon)
+        found = _resolve_species(self.catalog, self.pokeapi, [pokemon_id])
+        if not found:
+            raise ValueError("Pokémon not found.")
+        return found[0]
 
 
 class SearchPokemonUC:
@@ -93,25 +98,7 @@ class SearchPokemonUC:
         pokemon_ids = self.pokeapi.search_pokemon_ids(query.lower(), limit=limit, offset=offset)
         if not pokemon_ids:
             return []
-
-        pokes_by_id = {}
-        missing_ids: list[int] = []
-        for pokemon_id in pokemon_ids:
-            existing = self.catalog.get_user_pokemon(user_id, pokemon_id)
-            if existing:
-                pokes_by_id[pokemon_id] = existing
-            else:
-                missing_ids.append(pokemon_id)
-
-        if missing_ids:
-            max_workers = min(POKEAPI_FETCH_WORKERS, len(missing_ids))
-            with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                fetched = list(executor.map(self.pokeapi.fetch_pokemon, missing_ids))
-            for pokemon in fetched:
-                stored = self.catalog.upsert_user_pokemon(user_id, pokemon)
-                pokes_by_id[stored.id] = stored
-
-        return [pokes_by_id[pokemon_id] for pokemon_id in pokemon_ids if pokemon_id in pokes_by_id]
+        return _resolve_species(self.catalog, self.pokeapi, pokemon_ids)
 
 
 class SelectPokemonUC:
@@ -120,18 +107,18 @@ class SelectPokemonUC:
         self.pokeapi = pokeapi
 
     def execute(self, user_id: int, pokemon_id: int):
-        if not self.catalog.get_user_pokemon(user_id, pokemon_id):
-            pokemon = self.pokeapi.fetch_pokemon(pokemon_id)
-            self.catalog.upsert_user_pokemon(user_id, pokemon)
+        pokemon = self.catalog.get_user_pokemon(user_id, pokemon_id)
+        if not pokemon:
+            species = GetPokemonUC(self.catalog, self.pokeapi).execute(user_id, pokemon_id)
+            pokemon = self.catalog.upsert_user_pokemon(user_id, species)
         self.catalog.set_active(user_id, pokemon_id)
-        return self.catalog.get_user_pokemon(user_id, pokemon_id)
+        return pokemon
 
 
 class SetTeamUC:
     def __init__(self, catalog: CatalogPort, pokeapi: PokeApiPort):
         self.catalog = catalog
         self.pokeapi = pokeapi
-        self.get_pokemon = GetPokemonUC(catalog, pokeapi)
 
     def execute(self, user_id: int, pokemon_ids: list[int]) -> list:
         ids = [int(x) for x in (pokemon_ids or [])]
@@ -140,7 +127,10 @@ class SetTeamUC:
         if len(set(ids)) != 3:
             raise ValueError("Team Pokémon must be unique.")
 
-        team = [self.get_pokemon.execute(user_id, pid) for pid in ids]
+        species = _resolve_species(self.catalog, self.pokeapi, ids)
+        if len(species) != len(ids):
+            raise ValueError("Pokémon not found.")
+        team = self.catalog.upsert_user_pokemons(user_id, species)
         self.catalog.set_active_team(user_id, ids)
         self.catalog.set_active(user_id, ids[0])
         return team
@@ -150,13 +140,15 @@ class GetTeamUC:
     def __init__(self, catalog: CatalogPort, pokeapi: PokeApiPort):
         self.catalog = catalog
         self.pokeapi = pokeapi
-        self.get_pokemon = GetPokemonUC(catalog, pokeapi)
 
     def execute(self, user_id: int) -> list:
         ids = self.catalog.get_active_team_ids(user_id)
         if not ids:
             return []
-        return [self.get_pokemon.execute(user_id, pid) for pid in ids]
+        team = _resolve_species(self.catalog, self.pokeapi, ids)
+        if len(team) != len(ids):
+            raise ValueError("Pokémon not found.")
+        return team
 
 
 class EnterLobbyUC:
@@ -167,12 +159,17 @@ class EnterLobbyUC:
         battles: BattleRepoPort,
         notifier: NotificationPort,
         pokeapi: PokeApiPort,
+        charts: TypeChartPort,
     ):
         self.catalog = catalog
         self.lobby = lobby
+        self.pokeapi = pokeapi
         self.set_team = SetTeamUC(catalog, pokeapi)
         self.get_team = GetTeamUC(catalog, pokeapi)
-        self.start_battle = StartBattleUC(battles, notifier, pokeapi)
+        self.start_battle = StartBattleUC(battles, notifier, charts)
+
+    def prefetch(self, user_id: int, pokemon_ids: list[int] | None = None) -> None:
+        _prefetch_team(self.catalog, self.pokeapi, user_id, pokemon_ids)
 
     def execute(self, user_id: int, pokemon_ids: list[int] | None = None) -> dict:
         if pokemon_ids is not None:
@@ -184,7 +181,8 @@ class EnterLobbyUC:
 
         match = self.lobby.try_match(user_id)
         if match:
-            opp_team = [self.catalog.get_user_pokemon(match.user_id, pid) for pid in match.pokemon_ids]
+            owned = self.catalog.get_user_pokemons(match.user_id, match.pokemon_ids)
+            opp_team = [owned.get(int(pid)) for pid in match.pokemon_ids]
             if any(p is None for p in opp_team):
                 raise ValueError("Matched Pokémon not found in catalog.")
 
@@ -203,12 +201,17 @@ class CodeLobbyUC:
         battles: BattleRepoPort,
         notifier: NotificationPort,
         pokeapi: PokeApiPort,
+        charts: TypeChartPort,
     ):
         self.catalog = catalog
         self.lobby = lobby
+        self.pokeapi = pokeapi
         self.set_team = SetTeamUC(catalog, pokeapi)
         self.get_team = GetTeamUC(catalog, pokeapi)
-        self.start_battle = StartBattleUC(battles, notifier, pokeapi)
+        self.start_battle = StartBattleUC(battles, notifier, charts)
+
+    def prefetch(self, user_id: int, pokemon_ids: list[int] | None = None) -> None:
+        _prefetch_team(self.catalog, self.pokeapi, user_id, pokemon_ids)
 
     @staticmethod
     def _normalize_code(code: str | int) -> str:
@@ -230,7 +233,8 @@ class CodeLobbyUC:
 
         match = self.lobby.try_match_code_lobby(user_id, code)
         if match:
-            opp_team = [self.catalog.get_user_pokemon(match.user_id, pid) for pid in match.pokemon_ids]
+            owned = self.catalog.get_user_pokemons(match.user_id, match.pokemon_ids)
+            opp_team = [owned.get(int(pid)) for pid in match.pokemon_ids]
             if any(p is None for p in opp_team):
                 raise ValueError("Matched Pokémon not found in catalog.")
             battle_id = self.start_battle.execute(match.user_id, user_id, [p for p in opp_team if p], my_team)
@@ -250,20 +254,44 @@ class CloseCodeLobbyUC:
         return {"status": "closed", "code": code}
 
 
+def _to_players_and_spectators(battle, event: str, payload: dict) -> list[Notification]:
+    # Spectators get one event per battle, however many of them are watching; the notify hub fans it out.
+    return [Notification(user_id, event, payload) for user_id in (battle.p1_id, battle.p2_id)] + [
+        Notification.for_battle(battle.id, event, payload)
+    ]
+
+
+def _battle_ended(battle, outcome: dict) -> list[Notification]:
+    return _to_players_and_spectators(battle, "battle_ended", {"battle_id": battle.id, **outcome})
+
+
+def _turn_resolved(battle, turn_record: dict, next_actor: str | None) -> list[Notification]:
+    """The turn without its full state snapshot: enough for clients to animate it and know whose move is next."""
+    payload = {
+        "battle_id": battle.id,
+        "turn": turn_record["turn"],
+        "phase": turn_record["phase"],
+        "actor": turn_record["actor"],
+        "action": turn_record["action"],
+        "log": turn_record["log"],
+        "next_actor": next_actor,
+        "finished": next_actor is None,
+    }
+    return _to_players_and_spectators(battle, "turn_resolved", payload)
+
+
 class StartBattleUC:
-    def __init__(self, repo: BattleRepoPort, notifier: NotificationPort, pokeapi: PokeApiPort):
+    def __init__(
+        self, repo: BattleRepoPort, notifier: NotificationPort, charts: TypeChartPort, bots: BotTurnPort | None = None
+    ):
         self.repo = repo
         self.notifier = notifier
-        self.pokeapi = pokeapi
+        self.charts = charts
+        self.bots = bots
 
     def execute(self, p1_id: int, p2_id: int, p1_team, p2_team):
         seed = random.randint(1, 10_000_000)
-        types = sorted(set([t for p in [*p1_team, *p2_team] for t in (p.types or [])]))
-
-        max_workers = min(POKEAPI_FETCH_WORKERS, max(1, len(types)))
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            charts = list(executor.map(self.pokeapi.fetch_type_chart, types))
-        type_chart = {t: c for t, c in zip(types, charts)}
+        chart_version, type_chart = self.charts.current()
 
         initiative_seed = seed + 0 * TURN_SEED_STRIDE
         first_actor, init_detail = BattleEngine(initiative_seed, type_chart).initiative_detail(
@@ -271,9 +299,15 @@ class StartBattleUC:
         )
         initiative = {"seed": initiative_seed, "winner": first_actor, **init_detail}
         order = ["a", "b"] if first_actor == "a" else ["b", "a"]
-        battle_id = self.repo.create_battle(p1_id, p2_id, p1_team, p2_team, seed, type_chart, order, initiative)
-        self.notifier.send(p1_id, "battle_started", {"battle_id": battle_id, "opponent_id": p2_id, "role": "a"})
-        self.notifier.send(p2_id, "battle_started", {"battle_id": battle_id, "opponent_id": p1_id, "role": "b"})
+        battle_id = self.repo.create_battle(p1_id, p2_id, p1_team, p2_team, seed, chart_version, order, initiative)
+        self.notifier.send_many(
+            [
+                Notification(p1_id, "battle_started", {"battle_id": battle_id, "opponent_id": p2_id, "role": "a"}),
+                Notification(p2_id, "battle_started", {"battle_id": battle_id, "opponent_id": p1_id, "role": "b"}),
+            ]
+        )
+        if self.bots is not None:
+            self.bots.turn_passed(battle_id, p1_id if first_actor == "a" else p2_id)
         return battle_id
 
 
@@ -285,13 +319,17 @@ class StartPveBattleUC:
         notifier: NotificationPort,
         pokeapi: PokeApiPort,
         users: UserPort,
+        charts: TypeChartPort,
+        bots: BotTurnPort | None = None,
+        teams: BotTeamPort | None = None,
     ):
         self.catalog = catalog
         self.pokeapi = pokeapi
         self.users = users
+        self.teams = teams
         self.set_team = SetTeamUC(catalog, pokeapi)
         self.get_team = GetTeamUC(catalog, pokeapi)
-        self.start_battle = StartBattleUC(battles, notifier, pokeapi)
+        self.start_battle = StartBattleUC(battles, notifier, charts, bots)
 
     def _pick_bot_team_ids(self, *, exclude: set[int]) -> list[int]:
         offset = random.randint(0, 2000)
@@ -307,7 +345,21 @@ class StartPveBattleUC:
                     break
         return ids[:3]
 
-    def execute(self, user_id: int, pokemon_ids: list[int] | None = None) -> dict:
+    def _bot_team(self, exclude: set[int]) -> list:
+        bot_team = self.teams.take(exclude) if self.teams is not None else None
+        if bot_team is None:
+            # Cold pool (or none configured): resolve a team inline, as the pool's refill would.
+            bot_team_ids = self._pick_bot_team_ids(exclude=exclude)
+            if len(bot_team_ids) != 3:
+                raise ValueError("Failed to select a bot team.")
+            bot_team = self.pokeapi.fetch_pokemons(bot_team_ids)
+        return bot_team
+
+    def prefetch(self, user_id: int, pokemon_ids: list[int] | None = None) -> list:
+        """Stores the player's species and picks the bot team; hand the team to `execute`."""
+        return self._bot_team(_prefetch_team(self.catalog, self.pokeapi, user_id, pokemon_ids))
+
+    def execute(self, user_id: int, pokemon_ids: list[int] | None = None, bot_team: list | None = None) -> dict:
         if pokemon_ids is not None:
             self.set_team.execute(user_id, pokemon_ids)
 
@@ -316,10 +368,8 @@ class StartPveBattleUC:
             raise ValueError("Active team not set. Select 3 Pokémon in your catalog first.")
 
         bot_id = self.users.get_or_create_bot_user_id()
-        bot_team_ids = self._pick_bot_team_ids(exclude={p.id for p in my_team})
-        if len(bot_team_ids) != 3:
-            raise ValueError("Failed to select a bot team.")
-        bot_team = [self.pokeapi.fetch_pokemon(pid) for pid in bot_team_ids]
+        if bot_team is None:
+            bot_team = self._bot_team({p.id for p in my_team})
 
         battle_id = self.start_battle.execute(bot_id, user_id, bot_team, my_team)
         return {
@@ -332,14 +382,18 @@ class StartPveBattleUC:
 
 
 class PlayTurnUC:
-    def __init__(self, repo: BattleRepoPort, notifier: NotificationPort, stats: StatsPort):
+    def __init__(
+        self, repo: BattleRepoPort, notifier: NotificationPort, stats: StatsPort, bots: BotTurnPort | None = None
+    ):
         self.repo = repo
         self.notifier = notifier
         self.stats = stats
+        self.bots = bots
 
     def execute(self, battle_id: int, user_id: int, action: Dict) -> dict:
         try:
-            battle = self.repo.load_battle(battle_id)
+            # Locked so two writers (a player and the bot worker, or two workers) cannot both play the same turn.
+            battle = self.repo.load_battle(battle_id, for_update=True)
         except Exception as exc:
             raise ValueError("Battle not found.") from exc
 
@@ -360,8 +414,25 @@ class PlayTurnUC:
             raise PermissionError("You are not a participant of this battle.")
 
         normalized_action = self._normalize_action(battle, role, action, attacker)
+        turn_record, next_state = self.advance(battle, battle.state, role, normalized_action)
+        self.repo.save_turn(battle.id, turn_record)
 
-        state = dict(battle.state or {})
+        if next_state.get("finished"):
+            outcome = self.finish_battle(battle, turn_record, next_state)
+            return {"status": "finished", "turn": turn_record, "outcome": outcome}
+
+        self.repo.update_state(battle.id, next_state)
+        self.notifier.send_many(_turn_resolved(battle, turn_record, next_state["next_actor"]))
+        if self.bots is not None:
+            self.bots.turn_passed(battle.id, battle.p1_id if next_state["next_actor"] == "a" else battle.p2_id)
+        return {"status": "resolved", "turn": turn_record}
+
+    def advance(self, battle, state: dict, role: str, action: Dict) -> tuple[dict, dict]:
+        """Plays one normalized action in memory; returns the turn record and the state after it, next mover set.
+
+        Touches neither the repository nor `battle.state`, so callers can chain it to play several turns at once.
+        """
+        state = dict(state or {})
         turn_index = int(state.get("turn", 0) or 0)
         phase = int(state.get("phase", 0) or 0)
         if phase not in (0, 1):
@@ -386,7 +457,7 @@ class PlayTurnUC:
         state["next_actor"] = expected
 
         action_seed = battle.seed.value + (turn_index * TURN_SEED_STRIDE) + (1 if phase == 0 else 2)
-        log, next_state = BattleEngine(action_seed, battle.type_chart).step(battle, role, normalized_action, state)
+        log, next_state = BattleEngine(action_seed, battle.type_chart).step(battle, role, action, state)
         next_state["turn"] = turn_index
         next_state["phase"] = phase
         next_state["order"] = order
@@ -398,38 +469,13 @@ class PlayTurnUC:
             "rng_seed": action_seed,
             "initiative": order[0],
             "actor": role,
-            "action": normalized_action,
+            "action": action,
             "log": log,
-            "state": next_state,
+            # Snapshot: the code below advances next_state in place (and decay_effects mutates its sides).
+            "state": copy.deepcopy(next_state),
         }
-        self.repo.save_turn(battle.id, turn_record)
-
         if next_state.get("finished"):
-            outcome = {"winner": next_state.get("winner"), "loser": next_state.get("loser")}
-            if outcome["winner"] is None or outcome["loser"] is None:
-                outcome = {"draw": True, "reason": "engine"}
-            turns = self.repo.list_events(battle.id)
-            replay = {
-                "battle_id": battle.id,
-                "seed": battle.seed.value,
-                "type_chart": battle.type_chart,
-                "turns": turns,
-                "outcome": outcome,
-            }
-            self.repo.finish(battle.id, {"state": next_state, "outcome": outcome, "replay": replay})
-
-            self.notifier.send(battle.p1_id, "battle_ended", {"battle_id": battle.id, **outcome})
-            self.notifier.send(battle.p2_id, "battle_ended", {"battle_id": battle.id, **outcome})
-
-            if outcome.get("draw"):
-                return {"status": "finished", "turn": turn_record, "outcome": outcome}
-
-            win_user_id = battle.p1_id if outcome["winner"] == "a" else battle.p2_id
-            lose_user_id = battle.p1_id if outcome["loser"] == "a" else battle.p2_id
-            self._record_stats(battle, turns, outcome)
-            self.notifier.send(win_user_id, "victory", {"battle_id": battle.id, "opponent_id": lose_user_id})
-            self.notifier.send(lose_user_id, "defeat", {"battle_id": battle.id, "opponent_id": win_user_id})
-            return {"status": "finished", "turn": turn_record, "outcome": outcome}
+            return turn_record, next_state
 
         if phase == 0:
             next_state["phase"] = 1
@@ -453,9 +499,34 @@ class PlayTurnUC:
             next_state["order"] = next_order
             next_state["next_actor"] = next_order[0]
             next_state["initiative"] = {"seed": initiative_seed, "winner": first_actor, **init_detail}
+        return turn_record, next_state
 
-        self.repo.update_state(battle.id, next_state)
-        return {"status": "resolved", "turn": turn_record}
+    def finish_battle(self, battle, turn_record: dict, next_state: dict) -> dict:
+        """Finishes the battle after its last turn has been saved; returns the outcome."""
+        outcome = {"winner": next_state.get("winner"), "loser": next_state.get("loser")}
+        if outcome["winner"] is None or outcome["loser"] is None:
+            outcome = {"draw": True, "reason": "engine"}
+        turns = self.repo.list_events(battle.id)
+        replay = {
+            "battle_id": battle.id,
+            "seed": battle.seed.value,
+            "type_chart": battle.type_chart,
+            "turns": turns,
+            "outcome": outcome,
+        }
+        self.repo.finish(battle.id, {"state": next_state, "outcome": outcome, "replay": replay})
+
+        notifications = _turn_resolved(battle, turn_record, None) + _battle_ended(battle, outcome)
+        if not outcome.get("draw"):
+            win_user_id = battle.p1_id if outcome["winner"] == "a" else battle.p2_id
+            lose_user_id = battle.p1_id if outcome["loser"] == "a" else battle.p2_id
+            self._record_stats(battle, turns, outcome)
+            notifications += [
+                Notification(win_user_id, "victory", {"battle_id": battle.id, "opponent_id": lose_user_id}),
+                Notification(lose_user_id, "defeat", {"battle_id": battle.id, "opponent_id": win_user_id}),
+            ]
+        self.notifier.send_many(notifications)
+        return outcome
 
     def _normalize_action(self, battle, role: str, action: Dict, attacker) -> Dict:
         if not isinstance(action, dict):
@@ -528,10 +599,25 @@ class PlayTurnUC:
 
 
 class BotAutoPlayUC:
-    def __init__(self, repo: BattleRepoPort, users: UserPort, notifier: NotificationPort, stats: StatsPort):
+    def __init__(
+        self,
+        repo: BattleRepoPort,
+        users: UserPort,
+        notifier: NotificationPort,
+        stats: StatsPort,
+        lookahead: LookaheadBot | None = None,
+    ):
         self.repo = repo
         self.users = users
         self.play_turn = PlayTurnUC(repo, notifier, stats)
+        self.lookahead = lookahead
+
+    def _search_action(self, battle, role: str, state: dict) -> dict:
+        sim = BattleSim(battle.p1_team, battle.p2_team, battle.type_chart)
+        action = self.lookahead.choose(sim, SimState.from_state(battle.p1_team, battle.p2_team, state))
+        if action["type"] == "switch":
+            return {"type": "switch", "slot": action["to"]}
+        return action
 
     @staticmethod
     def _pick_attack_type(
@@ -549,11 +635,38 @@ class BotAutoPlayUC:
                 best = t
         return best
 
+    @classmethod
+    def choose_action(cls, battle, role: str, state: dict) -> dict:
+        """The heuristic move for `role`: attack with its most effective type against the opponent's active Pokémon."""
+        team = battle.p1_team if role == "a" else battle.p2_team
+        opp_team = battle.p2_team if role == "a" else battle.p1_team
+        side = state.get(role, {}) if isinstance(state, dict) else {}
+        opp = "b" if role == "a" else "a"
+        opp_side = state.get(opp, {}) if isinstance(state, dict) else {}
+
+        try:
+            a_idx = int(side.get("active", 0)) if isinstance(side, dict) else 0
+        except (TypeError, ValueError):
+            a_idx = 0
+        try:
+            d_idx = int(opp_side.get("active", 0)) if isinstance(opp_side, dict) else 0
+        except (TypeError, ValueError):
+            d_idx = 0
+
+        a_idx = max(0, min(a_idx, max(0, len(team) - 1)))
+        d_idx = max(0, min(d_idx, max(0, len(opp_team) - 1)))
+
+        attacker = team[a_idx] if team else (battle.p1_pokemon if role == "a" else battle.p2_pokemon)
+        defender = opp_team[d_idx] if opp_team else (battle.p2_pokemon if role == "a" else battle.p1_pokemon)
+
+        attack_type = cls._pick_attack_type(battle.type_chart, attacker.types, defender.types)
+        return {"type": "attack", "attack_type": attack_type} if attack_type else {"type": "defend"}
+
     def execute(self, battle_id: int, max_actions: int = 2) -> int:
         bot_id = self.users.get_or_create_bot_user_id()
         performed = 0
         for _ in range(max(0, int(max_actions))):
-            battle = self.repo.load_battle(battle_id)
+            battle = self.repo.load_battle(battle_id, for_update=True)
             if battle.status != "active" or battle.state.get("finished"):
                 break
             if bot_id not in (battle.p1_id, battle.p2_id):
@@ -565,33 +678,81 @@ class BotAutoPlayUC:
             if next_actor != bot_role:
                 break
 
-            team = battle.p1_team if bot_role == "a" else battle.p2_team
-            opp_team = battle.p2_team if bot_role == "a" else battle.p1_team
-            side = state.get(bot_role, {}) if isinstance(state, dict) else {}
-            opp = "b" if bot_role == "a" else "a"
-            opp_side = state.get(opp, {}) if isinstance(state, dict) else {}
+            if self.lookahead is not None:
+                action = self._search_action(battle, bot_role, state)
+            else:
+                action = self.choose_action(battle, bot_role, state)
+            self.play_turn.execute(battle_id, bot_id, action)
+            performed += 1
 
-            try:
-                a_idx = int(side.get("active", 0)) if isinstance(side, dict) else 0
-            except (TypeError, ValueError):
-                a_idx = 0
-            try:
-                d_idx = int(opp_side.get("active", 0)) if isinstance(opp_side, dict) else 0
-            except (TypeError, ValueError):
-                d_idx = 0
+        return performed
 
-            a_idx = max(0, min(a_idx, max(0, len(team) - 1)))
-            d_idx = max(0, min(d_idx, max(0, len(opp_team) - 1)))
 
-            attacker = team[a_idx] if team else (battle.p1_pokemon if bot_role == "a" else battle.p2_pokemon)
-            defender = opp_team[d_idx] if opp_team else (battle.p2_pokemon if bot_role == "a" else battle.p1_pokemon)
+class AutoResolveBattleUC:
+    """Simulates the rest of a PvE battle in one request.
 
-            attack_type = self._pick_attack_type(battle.type_chart, attacker.types, defender.types)
-            action = {"type": "attack", "attack_type": attack_type} if attack_type else {"type": "defend"}
-            self.play_turn.execute(battle_id, bot_id, action)
-            performed += 1
+    Both sides play `BotAutoPlayUC.choose_action` through `PlayTurnUC.advance` in memory; the turns are then written
+    with one bulk insert and the battle with one final state write, and the players get the usual end-of-battle events.
+    """
 
-        return performed
+    MAX_ACTIONS = 1000
+
+    def __init__(self, repo: BattleRepoPort, users: UserPort, notifier: NotificationPort, stats: StatsPort):
+        self.repo = repo
+        self.users = users
+        self.notifier = notifier
+        self.play_turn = PlayTurnUC(repo, notifier, stats)
+
+    def execute(self, battle_id: int, user_id: int) -> dict:
+        try:
+            # Locked like PlayTurnUC, so a bot move the worker is about to play waits and then finds the battle over.
+            battle = self.repo.load_battle(battle_id, for_update=True)
+        except Exception as exc:
+            raise ValueError("Battle not found.") from exc
+        if user_id not in (battle.p1_id, battle.p2_id):
+            raise PermissionError("You are not a participant of this battle.")
+        if self.users.get_or_create_bot_user_id() not in (battle.p1_id, battle.p2_id):
+            raise ValueError("Only battles against the bot can be auto-resolved.")
+
+        if ExpireBattleUC(self.repo, self.notifier).expire_if_needed(battle):
+            return {"status": "finished", "outcome": {"draw": True, "reason": "timeout"}}
+        if battle.status != "active" or battle.state.get("finished"):
+            raise ValueError("Battle is not active.")
+
+        state = battle.state or {}
+        turns: list[dict] = []
+        while len(turns) < self.MAX_ACTIONS:
+            role = state.get("next_actor") or "a"
+            action = BotAutoPlayUC.choose_action(battle, role, state)
+            turn_record, state = self.play_turn.advance(battle, state, role, action)
+            turns.append(turn_record)
+            if state.get("finished"):
+                break
+
+        self.repo.save_turns(battle.id, turns)
+        if not state.get("finished"):
+            self.repo.update_state(battle.id, state)
+            self.notifier.send_many(_turn_resolved(battle, turns[-1], state["next_actor"]))
+            return {"status": "resolved", "turns": len(turns)}
+        outcome = self.play_turn.finish_battle(battle, turns[-1], state)
+        return {"status": "finished", "turns": len(turns), "outcome": outcome}
+
+
+class SpectateBattleUC:
+    """Public snapshot of a battle for non-participants; live turns then come from the notify service's battle topic."""
+
+    def __init__(self, repo: BattleRepoPort):
+        self.repo = repo
+
+    def execute(self, battle_id: int) -> dict:
+        view = self.repo.get_spectator_view(battle_id)
+        if view is None:
+            raise ValueError("Battle not found.")
+        return {
+            **view,
+            "turns": self.repo.list_events(battle_id),
+            "ws": f"/ws/spectate?battle_id={int(battle_id)}",
+        }
 
 
 class StatsUC:
@@ -636,8 +797,7 @@ class ExpireBattleUC:
         }
         self.repo.finish(battle.id, {"state": state, "outcome": outcome, "replay": replay})
 
-        self.notifier.send(battle.p1_id, "battle_ended", {"battle_id": battle.id, **outcome})
-        self.notifier.send(battle.p2_id, "battle_ended", {"battle_id": battle.id, **outcome})
+        self.notifier.send_many(_battle_ended(battle, outcome))
         return True
 
     def expire_for_user(self, user_id: int) -> int:
@@ -657,6 +817,67 @@ class ExpireBattleUC:
         return expired
 
 
+def _clamp_long_poll_timeout(timeout: float) -> float:
+    try:
+        value = float(timeout)
+    except (TypeError, ValueError):
+        value = LONG_POLL_MAX_SECONDS
+    return max(0.0, min(value, float(LONG_POLL_MAX_SECONDS)))
+
+
+class WaitBattleEventsUC:
+    def __init__(self, repo: BattleRepoPort, notifier: NotificationPort, events: EventBusPort):
+        self.repo = repo
+        self.notifier = notifier
+        self.events = events
+
+    def execute(self, battle_id: int, user_id: int, after: int = 0, timeout: float = LONG_POLL_MAX_SECONDS) -> dict:
+        self.prepare(battle_id, user_id)
+        return self.wait(battle_id, after, timeout)
+
+    def prepare(self, battle_id: int, user_id: int) -> None:
+        """Checks that `user_id` plays in the battle and expires it if overdue; run it in the notifier's transaction."""
+        try:
+            battle = self.repo.load_battle(battle_id)
+        except Exception as exc:
+            raise ValueError("Battle not found.") from exc
+        if user_id not in (battle.p1_id, battle.p2_id):
+            raise PermissionError("You are not a participant of this battle.")
+        ExpireBattleUC(self.repo, self.notifier).expire_if_needed(battle)
+
+    def wait(self, battle_id: int, after: int = 0, timeout: float = LONG_POLL_MAX_SECONDS) -> dict:
+        """Returns events after cursor `after`, waiting up to `timeout` seconds for the next turn if there are none."""
+        after = max(0, int(after))
+        deadline = time.monotonic() + _clamp_long_poll_timeout(timeout)
+        # Subscribe before the first read so a turn saved in between still wakes us up.
+        with self.events.listen(battle_topic(battle_id)) as subscription:
+            while True:
+                events = self.repo.list_events_since(battle_id, after)
+                status = self.repo.get_status(battle_id)
+                remaining = deadline - time.monotonic()
+                if events or status != "active" or remaining <= 0:
+                    return {"battle_id": battle_id, "status": status, "cursor": after + len(events), "events": events}
+                subscription.wait(min(remaining, LONG_POLL_RECHECK_SECONDS))
+
+
+class WaitLobbyMatchUC:
+    def __init__(self, repo: BattleRepoPort, events: EventBusPort):
+        self.repo = repo
+        self.events = events
+
+    def execute(self, user_id: int, after_battle_id: int = 0, timeout: float = LONG_POLL_MAX_SECONDS) -> dict:
+        deadline = time.monotonic() + _clamp_long_poll_timeout(timeout)
+        with self.events.listen(user_topic(user_id)) as subscription:
+            while True:
+                match = self.repo.find_active_battle(user_id, after_battle_id=after_battle_id)
+                if match:
+                    return {"status": "matched", **match}
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return {"status": "waiting"}
+                subscription.wait(min(remaining, LONG_POLL_RECHECK_SECONDS))
+
+
 class RegisterUserUC:
     def __init__(self, users: UserPort):
         self.users = users
@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class AppConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "app"
+
+    def ready(self):
+        from app.adapters.type_chart import get_type_chart_store
+
+        # Read the type chart before the first request so battle creation never touches disk or the network.
+        get_type_chart_store()
@@ -1,13 +1,90 @@
+import threading
+import weakref
+from collections.abc import Iterable, Iterator, Mapping
 from dataclasses import dataclass
-from typing import Dict, List
+from typing import Dict, List, Tuple
 
 
-@dataclass
+class Stats(Mapping):
+    """Immutable hp/attack/defense/speed record; reads like the `{"hp": ...}` dict it replaced."""
+
+    __slots__ = ("hp", "attack", "defense", "speed")
+    KEYS = ("hp", "attack", "defense", "speed")
+
+    def __init__(self, hp: int, attack: int, defense: int, speed: int):
+        for key, value in zip(self.KEYS, (hp, attack, defense, speed)):
+            object.__setattr__(self, key, int(value))
+
+    @classmethod
+    def from_mapping(cls, stats: Mapping) -> "Stats":
+        if isinstance(stats, Stats):
+            return stats
+        return cls(*(stats[key] for key in cls.KEYS))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Stats is immutable.")
+
+    def __getitem__(self, key: str) -> int:
+        if key not in self.KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.KEYS)
+
+    def __len__(self) -> int:
+        return 4
+
+    def __hash__(self) -> int:
+        return hash((self.hp, self.attack, self.defense, self.speed))
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, Stats):
+            return (self.hp, self.attack, self.defense, self.speed) == (
+                other.hp,
+                other.attack,
+                other.defense,
+                other.speed,
+            )
+        return super().__eq__(other)
+
+    def __repr__(self) -> str:
+        return f"Stats(hp={self.hp}, attack={self.attack}, defense={self.defense}, speed={self.speed})"
+
+    def __reduce__(self):
+        return Stats, (self.hp, self.attack, self.defense, self.speed)
+
+
+@dataclass(frozen=True, slots=True, weakref_slot=True)
 class Pokemon:
+    """A species as battles see it. Immutable, so one instance can be shared by every battle and cache in the
+    process; build them with `Pokemon.of()` to get that shared instance."""
+
     id: int
     name: str
-    types: List[str]
-    stats: Dict[str, int]  # hp, attack, defense, speed
+    types: Tuple[str, ...]
+    stats: Stats
+
+    def __post_init__(self):
+        if type(self.types) is not tuple:
+            object.__setattr__(self, "types", tuple(self.types))
+        if type(self.stats) is not Stats:
+            object.__setattr__(self, "stats", Stats.from_mapping(self.stats))
+
+    @classmethod
+    def of(cls, id: int, name: str, types: Iterable[str], stats: Mapping) -> "Pokemon":
+        pokemon = cls(id=int(id), name=name, types=tuple(types), stats=Stats.from_mapping(stats))
+        key = (pokemon.id, pokemon.name, pokemon.types, pokemon.stats)
+        shared = _interned.get(key)
+        if shared is not None:
+            return shared
+        with _interned_lock:
+            return _interned.setdefault(key, pokemon)
+
+
+# Species seen by this process, shared by every battle and cache that holds them; entries go once nobody does.
+_interned: "weakref.WeakValueDictionary[tuple, Pokemon]" = weakref.WeakValueDictionary()
+_interned_lock = threading.Lock()
 
 
 @dataclass
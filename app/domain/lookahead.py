@@ -0,0 +1,67 @@
+import math
+import random
+import time
+from typing import Callable
+
+from app.domain.simulation import BattleSim, SimState
+
+
+class LookaheadBot:
+    """Chooses a move by Monte Carlo rollouts within a hard time budget.
+
+    Every legal action (each attack type, defend, buff, debuff, each switch) is played on a clone of the state and
+    the battle is rolled out with `BattleSim.playout` for at most `max_depth` actions; UCB1 spends the remaining
+    budget on the actions that look best. A rollout cut off by the depth limit scores the share of remaining HP.
+    """
+
+    def __init__(
+        self,
+        budget_ms: float = 20.0,
+        max_depth: int = 60,
+        seed: int | None = None,
+        clock: Callable[[], float] = time.perf_counter,
+    ):
+        self.budget = budget_ms / 1000.0
+        self.max_depth = max_depth
+        self.rng = random.Random(seed)
+        self.clock = clock
+        self.rollouts = 0
+
+    def choose(self, sim: BattleSim, state: SimState) -> dict:
+        role = state.next_actor
+        actions = sim.legal_actions(state, role)
+        if len(actions) == 1:
+            return actions[0]
+        deadline = self.clock() + self.budget
+        totals = [0.0] * len(actions)
+        plays = [0] * len(actions)
+        done = 0
+        while done < len(actions) or self.clock() < deadline:
+            if done < len(actions):
+                k = done
+            else:
+                log_n = math.log(done)
+                k = max(
+                    range(len(actions)),
+                    key=lambda i: totals[i] / plays[i] + math.sqrt(2.0 * log_n / plays[i]),
+                )
+            totals[k] += self._rollout(sim, state, actions[k], role)
+            plays[k] += 1
+            done += 1
+        self.rollouts += done
+        return actions[max(range(len(actions)), key=lambda i: totals[i] / plays[i])]
+
+    def _rollout(self, sim: BattleSim, state: SimState, action: dict, role: str) -> float:
+        branch = state.clone()
+        sim.step(branch, action, self.rng)
+        sim.playout(branch, self.rng, self.max_depth)
+        if branch.winner is not None:
+            return 1.0 if branch.winner == role else 0.0
+        mine = self._hp_share(sim, branch, role)
+        theirs = self._hp_share(sim, branch, "b" if role == "a" else "a")
+        return mine / (mine + theirs) if mine + theirs else 0.5
+
+    @staticmethod
+    def _hp_share(sim: BattleSim, state: SimState, role: str) -> float:
+        team = sim.teams[role]
+        return sum(hp / max(1, p.stats["hp"]) for hp, p in zip(state.side(role).hp, team)) / max(1, len(team))
@@ -0,0 +1,236 @@
+import random
+from typing import List, NamedTuple, Sequence
+
+from app.domain.entities import Pokemon
+from app.domain.services import BattleEngine, TypeChart, type_multiplier
+
+
+class Strike(NamedTuple):
+    attack_type: str
+    hit: bool
+    crit: bool
+    dmg: int
+    mult: float
+    target_hp: int
+
+
+class SideState:
+    __slots__ = ("active", "hp", "atk_mod", "atk_turns", "defend")
+
+    def __init__(self, active: int, hp: List[int], atk_mod: float = 1.0, atk_turns: int = 0, defend: int = 0):
+        self.active = active
+        self.hp = hp
+        self.atk_mod = atk_mod
+        self.atk_turns = atk_turns
+        self.defend = defend
+
+    def clone(self) -> "SideState":
+        return SideState(self.active, self.hp[:], self.atk_mod, self.atk_turns, self.defend)
+
+    def reset_effects(self) -> None:
+        self.atk_mod, self.atk_turns, self.defend = 1.0, 0, 0
+
+    def next_alive(self) -> int | None:
+        for idx, hp in enumerate(self.hp):
+            if hp > 0:
+                return idx
+        return None
+
+
+class SimState:
+    """The part of a battle state that decides what happens next, in slots instead of nested dicts.
+
+    `clone()` is a handful of list copies, so search and self-play can branch it thousands of times per second.
+    """
+
+    __slots__ = ("a", "b", "turn", "phase", "order", "next_actor", "winner")
+
+    def __init__(self, a: SideState, b: SideState, turn: int, phase: int, order: Sequence[str], winner: str | None):
+        self.a = a
+        self.b = b
+        self.turn = turn
+        self.phase = phase
+        self.order = tuple(order)
+        self.next_actor = self.order[phase] if winner is None else None
+        self.winner = winner
+
+    @classmethod
+    def new(cls, team_a: Sequence[Pokemon], team_b: Sequence[Pokemon], order: Sequence[str]) -> "SimState":
+        return cls(
+            SideState(0, [p.stats["hp"] for p in team_a]),
+            SideState(0, [p.stats["hp"] for p in team_b]),
+            0,
+            0,
+            order,
+            None,
+        )
+
+    @classmethod
+    def from_state(cls, team_a: Sequence[Pokemon], team_b: Sequence[Pokemon], state: dict) -> "SimState":
+        """Reads the JSON battle state `BattleEngine.step` and `PlayTurnUC` keep in `Battle.result["state"]`."""
+        sides = []
+        for key, team in (("a", team_a), ("b", team_b)):
+            raw = state.get(key) if isinstance(state.get(key), dict) else {}
+            hp = raw.get("hp")
+            if not isinstance(hp, list) or len(hp) != len(team):
+                hp = [p.stats["hp"] for p in team]
+            effects = raw.get("effects") if isinstance(raw.get("effects"), dict) else {}
+            active = max(0, min(int(raw.get("active", 0) or 0), len(team) - 1))
+            sides.append(
+                SideState(
+                    active,
+                    [max(0, int(v)) for v in hp],
+                    float(effects.get("atk_mod", 1.0) or 1.0),
+                    int(effects.get("atk_turns", 0) or 0),
+                    int(effects.get("defend", 0) or 0),
+                )
+            )
+        order = state.get("order")
+        if not (isinstance(order, list) and len(order) == 2 and set(order) == {"a", "b"}):
+            order = ["a", "b"] if state.get("next_actor", "a") == "a" else ["b", "a"]
+        phase = int(state.get("phase", 0) or 0) if state.get("phase") in (0, 1) else 0
+        winner = state.get("winner") if state.get("finished") else None
+        return cls(sides[0], sides[1], int(state.get("turn", 0) or 0), phase, order, winner)
+
+    def clone(self) -> "SimState":
+        state = SimState.__new__(SimState)
+        state.a, state.b = self.a.clone(), self.b.clone()
+        state.turn, state.phase, state.order = self.turn, self.phase, self.order
+        state.next_actor, state.winner = self.next_actor, self.winner
+        return state
+
+    def side(self, role: str) -> SideState:
+        return self.a if role == "a" else self.b
+
+    @property
+    def finished(self) -> bool:
+        return self.winner is not None
+
+
+class BattleSim:
+    """Plays `SimState`s by the same rules as `BattleEngine.step` and `PlayTurnUC`, without logs or JSON state.
+
+    Hit, crit and damage come from `BattleEngine`'s formulas, and the dice are rolled in the same order, so with the
+    same random stream both produce the same battle. Nothing here touches the database.
+    """
+
+    def __init__(self, team_a: Sequence[Pokemon], team_b: Sequence[Pokemon], type_chart: TypeChart):
+        self.teams = {"a": tuple(team_a), "b": tuple(team_b)}
+        self.type_chart = type_chart
+        self._multipliers: dict[tuple[str, tuple[str, ...]], float] = {}
+
+    def multiplier(self, attack_type: str, defender: Pokemon) -> float:
+        key = (attack_type, defender.types)
+        mult = self._multipliers.get(key)
+        if mult is None:
+            mult = self._multipliers[key] = type_multiplier(self.type_chart, attack_type, list(defender.types))
+        return mult
+
+    def active(self, state: SimState, role: str) -> Pokemon:
+        return self.teams[role][state.side(role).active]
+
+    def legal_actions(self, state: SimState, role: str) -> list[dict]:
+        side = state.side(role)
+        actions = [{"type": "attack", "attack_type": t} for t in self.active(state, role).types]
+        actions += [{"type": "defend"}, {"type": "buff"}, {"type": "debuff"}]
+        actions += [{"type": "switch", "to": idx} for idx, hp in enumerate(side.hp) if hp > 0 and idx != side.active]
+        return actions
+
+    def best_attack(self, state: SimState, role: str) -> dict:
+        """The current heuristic bot's move: the attacker's most effective type against the defender."""
+        attacker = self.active(state, role)
+        if not attacker.types:
+            return {"type": "defend"}
+        defender = self.active(state, "b" if role == "a" else "a")
+        best = max(attacker.types, key=lambda t: self.multiplier(t, defender))
+        return {"type": "attack", "attack_type": best}
+
+    def step(self, state: SimState, action: dict, rng: random.Random) -> Strike | None:
+        """Plays `action` for `state.next_actor` in place and moves the turn on; returns the attack's result, if any."""
+        role = state.next_actor
+        if role is None:
+            return None
+        opp = "b" if role == "a" else "a"
+        me, them = state.side(role), state.side(opp)
+
+        if me.hp[me.active] <= 0:
+            nxt = me.next_alive()
+            if nxt is None:
+                state.winner, state.next_actor = opp, None
+                return None
+            me.active = nxt
+            me.reset_effects()
+
+        strike = None
+        kind = action.get("type")
+        if kind == "switch":
+            me.active = max(0, min(int(action.get("to", 0)), len(me.hp) - 1))
+            me.reset_effects()
+        elif kind == "defend":
+            me.defend = 2
+        elif kind == "buff":
+            me.atk_mod *= 1.1
+            me.atk_turns = 2
+        elif kind == "debuff":
+            them.atk_mod *= 0.9
+            them.atk_turns = 2
+        else:
+            strike = self._attack(state, role, me, them, action, rng)
+        if state.winner is None:
+            self._advance(state, rng)
+        return strike
+
+    def _attack(self, state: SimState, role: str, me: SideState, them: SideState, action: dict, rng) -> Strike:
+        attacker = self.teams[role][me.active]
+        defender = self.teams["b" if role == "a" else "a"][them.active]
+        atk, defense = attacker.stats["attack"], defender.stats["defense"]
+        att_type = str(action.get("attack_type") or (attacker.types[0] if attacker.types else "")).lower()
+        if rng.randint(1, 100) > BattleEngine.hit_chance(atk, defense):
+            return Strike(att_type, False, False, 0, 0.0, them.hp[them.active])
+        crit = rng.randint(1, 100) <= BattleEngine.crit_chance(attacker.stats["speed"])
+        mult = self.multiplier(att_type, defender)
+        dmg = int(BattleEngine.base_damage(atk, defense) * mult * me.atk_mod)
+        if crit:
+            dmg = int(dmg * 1.5)
+        if them.defend > 0:
+            dmg //= 2
+            them.defend -= 1
+        them.hp[them.active] = target_hp = max(0, them.hp[them.active] - dmg)
+        if target_hp <= 0:
+            nxt = them.next_alive()
+            if nxt is None:
+                state.winner, state.next_actor = role, None
+            else:
+                them.active = nxt
+                them.reset_effects()
+        return Strike(att_type, True, crit, dmg, mult, target_hp)
+
+    def _advance(self, state: SimState, rng: random.Random) -> None:
+        if state.phase == 0:
+            state.phase = 1
+            state.next_actor = state.order[1]
+            return
+        for side in (state.a, state.b):
+            if side.atk_turns > 0:
+                side.atk_turns -= 1
+                if side.atk_turns == 0:
+                    side.atk_mod = 1.0
+        state.turn += 1
+        state.phase = 0
+        state.order = self.order_for(state.a.active, state.b.active, rng)
+        state.next_actor = state.order[0]
+
+    def order_for(self, a_active: int, b_active: int, rng: random.Random) -> tuple[str, str]:
+        """Turn order for these active slots: faster first, a coin flip on a tie (`BattleEngine.initiative`)."""
+        a_spd = self.teams["a"][a_active].stats["speed"]
+        b_spd = self.teams["b"][b_active].stats["speed"]
+        first = "a" if a_spd > b_spd else "b" if b_spd > a_spd else ("a" if rng.randint(0, 1) == 0 else "b")
+        return ("a", "b") if first == "a" else ("b", "a")
+
+    def playout(self, state: SimState, rng: random.Random, max_actions: int = 200) -> SimState:
+        """Plays `state` on with `best_attack` for both sides; returns it (finished unless `max_actions` ran out)."""
+        for _ in range(max_actions):
+            if state.winner is not None:
+                break
+            self.step(state, self.best_attack(state, state.next_actor), rng)
+        return state
@@ -1,11 +1,16 @@
 import requests
 from django.contrib.auth import get_user_model
+from django.db import transaction
 from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
 
-from app.adapters.notification_client import NotificationHttp
-from app.adapters.pokeapi_client import PokeApiHttp
+from app.adapters.cache import get_tiered_cache
+from app.adapters.event_bus import get_event_bus
+from app.adapters.executor import ExecutorSaturated, get_io_executor
+from app.adapters.http_client import get_http_client
+from app.adapters.notification_outbox import OutboxNotifier, get_outbox_dispatcher
+from app.adapters.pokeapi_local import pokeapi_source
 from app.adapters.repositories import (
     BattleRepository,
     CatalogRepository,
@@ -13,10 +18,11 @@ from app.adapters.repositories import (
     StatisticsRepository,
     UserRepository,
 )
+from app.adapters.type_chart import get_type_chart_store
 from app.application.use_cases import (
+    AutoResolveBattleUC,
     CloseCodeLobbyUC,
     CodeLobbyUC,
-    BotAutoPlayUC,
     CatalogUC,
     EnterLobbyUC,
     ExpireBattleUC,
@@ -28,8 +34,23 @@ from app.application.use_cases import (
     SelectPokemonUC,
     StartPveBattleUC,
     SetTeamUC,
+    SpectateBattleUC,
     StatsUC,
+    WaitBattleEventsUC,
+    WaitLobbyMatchUC,
 )
+from app.interfaces.workers.bot_teams import get_bot_team_pool
+from app.interfaces.workers.bot_turns import get_bot_worker
+from app.ports.notification import NotificationPort
+
+
+def _notifier() -> NotificationPort:
+    # Writes into the caller's transaction, so wrap the battle change and its notifications in transaction.atomic().
+    return OutboxNotifier()
+
+
+def _busy() -> Response:
+    return Response({"error": "Server is busy, retry shortly."}, status=503, headers={"Retry-After": "1"})
 
 
 def _int_query_param(
@@ -57,8 +78,11 @@ def catalog(request):
     limit = _int_query_param(request, "limit", 20, min_value=1, max_value=50)
     offset = _int_query_param(request, "offset", 0, min_value=0)
 
-    uc = CatalogUC(CatalogRepository(), PokeApiHttp())
-    pokes = uc.page(request.user.id, limit=limit, offset=offset)
+    uc = CatalogUC(CatalogRepository(), pokeapi_source())
+    try:
+        pokes = uc.page(request.user.id, limit=limit, offset=offset)
+    except ExecutorSaturated:
+        return _busy()
     return Response([{"id": p.id, "name": p.name, "types": p.types, "stats": p.stats} for p in pokes])
 
 
@@ -82,13 +106,49 @@ def battle_pve(request):
     if pokemon_ids is not None and not isinstance(pokemon_ids, list):
         return Response({"error": "pokemon_ids must be a list."}, status=400)
 
-    uc = StartPveBattleUC(CatalogRepository(), BattleRepository(), NotificationHttp(), PokeApiHttp(), UserRepository())
+    auto = str(request.data.get("auto", "")).lower() in ("1", "true")
+    uc = StartPveBattleUC(
+        CatalogRepository(),
+        BattleRepository(),
+        _notifier(),
+        pokeapi_source(),
+        UserRepository(),
+        get_type_chart_store(),
+        # An auto-resolved battle is over by commit; there is no bot move to hand to the worker.
+        None if auto else get_bot_worker(),
+        get_bot_team_pool(),
+    )
     try:
-        result = uc.execute(request.user.id, pokemon_ids)
+        # PokeAPI calls happen here, before the transaction, so they hold no row locks.
+        bot_team = uc.prefetch(request.user.id, pokemon_ids)
+        with transaction.atomic():
+            result = uc.execute(request.user.id, pokemon_ids, bot_team=bot_team)
+            if auto:
+                result.update(_auto_resolve().execute(result["battle_id"], request.user.id))
     except ValueError as exc:
         return Response({"error": str(exc)}, status=400)
     except requests.RequestException:
         return Response({"error": "PokeAPI unavailable."}, status=502)
+    except ExecutorSaturated:
+        return _busy()
+    return Response(result)
+
+
+def _auto_resolve() -> AutoResolveBattleUC:
+    return AutoResolveBattleUC(BattleRepository(), UserRepository(), _notifier(), StatisticsRepository())
+
+
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+def battle_autoresolve(request, battle_id: int):
+    try:
+        with transaction.atomic():
+            result = _auto_resolve().execute(battle_id, request.user.id)
+    except PermissionError as exc:
+        return Response({"error": str(exc)}, status=403)
+    except ValueError as exc:
+        msg = str(exc)
+        return Response({"error": msg}, status=404 if msg == "Battle not found." else 400)
     return Response(result)
 
 
@@ -102,21 +162,30 @@ def catalog_search(request):
     limit = _int_query_param(request, "limit", 20, min_value=1, max_value=50)
     offset = _int_query_param(request, "offset", 0, min_value=0)
 
-    uc = SearchPokemonUC(CatalogRepository(), PokeApiHttp())
+    uc = SearchPokemonUC(CatalogRepository(), pokeapi_source())
     try:
         pokes = uc.execute(request.user.id, q, limit=limit, offset=offset)
     except ValueError as exc:
         return Response({"error": str(exc)}, status=400)
     except requests.RequestException:
         return Response({"error": "PokeAPI unavailable."}, status=502)
+    except ExecutorSaturated:
+        return _busy()
     return Response([{"id": p.id, "name": p.name, "types": p.types, "stats": p.stats} for p in pokes])
 
 
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def pokemon_detail(request, pokemon_id: int):
-    uc = GetPokemonUC(CatalogRepository(), PokeApiHttp())
-    p = uc.execute(request.user.id, pokemon_id)
+    uc = GetPokemonUC(CatalogRepository(), pokeapi_source())
+    try:
+        p = uc.execute(request.user.id, pokemon_id)
+    except ValueError as exc:
+        return Response({"error": str(exc)}, status=404)
+    except requests.RequestException:
+        return Response({"error": "PokeAPI unavailable."}, status=502)
+    except ExecutorSaturated:
+        return _busy()
     return Response({"id": p.id, "name": p.name, "types": p.types, "stats": p.stats})
 
 
@@ -124,7 +193,7 @@ def pokemon_detail(request, pokemon_id: int):
 @permission_classes([IsAuthenticated])
 def select_pokemon(request):
     pokemon_id = int(request.data["pokemon_id"])
-    uc = SelectPokemonUC(CatalogRepository(), PokeApiHttp())
+    uc = SelectPokemonUC(CatalogRepository(), pokeapi_source())
     uc.execute(request.user.id, pokemon_id)
     return Response({"status": "selected", "active_pokemon_id": pokemon_id, "redirect": "lobby"})
 
@@ -133,7 +202,7 @@ def select_pokemon(request):
 @permission_classes([IsAuthenticated])
 def team(request):
     catalog = CatalogRepository()
-    pokeapi = PokeApiHttp()
+    pokeapi = pokeapi_source()
 
     if request.method == "POST":
         pokemon_ids = request.data.get("pokemon_ids")
@@ -144,6 +213,8 @@ def team(request):
             team_pokemons = uc.execute(request.user.id, pokemon_ids)
         except ValueError as exc:
             return Response({"error": str(exc)}, status=400)
+        except ExecutorSaturated:
+            return _busy()
         return Response({"status": "selected", "pokemon_ids": [p.id for p in team_pokemons]})
 
     uc = GetTeamUC(catalog, pokeapi)
@@ -157,11 +228,22 @@ def enter_lobby(request):
     pokemon_ids = request.data.get("pokemon_ids", None)
     if pokemon_ids is not None and not isinstance(pokemon_ids, list):
         return Response({"error": "pokemon_ids must be a list."}, status=400)
-    uc = EnterLobbyUC(CatalogRepository(), LobbyRepository(), BattleRepository(), NotificationHttp(), PokeApiHttp())
+    uc = EnterLobbyUC(
+        CatalogRepository(),
+        LobbyRepository(),
+        BattleRepository(),
+        _notifier(),
+        pokeapi_source(),
+        get_type_chart_store(),
+    )
     try:
-        result = uc.execute(request.user.id, pokemon_ids)
+        uc.prefetch(request.user.id, pokemon_ids)
+        with transaction.atomic():
+            result = uc.execute(request.user.id, pokemon_ids)
     except ValueError as exc:
         return Response({"error": str(exc)}, status=400)
+    except ExecutorSaturated:
+        return _busy()
     return Response(result)
 
 
@@ -173,13 +255,24 @@ def code_lobby(request):
     if pokemon_ids is not None and not isinstance(pokemon_ids, list):
         return Response({"error": "pokemon_ids must be a list."}, status=400)
 
-    uc = CodeLobbyUC(CatalogRepository(), LobbyRepository(), BattleRepository(), NotificationHttp(), PokeApiHttp())
+    uc = CodeLobbyUC(
+        CatalogRepository(),
+        LobbyRepository(),
+        BattleRepository(),
+        _notifier(),
+        pokeapi_source(),
+        get_type_chart_store(),
+    )
     try:
-        result = uc.execute(request.user.id, code=code, pokemon_ids=pokemon_ids)
+        uc.prefetch(request.user.id, pokemon_ids)
+        with transaction.atomic():
+            result = uc.execute(request.user.id, code=code, pokemon_ids=pokemon_ids)
     except ValueError as exc:
         return Response({"error": str(exc)}, status=400)
     except requests.RequestException:
         return Response({"error": "PokeAPI unavailable."}, status=502)
+    except ExecutorSaturated:
+        return _busy()
     return Response(result)
 
 
@@ -201,11 +294,22 @@ def start_battle(request):
     pokemon_ids = request.data.get("pokemon_ids", None)
     if pokemon_ids is not None and not isinstance(pokemon_ids, list):
         return Response({"error": "pokemon_ids must be a list."}, status=400)
-    uc = EnterLobbyUC(CatalogRepository(), LobbyRepository(), BattleRepository(), NotificationHttp(), PokeApiHttp())
+    uc = EnterLobbyUC(
+        CatalogRepository(),
+        LobbyRepository(),
+        BattleRepository(),
+        _notifier(),
+        pokeapi_source(),
+        get_type_chart_store(),
+    )
     try:
-        result = uc.execute(request.user.id, pokemon_ids)
+        uc.prefetch(request.user.id, pokemon_ids)
+        with transaction.atomic():
+            result = uc.execute(request.user.id, pokemon_ids)
     except ValueError as exc:
         return Response({"error": str(exc)}, status=400)
+    except ExecutorSaturated:
+        return _busy()
     return Response(result)
 
 
@@ -213,9 +317,10 @@ def start_battle(request):
 @permission_classes([IsAuthenticated])
 def play_turn(request, battle_id: int):
     action = request.data
-    uc = PlayTurnUC(BattleRepository(), NotificationHttp(), StatisticsRepository())
+    uc = PlayTurnUC(BattleRepository(), _notifier(), StatisticsRepository(), get_bot_worker())
     try:
-        result = uc.execute(battle_id, request.user.id, action)
+        with transaction.atomic():
+            result = uc.execute(battle_id, request.user.id, action)
     except PermissionError as exc:
         return Response({"error": str(exc)}, status=403)
     except ValueError as exc:
@@ -232,7 +337,8 @@ def play_turn(request, battle_id: int):
 @permission_classes([IsAuthenticated])
 def history(request):
     repo = BattleRepository()
-    ExpireBattleUC(repo, NotificationHttp()).expire_for_user(request.user.id)
+    with transaction.atomic():
+        ExpireBattleUC(repo, _notifier()).expire_for_user(request.user.id)
     rows = repo.list_battles(request.user.id)
     return Response(rows)
 
@@ -256,7 +362,8 @@ def replay(request, battle_id: int):
     except Exception:
         opponent_username = None
 
-    ExpireBattleUC(repo, NotificationHttp()).expire_if_needed(battle)
+    with transaction.atomic():
+        ExpireBattleUC(repo, _notifier()).expire_if_needed(battle)
 
     try:
         replay_data = repo.get_replay(battle_id)
@@ -301,12 +408,8 @@ def battle_detail(request, battle_id: int):
     if request.user.id not in (battle.p1_id, battle.p2_id):
         return Response({"error": "Battle not found."}, status=404)
 
-    ExpireBattleUC(repo, NotificationHttp()).expire_if_needed(battle)
-
-    try:
-        BotAutoPlayUC(repo, UserRepository(), NotificationHttp(), StatisticsRepository()).execute(battle_id)
-    except Exception:
-        pass
+    with transaction.atomic():
+        ExpireBattleUC(repo, _notifier()).expire_if_needed(battle)
 
     item = repo.get_battle_item(request.user.id, battle_id)
     if not item:
@@ -314,9 +417,60 @@ def battle_detail(request, battle_id: int):
     return Response(item)
 
 
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def battle_spectate(request, battle_id: int):
+    try:
+        return Response(SpectateBattleUC(BattleRepository()).execute(battle_id))
+    except ValueError as exc:
+        return Response({"error": str(exc)}, status=404)
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def battle_events(request, battle_id: int):
+    after = _int_query_param(request, "after", 0, min_value=0)
+    timeout = _int_query_param(request, "timeout", 25, min_value=0, max_value=25)
+
+    uc = WaitBattleEventsUC(BattleRepository(), _notifier(), get_event_bus())
+    try:
+        with transaction.atomic():
+            uc.prepare(battle_id, request.user.id)
+    except (PermissionError, ValueError):
+        return Response({"error": "Battle not found."}, status=404)
+    # The long-poll itself holds no transaction open.
+    return Response(uc.wait(battle_id, after=after, timeout=timeout))
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def lobby_wait(request):
+    after = _int_query_param(request, "after", 0, min_value=0)
+    timeout = _int_query_param(request, "timeout", 25, min_value=0, max_value=25)
+
+    uc = WaitLobbyMatchUC(BattleRepository(), get_event_bus())
+    return Response(uc.execute(request.user.id, after_battle_id=after, timeout=timeout))
+
+
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def stats(request):
-    ExpireBattleUC(BattleRepository(), NotificationHttp()).expire_for_user(request.user.id)
+    with transaction.atomic():
+        ExpireBattleUC(BattleRepository(), _notifier()).expire_for_user(request.user.id)
     uc = StatsUC(StatisticsRepository())
     return Response(uc.get(request.user.id))
+
+
+@api_view(["GET"])
+@permission_classes([IsAdminUser])
+def metrics(request):
+    return Response(
+        {
+            "cache": get_tiered_cache().stats(),
+            "http": get_http_client().stats(),
+            "executor": get_io_executor().stats(),
+            "notify_outbox": get_outbox_dispatcher().stats(),
+            "bot_worker": get_bot_worker().stats(),
+            "bot_team_pool": get_bot_team_pool().stats(),
+        }
+    )
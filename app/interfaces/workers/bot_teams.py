@@ -0,0 +1,153 @@
+import logging
+import random
+import threading
+from collections import deque
+from typing import Callable
+
+import requests
+from django.conf import settings
+from django.db import DatabaseError, close_old_connections
+
+from app.adapters.executor import ExecutorSaturated
+from app.adapters.pokeapi_local import pokeapi_source
+from app.domain.entities import Pokemon
+from app.ports.bots import BotTeamPort
+from app.ports.pokeapi import PokeApiPort
+
+logger = logging.getLogger(__name__)
+
+PAGE_SIZE = 50
+
+
+class BotTeamPool(BotTeamPort):
+    """Keeps `size` bot teams with their species already fetched, so starting a PvE battle is just the INSERT.
+
+    `take()` hands out a ready team and wakes a background thread that tops the pool back up: it reads one random
+    page of the species list per refill, remembers every id it has seen and draws each team from all of them, so
+    teams get more varied the longer the process runs. The type chart needs nothing here: battles read the
+    in-process `TypeChartStore`. The pool lives in each web process and its first refill runs when the process
+    starts (`config/wsgi.py`); with `BOT_TEAM_POOL_SIZE=0` there is none and PvE starts resolve the bot team inline.
+    """
+
+    def __init__(
+        self,
+        size: int | None = None,
+        team_size: int = 3,
+        seed: int | None = None,
+        pokeapi: Callable[[], PokeApiPort] = pokeapi_source,
+        poll_interval: float = 30.0,
+    ):
+        self.size = settings.BOT_TEAM_POOL_SIZE if size is None else size
+        self.team_size = team_size
+        self.pokeapi = pokeapi
+        self.poll_interval = poll_interval
+        self.rng = random.Random(seed)
+        self._teams: deque[tuple[Pokemon, ...]] = deque()
+        self._seen_ids: set[int] = set()
+        self._max_offset = 2000
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self._served = 0
+        self._misses = 0
+        self._errors = 0
+
+    def take(self, exclude: set[int]) -> list[Pokemon] | None:
+        if self.size <= 0:
+            return None
+        team = None
+        with self._lock:
+            for idx, candidate in enumerate(self._teams):
+                if not any(p.id in exclude for p in candidate):
+                    team = candidate
+                    del self._teams[idx]
+                    break
+            if team is None:
+                self._misses += 1
+            else:
+                self._served += 1
+        self.wake()
+        return list(team) if team is not None else None
+
+    def refill(self) -> int:
+        """Tops the pool up to `size` teams; returns how many it added."""
+        with self._lock:
+            missing = self.size - len(self._teams)
+        if missing <= 0:
+            return 0
+        pokeapi = self.pokeapi()
+        ids = self._candidate_ids(pokeapi)
+        if len(ids) < self.team_size:
+            return 0
+        picks = [self.rng.sample(ids, self.team_size) for _ in range(missing)]
+        species = {p.id: p for p in pokeapi.fetch_pokemons(sorted({pid for team in picks for pid in team}))}
+        teams = [tuple(species[pid] for pid in team) for team in picks if all(pid in species for pid in team)]
+        with self._lock:
+            self._teams.extend(teams)
+        return len(teams)
+
+    def _candidate_ids(self, pokeapi: PokeApiPort) -> list[int]:
+        for _ in range(8):
+            offset = self.rng.randint(0, self._max_offset)
+            page = [int(x) for x in pokeapi.list_pokemon_ids(limit=PAGE_SIZE, offset=offset)]
+            if len(page) < PAGE_SIZE:
+                # Past or at the end of the species list (its length is not known up front); aim lower from now on.
+                self._max_offset = max(0, offset + len(page) - PAGE_SIZE)
+            if page:
+                break
+        self._seen_ids.update(page)
+        return sorted(self._seen_ids)
+
+    def run(self) -> None:
+        """Refills on every wake-up and every `poll_interval`; after a failed refill waits `poll_interval` out."""
+        while not self._stop.is_set():
+            self._wakeup.clear()
+            close_old_connections()
+            try:
+                self.refill()
+            except Exception as exc:
+                # PvE starts resolve teams inline until a refill succeeds; only surprises are worth a traceback.
+                if not isinstance(exc, (requests.RequestException, ExecutorSaturated, ValueError, DatabaseError)):
+                    logger.exception("Bot team pool refill failed")
+                with self._lock:
+                    self._errors += 1
+                self._stop.wait(self.poll_interval)
+                continue
+            self._wakeup.wait(self.poll_interval)
+        close_old_connections()
+
+    def wake(self) -> None:
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self.run, name="bot-teams", daemon=True)
+                    self._thread.start()
+        self._wakeup.set()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wakeup.set()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "ready": len(self._teams),
+                "served": self._served,
+                "misses": self._misses,
+                "errors": self._errors,
+                "species_seen": len(self._seen_ids),
+            }
+
+
+_pool: BotTeamPool | None = None
+_pool_lock = threading.Lock()
+
+
+def get_bot_team_pool() -> BotTeamPool:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = BotTeamPool()
+    return _pool
@@ -0,0 +1,141 @@
+import logging
+import threading
+import time
+from typing import Callable
+
+from django.conf import settings
+from django.db import DatabaseError, close_old_connections, transaction
+
+from app.adapters.notification_outbox import OutboxNotifier
+from app.adapters.repositories import BattleRepository, StatisticsRepository, UserRepository
+from app.application.use_cases import BotAutoPlayUC
+from app.domain.lookahead import LookaheadBot
+from app.ports.bots import BotTurnPort
+
+logger = logging.getLogger(__name__)
+
+
+class BotTurnWorker(BotTurnPort):
+    """Plays the bot's moves in the background, so reading a battle never writes to it.
+
+    A turn that leaves the bot to move queues the battle after its transaction commits and wakes the worker thread.
+    Every `poll_interval` seconds the worker also sweeps for battles still waiting on the bot (missed wake-ups,
+    restarts), so PvE battles advance without anyone polling. The thread starts with each server process
+    (`config/wsgi.py`), so its first sweep finds battles left waiting by a restart or by a process that died. Moves
+    are played with the battle row locked, so processes sweeping the same battle never play a turn twice. With
+    `BOT_WORKER=off` the web processes queue nothing and a `play_bot_turns` process does the sweeping.
+    """
+
+    def __init__(
+        self,
+        users: UserRepository | None = None,
+        poll_interval: float = 5.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.users = users or UserRepository()
+        self.poll_interval = poll_interval
+        self.clock = clock
+        self._pending: set[int] = set()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self._played = 0
+        self._errors = 0
+
+    def turn_passed(self, battle_id: int, next_user_id: int) -> None:
+        if next_user_id != self.users.get_or_create_bot_user_id():
+            return
+        transaction.on_commit(lambda: self.schedule(battle_id))
+
+    def schedule(self, battle_id: int) -> None:
+        if settings.BOT_WORKER != "thread":
+            # A separate `play_bot_turns` process finds the battle on its next sweep.
+            return
+        with self._lock:
+            self._pending.add(int(battle_id))
+        self.wake()
+
+    def play(self, battle_id: int) -> int:
+        """Plays the bot's moves in one battle; returns how many it made."""
+        lookahead = LookaheadBot(settings.BOT_MOVE_BUDGET_MS) if settings.BOT_STRATEGY == "lookahead" else None
+        uc = BotAutoPlayUC(BattleRepository(), self.users, OutboxNotifier(), StatisticsRepository(), lookahead)
+        try:
+            with transaction.atomic():
+                played = uc.execute(battle_id)
+        except (ValueError, PermissionError, DatabaseError):
+            # The battle ended or moved on under us; the next sweep sees its current state.
+            with self._lock:
+                self._errors += 1
+            return 0
+        except Exception:
+            # Odd battle state must not take the other battles (or the thread) down with it.
+            logger.exception("Bot turn failed in battle %s", battle_id)
+            with self._lock:
+                self._errors += 1
+            return 0
+        with self._lock:
+            self._played += played
+        return played
+
+    def play_pending(self, sweep: bool = False) -> int:
+        # Sweep first: if the query fails, the queued ids are still queued.
+        awaiting = (
+            set(BattleRepository().list_battles_awaiting(self.users.get_or_create_bot_user_id())) if sweep else set()
+        )
+        with self._lock:
+            battle_ids = self._pending | awaiting
+            self._pending = set()
+        return sum(self.play(battle_id) for battle_id in sorted(battle_ids))
+
+    def run(self) -> None:
+        """Plays queued battles on every wake-up and sweeps every `poll_interval`, however busy, until `stop()`."""
+        last_sweep: float | None = None
+        while not self._stop.is_set():
+            self._wakeup.clear()
+            close_old_connections()
+            now = self.clock()
+            sweep = last_sweep is None or now - last_sweep >= self.poll_interval
+            try:
+                self.play_pending(sweep=sweep)
+            except Exception:
+                # The sweep query failed; the next sweep finds whatever is still waiting on the bot.
+                logger.exception("Bot turn sweep failed")
+                with self._lock:
+                    self._errors += 1
+                last_sweep = None
+                self._wakeup.wait(self.poll_interval)
+                continue
+            if sweep:
+                last_sweep = now
+            self._wakeup.wait(max(0.0, last_sweep + self.poll_interval - self.clock()))
+        close_old_connections()
+
+    def wake(self) -> None:
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self.run, name="bot-turns", daemon=True)
+                    self._thread.start()
+        self._wakeup.set()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wakeup.set()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"played": self._played, "errors": self._errors, "queued": len(self._pending)}
+
+
+_worker: BotTurnWorker | None = None
+_worker_lock = threading.Lock()
+
+
+def get_bot_worker() -> BotTurnWorker:
+    global _worker
+    if _worker is None:
+        with _worker_lock:
+            if _worker is None:
+                _worker = BotTurnWorker()
+    return _worker
@@ -0,0 +1,65 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from app.adapters.species_dataset import DEFAULT_DATASET_PATH, load_species_file
+from app.adapters.type_chart import get_type_chart_store
+from app.domain.lookahead import LookaheadBot
+from app.domain.simulation import BattleSim, SimState
+
+
+class Command(BaseCommand):
+    help = "Measure rollout speed of the lookahead bot and its win rate against the heuristic bot."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--battles", type=int, default=200, help="Battles to play, sides alternating.")
+        parser.add_argument("--budget-ms", type=float, default=20.0, help="Lookahead time budget per move.")
+        parser.add_argument("--team-size", type=int, default=3)
+        parser.add_argument("--seed", type=int, default=1)
+
+    def handle(self, *args, **options):
+        species, _ = load_species_file(DEFAULT_DATASET_PATH)
+        _, chart = get_type_chart_store().current()
+        rng = random.Random(options["seed"])
+        bot = LookaheadBot(options["budget_ms"], seed=options["seed"])
+        size = max(1, options["team_size"])
+
+        started = time.perf_counter()
+        playouts = 0
+        while time.perf_counter() - started < 1.0:
+            team_a, team_b = rng.sample(species, size), rng.sample(species, size)
+            BattleSim(team_a, team_b, chart).playout(SimState.new(team_a, team_b, ["a", "b"]), rng)
+            playouts += 1
+        playout_rate = playouts / (time.perf_counter() - started)
+
+        wins = draws = moves = 0
+        search_seconds = 0.0
+        battles = max(1, options["battles"])
+        for n in range(battles):
+            team_a, team_b = rng.sample(species, size), rng.sample(species, size)
+            sim = BattleSim(team_a, team_b, chart)
+            state = SimState.new(team_a, team_b, ["a", "b"] if rng.random() < 0.5 else ["b", "a"])
+            searcher = "a" if n % 2 == 0 else "b"
+            for _ in range(1000):
+                if state.finished:
+                    break
+                if state.next_actor == searcher:
+                    t0 = time.perf_counter()
+                    action = bot.choose(sim, state)
+                    search_seconds += time.perf_counter() - t0
+                    moves += 1
+                else:
+                    action = sim.best_attack(state, state.next_actor)
+                sim.step(state, action, rng)
+            if state.winner == searcher:
+                wins += 1
+            elif state.winner is None:
+                draws += 1
+
+        self.stdout.write(f"Heuristic playouts: {playout_rate:,.0f} full battles/s")
+        self.stdout.write(
+            f"Lookahead: {bot.rollouts / max(search_seconds, 1e-9):,.0f} rollouts/s, "
+            f"{search_seconds / max(moves, 1) * 1000:.1f} ms/move over {moves} moves"
+        )
+        self.stdout.write(f"Lookahead vs heuristic: {wins}/{battles} wins ({wins / battles:.1%}), {draws} unfinished")
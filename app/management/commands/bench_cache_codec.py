@@ -0,0 +1,57 @@
+import time
+from typing import Any
+
+from django.core.cache.backends.redis import RedisSerializer
+from django.core.management.base import BaseCommand
+
+from app.adapters.cache import _Envelope
+from app.adapters.cache_codec import CompactRedisSerializer
+from app.adapters.species_dataset import DEFAULT_DATASET_PATH, load_species_file
+
+
+class Command(BaseCommand):
+    help = "Compare bytes per key and encode/decode time of the pickle and compact cache serializers."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rounds", type=int, default=200, help="Passes over each sample set.")
+        parser.add_argument(
+            "--index-size", type=int, default=1300, help="Entries in the synthetic poke:index:v1 value."
+        )
+
+    def handle(self, *args, **options):
+        species, type_chart = load_species_file(DEFAULT_DATASET_PATH)
+        soft_until = time.time() + 3600
+        names = [p.name for p in species]
+        index = [(i + 1, f"{names[i % len(names)]}-{i // len(names)}") for i in range(options["index_size"])]
+        samples: dict[str, list[Any]] = {
+            "poke:{id}": [_Envelope(soft_until, p) for p in species],
+            "typechart:{type}": [_Envelope(soft_until, row) for row in type_chart.values()],
+            "pokelist:20:{offset}": [
+                _Envelope(soft_until, [p.id for p in species[i : i + 20]]) for i in range(0, len(species), 20)
+            ],
+            "poke:index:v1": [index],
+        }
+        rounds = max(1, options["rounds"])
+        pickle, compact = RedisSerializer(), CompactRedisSerializer()
+
+        header = (
+            f"{'key family':<22}{'pickle B/key':>14}{'compact B/key':>15}{'pickle dec µs':>15}{'compact dec µs':>16}"
+        )
+        self.stdout.write(header)
+        self.stdout.write("-" * len(header))
+        for family, values in samples.items():
+            p_bytes, p_decode = self._measure(pickle, values, rounds)
+            c_bytes, c_decode = self._measure(compact, values, rounds)
+            self.stdout.write(f"{family:<22}{p_bytes:>14.0f}{c_bytes:>15.0f}{p_decode:>15.2f}{c_decode:>16.2f}")
+
+    @staticmethod
+    def _measure(serializer, values: list[Any], rounds: int) -> tuple[float, float]:
+        """Average encoded size and decode time per value."""
+        encoded = [serializer.dumps(v) for v in values]
+        assert [serializer.loads(e) for e in encoded] == values
+        started = time.perf_counter()
+        for _ in range(rounds):
+            for data in encoded:
+                serializer.loads(data)
+        elapsed = time.perf_counter() - started
+        return sum(map(len, encoded)) / len(encoded), elapsed / (rounds * len(encoded)) * 1e6
@@ -0,0 +1,50 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from app.adapters.species_dataset import DEFAULT_DATASET_PATH, load_species_file, load_type_chart_csv
+from app.adapters.type_chart import reload_type_chart_store, write_type_chart
+from app.models import TypeEffectiveness
+
+
+class Command(BaseCommand):
+    help = "Build the versioned type chart that battles are created with."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "path",
+            nargs="?",
+            default=str(DEFAULT_DATASET_PATH),
+            help="JSON dump with a type_chart section. Defaults to the bundled dataset.",
+        )
+        parser.add_argument("--types", help="Type matrix CSV (attack_type,defender_type,multiplier) to overlay.")
+        parser.add_argument(
+            "--from-db",
+            action="store_true",
+            help="Use the matrix imported by `import_species` instead of a file.",
+        )
+        parser.add_argument("--output", default=str(settings.TYPE_CHART_PATH), help="Chart file to update.")
+
+    def handle(self, *args, **options):
+        try:
+            if options["from_db"]:
+                type_chart = self._load_from_db()
+            else:
+                _species, type_chart = load_species_file(options["path"])
+            if options["types"]:
+                type_chart = {**type_chart, **load_type_chart_csv(options["types"])}
+            version, created = write_type_chart(options["output"], type_chart)
+        except (OSError, ValueError) as exc:
+            raise CommandError(str(exc)) from exc
+
+        reload_type_chart_store()
+        state = "built" if created else "unchanged"
+        self.stdout.write(self.style.SUCCESS(f"Type chart {version} {state} ({len(type_chart)} attack types)."))
+
+    @staticmethod
+    def _load_from_db() -> dict[str, dict[str, float]]:
+        chart: dict[str, dict[str, float]] = {}
+        for attack_type, defender_type, multiplier in TypeEffectiveness.objects.values_list(
+            "attack_type", "defender_type", "multiplier"
+        ):
+            chart.setdefault(attack_type, {})[defender_type] = float(multiplier)
+        return chart
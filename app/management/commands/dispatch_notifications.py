@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from app.adapters.notification_outbox import OutboxDispatcher
+
+
+class Command(BaseCommand):
+    help = "Deliver queued notifications from the outbox to the notify service (run with NOTIFY_OUTBOX_DISPATCHER=off)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Drain what is due now and exit.")
+        parser.add_argument("--batch", type=int, default=0, help="Rows per batch (default: NOTIFY_OUTBOX_BATCH).")
+        parser.add_argument("--poll-interval", type=float, default=1.0, help="Seconds between polls of the table.")
+
+    def handle(self, *args, **options):
+        dispatcher = OutboxDispatcher(batch_size=options["batch"] or None, poll_interval=options["poll_interval"])
+        if options["once"]:
+            dispatcher.drain()
+        else:
+            self.stdout.write(self.style.SUCCESS("Dispatching notifications. Ctrl+C to stop."))
+            try:
+                dispatcher.run()
+            except KeyboardInterrupt:
+                pass
+        stats = dispatcher.stats()
+        self.stdout.write(
+            f"Sent {stats['sent']}, retrying {stats['retried']}, gave up on {stats['dead']}; "
+            f"{stats['queued']} queued, {stats['dead_letters']} dead letters."
+        )
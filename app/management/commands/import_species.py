@@ -0,0 +1,56 @@
+import requests
+from django.core.management.base import BaseCommand, CommandError
+
+from app.adapters.pokeapi_client import PokeApiHttp
+from app.adapters.species_dataset import (
+    DEFAULT_DATASET_PATH,
+    import_species,
+    load_species_file,
+    load_type_chart_csv,
+)
+
+
+class Command(BaseCommand):
+    help = "Import Pokémon species and the type matrix into the local catalog store."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "path",
+            nargs="?",
+            default=str(DEFAULT_DATASET_PATH),
+            help="JSON dump (species + type_chart) or species CSV. Defaults to the bundled dataset.",
+        )
+        parser.add_argument("--types", help="Type matrix CSV (attack_type,defender_type,multiplier).")
+        parser.add_argument(
+            "--from-pokeapi",
+            action="store_true",
+            help="Refresh from pokeapi.co instead of a local file.",
+        )
+        parser.add_argument(
+            "--limit", type=int, default=0, help="With --from-pokeapi: import only the first N species."
+        )
+
+    def handle(self, *args, **options):
+        try:
+            if options["from_pokeapi"]:
+                species, type_chart = self._fetch_from_pokeapi(int(options["limit"] or 0))
+            else:
+                species, type_chart = load_species_file(options["path"])
+            if options["types"]:
+                type_chart = {**type_chart, **load_type_chart_csv(options["types"])}
+        except (OSError, ValueError) as exc:
+            raise CommandError(str(exc)) from exc
+        except requests.RequestException as exc:
+            raise CommandError(f"PokeAPI unavailable: {exc}") from exc
+
+        n_species, n_types = import_species(species, type_chart)
+        self.stdout.write(self.style.SUCCESS(f"Imported {n_species} species and {n_types} attack types."))
+
+    def _fetch_from_pokeapi(self, limit: int):
+        api = PokeApiHttp()
+        index = api.pokemon_index()
+        if limit > 0:
+            index = index[:limit]
+        species = [api.fetch_pokemon(pokemon_id) for pokemon_id, _name in index]
+        types = sorted({t for p in species for t in p.types})
+        return species, {t: api.fetch_type_chart(t) for t in types}
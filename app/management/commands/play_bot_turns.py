@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from app.interfaces.workers.bot_turns import BotTurnWorker
+
+
+class Command(BaseCommand):
+    help = "Play the bot's moves in PvE battles waiting on it (run with BOT_WORKER=off)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Play what is waiting now and exit.")
+        parser.add_argument("--poll-interval", type=float, default=1.0, help="Seconds between sweeps for bot turns.")
+
+    def handle(self, *args, **options):
+        worker = BotTurnWorker(poll_interval=options["poll_interval"])
+        if options["once"]:
+            worker.play_pending(sweep=True)
+        else:
+            self.stdout.write(self.style.SUCCESS("Playing bot turns. Ctrl+C to stop."))
+            try:
+                worker.run()
+            except KeyboardInterrupt:
+                pass
+        stats = worker.stats()
+        self.stdout.write(f"Played {stats['played']} bot moves, {stats['errors']} battles failed.")
@@ -0,0 +1,55 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from app.adapters.pokeapi_standin import PokeApiStandin
+from app.adapters.species_dataset import DEFAULT_DATASET_PATH
+
+
+class Command(BaseCommand):
+    help = "Serve a local PokeAPI stand-in from a species dump, with injected latency and errors."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "path",
+            nargs="?",
+            default=str(DEFAULT_DATASET_PATH),
+            help="JSON dump (species + type_chart) or species CSV. Defaults to the bundled dataset.",
+        )
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=8090)
+        parser.add_argument("--latency-ms", type=float, default=0.0, help="Fixed delay added to every response.")
+        parser.add_argument("--jitter-ms", type=float, default=0.0, help="Extra random delay, 0..N ms.")
+        parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests that fail, 0..1.")
+        parser.add_argument("--error-status", type=int, default=503, help="Status of injected failures.")
+        parser.add_argument("--seed", type=int, default=None, help="Seed for reproducible jitter and failures.")
+
+    def handle(self, *args, **options):
+        if not 0.0 <= options["error_rate"] <= 1.0:
+            raise CommandError("--error-rate must be between 0 and 1.")
+        try:
+            standin = PokeApiStandin(
+                options["path"],
+                host=options["host"],
+                port=options["port"],
+                latency_ms=options["latency_ms"],
+                jitter_ms=options["jitter_ms"],
+                error_rate=options["error_rate"],
+                error_status=options["error_status"],
+                seed=options["seed"],
+            )
+        except (OSError, ValueError) as exc:
+            raise CommandError(str(exc)) from exc
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"PokeAPI stand-in with {len(standin.species)} species at {standin.url} "
+                f"(set POKEAPI_BASE_URL to this). Ctrl+C to stop."
+            )
+        )
+        try:
+            standin.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            standin.server.server_close()
+            stats = standin.stats()
+            self.stdout.write(f"Served {stats['requests']} requests, {stats['errors']} injected errors.")
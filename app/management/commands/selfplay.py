@@ -0,0 +1,66 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from app.adapters.selfplay import generate
+from app.adapters.species_dataset import DEFAULT_DATASET_PATH, load_species_file
+from app.adapters.type_chart import get_type_chart_store
+
+
+class Command(BaseCommand):
+    help = "Play bot-vs-bot battles between random teams and write every action as gzipped NDJSON for analytics."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--battles", type=int, default=100_000, help="Battles to play.")
+        parser.add_argument("--output", default="selfplay.ndjson.gz", help="Output file (gzipped NDJSON).")
+        parser.add_argument("--workers", type=int, default=0, help="Worker processes (default: one per CPU).")
+        parser.add_argument("--seed", type=int, default=1, help="Same seed and battle count give the same file.")
+        parser.add_argument("--team-size", type=int, default=3)
+        parser.add_argument(
+            "--epsilon", type=float, default=0.0, help="Share of moves picked at random instead of by the heuristic."
+        )
+        parser.add_argument(
+            "--dataset",
+            default=str(DEFAULT_DATASET_PATH),
+            help="Species JSON dump or CSV to draw teams from. Defaults to the bundled dataset.",
+        )
+
+    def handle(self, *args, **options):
+        battles = max(1, options["battles"])
+        try:
+            species, _ = load_species_file(options["dataset"])
+        except (OSError, ValueError) as exc:
+            raise CommandError(str(exc)) from exc
+        _, chart = get_type_chart_store().current()
+        step = max(battles // 10, 1)
+        reported = [0]
+
+        def progress(played: int, rows: int) -> None:
+            if played - reported[0] >= step or played == battles:
+                reported[0] = played
+                self.stdout.write(f"  {played:,}/{battles:,} battles, {rows:,} rows")
+
+        started = time.perf_counter()
+        try:
+            with open(options["output"], "wb") as out:
+                played, rows = generate(
+                    out,
+                    species,
+                    chart,
+                    battles,
+                    workers=options["workers"] or None,
+                    seed=options["seed"],
+                    team_size=max(1, options["team_size"]),
+                    epsilon=max(0.0, min(options["epsilon"], 1.0)),
+                    on_chunk=progress,
+                )
+                size = out.tell()
+        except ValueError as exc:
+            raise CommandError(str(exc)) from exc
+        elapsed = max(time.perf_counter() - started, 1e-9)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{played:,} battles, {rows:,} rows in {elapsed:.1f}s ({played / elapsed * 60:,.0f} battles/min), "
+                f"{size / 1_000_000:.1f} MB -> {options['output']}"
+            )
+        )
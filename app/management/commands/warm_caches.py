@@ -0,0 +1,112 @@
+import time
+from typing import Any, Callable
+
+import requests
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from app.adapters.cache import POKEMON, POKEMON_PAGES, TOMBSTONE, TYPE_CHART, CacheFamily
+from app.adapters.executor import BoundedExecutor
+from app.adapters.pokeapi_client import PokeApiHttp
+
+_LOOKUP_CHUNK = 500
+
+
+class Command(BaseCommand):
+    help = "Fill the shared PokeAPI caches (name index, every species, type charts, catalog pages) ahead of traffic."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--concurrency", type=int, default=8, help="Parallel requests to PokeAPI.")
+        parser.add_argument("--limit", type=int, default=0, help="Warm only the first N species.")
+        parser.add_argument(
+            "--page-sizes", default="20", help="Comma-separated catalog page sizes to warm (default: 20)."
+        )
+        parser.add_argument("--batch", type=int, default=100, help="Report progress every N items.")
+
+    def handle(self, *args, **options):
+        if settings.POKEAPI_SOURCE == "local":
+            self.stdout.write("POKEAPI_SOURCE=local serves species from the database; nothing to warm.")
+            return
+        concurrency = max(1, int(options["concurrency"]))
+        try:
+            page_sizes = sorted({max(1, min(int(size), 50)) for size in options["page_sizes"].split(",") if size})
+        except ValueError as exc:
+            raise CommandError("--page-sizes must be a comma-separated list of integers.") from exc
+
+        self.api = PokeApiHttp()
+        self.executor = BoundedExecutor(concurrency, concurrency, name="warm")
+        self.concurrency = concurrency
+        self.batch = max(1, int(options["batch"]))
+        self.verbose = options["verbosity"] >= 1
+        started = time.monotonic()
+
+        try:
+            index = self.api.pokemon_index()
+        except requests.RequestException as exc:
+            raise CommandError(f"PokeAPI unavailable: {exc}") from exc
+        if options["limit"] > 0:
+            index = index[: options["limit"]]
+        ids = [pokemon_id for pokemon_id, _name in index]
+
+        pokemons = self._warm(
+            "species",
+            POKEMON,
+            {f"poke:{pid}": pid for pid in ids},
+            lambda pid: self.api.fetch_pokemon(pid, revalidate=True),
+        )
+        types = sorted({t for p in pokemons.values() for t in p.types})
+        self._warm(
+            "type charts",
+            TYPE_CHART,
+            {f"typechart:{t}": t for t in types},
+            lambda t: self.api.fetch_type_chart(t, revalidate=True),
+        )
+        pages = {
+            f"pokelist:{size}:{offset}": (size, offset) for size in page_sizes for offset in range(0, len(ids), size)
+        }
+        self._warm(
+            "catalog pages", POKEMON_PAGES, pages, lambda page: self.api.list_pokemon_ids(*page, revalidate=True)
+        )
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(f"Caches warm in {elapsed:.1f}s."))
+
+    def _warm(self, label: str, family: CacheFamily, items: dict[str, Any], load: Callable[[Any], Any]) -> dict:
+        """Loads every item whose key is not fresh in the cache; returns key -> value for all that succeeded."""
+        values = self._cached(family, list(items))
+        todo = [(key, item) for key, item in items.items() if key not in values]
+        failed = 0
+        started = time.monotonic()
+
+        def run(entry: tuple[str, Any]) -> tuple[str, Any]:
+            key, item = entry
+            try:
+                return key, load(item)
+            except (ValueError, requests.RequestException):
+                return key, None
+
+        for start in range(0, len(todo), self.batch):
+            for key, value in self.executor.map(run, todo[start : start + self.batch], max_parallel=self.concurrency):
+                if value is None:
+                    failed += 1
+                else:
+                    values[key] = value
+            done = min(start + self.batch, len(todo))
+            if self.verbose:
+                rate = done / max(time.monotonic() - started, 1e-6)
+                self.stdout.write(f"{label}: {done}/{len(todo)} ({rate:.1f}/s, {failed} failed)")
+
+        elapsed = time.monotonic() - started
+        rate = len(todo) / elapsed if todo and elapsed > 0 else 0.0
+        self.stdout.write(
+            f"{label}: {len(items)} total, {len(items) - len(todo)} already cached, "
+            f"{len(todo) - failed} fetched, {failed} failed in {elapsed:.1f}s ({rate:.1f}/s)"
+        )
+        return values
+
+    def _cached(self, family: CacheFamily, keys: list[str]) -> dict[str, Any]:
+        found: dict[str, Any] = {}
+        for start in range(0, len(keys), _LOOKUP_CHUNK):
+            chunk = self.api.tiered.get_many(family, keys[start : start + _LOOKUP_CHUNK])
+            found.update({key: value for key, value in chunk.items() if value is not TOMBSTONE})
+        return found
@@ -0,0 +1,33 @@
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("app", "0003_lobby_code"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Species",
+            fields=[
+                ("id", models.IntegerField(primary_key=True, serialize=False)),
+                ("name", models.CharField(max_length=128, unique=True)),
+                ("stats", models.JSONField()),
+                ("types", models.JSONField(default=list)),
+                ("updated_at", models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.CreateModel(
+            name="TypeEffectiveness",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("attack_type", models.CharField(max_length=32)),
+                ("defender_type", models.CharField(max_length=32)),
+                ("multiplier", models.FloatField()),
+            ],
+            options={
+                "unique_together": {("attack_type", "defender_type")},
+            },
+        ),
+    ]
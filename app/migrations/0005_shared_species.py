@@ -0,0 +1,43 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def copy_user_pokemon_into_species(apps, schema_editor):
+    Species = apps.get_model("app", "Species")
+    UserPokemon = apps.get_model("app", "UserPokemon")
+
+    known_ids = set(Species.objects.values_list("id", flat=True))
+    used_names = set(Species.objects.values_list("name", flat=True))
+    rows = []
+    # The newest snapshot of each Pokémon wins; older per-user copies are dropped.
+    for up in UserPokemon.objects.order_by("pokemon_id", "-created_at").iterator():
+        if up.pokemon_id in known_ids:
+            continue
+        known_ids.add(up.pokemon_id)
+        name = up.name or f"pokemon-{up.pokemon_id}"
+        if name in used_names:
+            name = f"{name}-{up.pokemon_id}"
+        used_names.add(name)
+        rows.append(Species(id=up.pokemon_id, name=name, stats=up.stats, types=up.types or []))
+    Species.objects.bulk_create(rows, batch_size=500)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("app", "0004_species"),
+    ]
+
+    operations = [
+        migrations.RunPython(copy_user_pokemon_into_species, migrations.RunPython.noop),
+        migrations.RenameField(model_name="userpokemon", old_name="pokemon_id", new_name="pokemon"),
+        migrations.AlterField(
+            model_name="userpokemon",
+            name="pokemon",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.PROTECT, related_name="owners", to="app.species"
+            ),
+        ),
+        migrations.RemoveField(model_name="userpokemon", name="name"),
+        migrations.RemoveField(model_name="userpokemon", name="stats"),
+        migrations.RemoveField(model_name="userpokemon", name="types"),
+    ]
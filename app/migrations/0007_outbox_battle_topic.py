@@ -0,0 +1,20 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("app", "0006_notification_outbox"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="notificationoutbox",
+            name="battle_id",
+            field=models.IntegerField(null=True),
+        ),
+        migrations.AlterField(
+            model_name="notificationoutbox",
+            name="user_id",
+            field=models.IntegerField(null=True),
+        ),
+    ]
@@ -6,16 +6,30 @@ from django.utils import timezone
 User = get_user_model()
 
 
-class UserPokemon(models.Model):
-    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="pokemons")
-    pokemon_id = models.IntegerField()
-    name = models.CharField(max_length=128)
+class Species(models.Model):
+    id = models.IntegerField(primary_key=True)
+    name = models.CharField(max_length=128, unique=True)
     stats = models.JSONField()
     types = models.JSONField(default=list)
+    updated_at = models.DateTimeField(default=timezone.now)
+
+
+class TypeEffectiveness(models.Model):
+    attack_type = models.CharField(max_length=32)
+    defender_type = models.CharField(max_length=32)
+    multiplier = models.FloatField()
+
+    class Meta:
+        unique_together = ("attack_type", "defender_type")
+
+
+class UserPokemon(models.Model):
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="pokemons")
+    pokemon = models.ForeignKey(Species, on_delete=models.PROTECT, related_name="owners")
     created_at = models.DateTimeField(default=timezone.now)
 
     class Meta:
-        unique_together = ("user", "pokemon_id")
+        unique_together = ("user", "pokemon")
 
 
 class ActivePokemon(models.Model):
@@ -70,3 +84,17 @@ class Statistics(models.Model):
     damage = models.IntegerField(default=0)
     crits = models.IntegerField(default=0)
     win_rate = models.DecimalField(max_digits=5, decimal_places=2, default=0)
+
+
+class NotificationOutbox(models.Model):
+    user_id = models.IntegerField(null=True)
+    battle_id = models.IntegerField(null=True)
+    event = models.CharField(max_length=64)
+    payload = models.JSONField(default=dict)
+    attempts = models.IntegerField(default=0)
+    available_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [models.Index(fields=["available_at"], name="outbox_due_idx")]
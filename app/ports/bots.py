@@ -0,0 +1,15 @@
+from typing import Protocol
+
+from app.domain.entities import Pokemon
+
+
+class BotTurnPort(Protocol):
+    def turn_passed(self, battle_id: int, next_user_id: int) -> None:
+        """Called inside the turn's transaction once `next_user_id` is to move; bots take their move after commit."""
+        ...
+
+
+class BotTeamPort(Protocol):
+    def take(self, exclude: set[int]) -> list[Pokemon] | None:
+        """A ready bot team sharing no species with `exclude`, or None when none is ready."""
+        ...
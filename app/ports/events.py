@@ -0,0 +1,25 @@
+from typing import Protocol
+
+
+class EventSubscription(Protocol):
+    def wait(self, timeout: float) -> bool: ...
+
+    def close(self) -> None: ...
+
+    def __enter__(self) -> "EventSubscription": ...
+
+    def __exit__(self, *exc) -> None: ...
+
+
+class EventBusPort(Protocol):
+    def publish(self, topic: str) -> None: ...
+
+    def listen(self, topic: str) -> EventSubscription: ...
+
+
+def battle_topic(battle_id: int) -> str:
+    return f"battle:{int(battle_id)}"
+
+
+def user_topic(user_id: int) -> str:
+    return f"user:{int(user_id)}"
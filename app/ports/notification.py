@@ -1,5 +1,20 @@
-from typing import Protocol
+from typing import NamedTuple, Protocol
+
+
+class Notification(NamedTuple):
+    """An event for one user's sockets or, with `battle_id` instead of `user_id`, for everyone spectating a battle."""
+
+    user_id: int | None
+    event: str
+    payload: dict
+    battle_id: int | None = None
+
+    @classmethod
+    def for_battle(cls, battle_id: int, event: str, payload: dict) -> "Notification":
+        return cls(None, event, payload, battle_id)
 
 
 class NotificationPort(Protocol):
     def send(self, user_id: int, event: str, payload: dict) -> None: ...
+
+    def send_many(self, notifications: list[Notification]) -> None: ...
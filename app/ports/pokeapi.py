@@ -6,6 +6,8 @@ from app.domain.entities import Pokemon
 class PokeApiPort(Protocol):
     def fetch_pokemon(self, pokemon_id: int) -> Pokemon: ...
 
+    def fetch_pokemons(self, pokemon_ids: list[int]) -> list[Pokemon]: ...
+
     def fetch_pokemon_by_name(self, name: str) -> Pokemon: ...
 
     def search_pokemon_ids(self, query: str, limit: int = 20, offset: int = 0) -> list[int]: ...
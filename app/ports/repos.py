@@ -4,12 +4,20 @@ from app.domain.entities import BattleContext, LobbyEntry, Pokemon
 
 
 class CatalogPort(Protocol):
+    def get_species(self, pokemon_ids: List[int]) -> Dict[int, Pokemon]: ...
+
+    def save_species(self, pokemons: List[Pokemon]) -> None: ...
+
     def list_user_pokemon(self, user_id: int) -> List[Pokemon]: ...
 
     def get_user_pokemon(self, user_id: int, pokemon_id: int) -> Pokemon | None: ...
 
+    def get_user_pokemons(self, user_id: int, pokemon_ids: List[int]) -> Dict[int, Pokemon]: ...
+
     def upsert_user_pokemon(self, user_id: int, pokemon: Pokemon) -> Pokemon: ...
 
+    def upsert_user_pokemons(self, user_id: int, pokemons: List[Pokemon]) -> List[Pokemon]: ...
+
     def set_active(self, user_id: int, pokemon_id: int) -> None: ...
 
     def get_active(self, user_id: int) -> Pokemon | None: ...
@@ -27,15 +35,19 @@ class BattleRepoPort(Protocol):
         p1_team: List[Pokemon],
         p2_team: List[Pokemon],
         seed: int,
-        type_chart: dict[str, dict[str, float]],
+        type_chart_version: str,
         order: List[str],
         initiative: Dict,
     ) -> int: ...
 
-    def load_battle(self, battle_id: int) -> BattleContext: ...
+    def load_battle(self, battle_id: int, for_update: bool = False) -> BattleContext:
+        """With `for_update`, locks the battle row until the caller's transaction ends."""
+        ...
 
     def save_turn(self, battle_id: int, turn: Dict) -> None: ...
 
+    def save_turns(self, battle_id: int, turns: List[Dict]) -> None: ...
+
     def update_state(self, battle_id: int, state: Dict) -> None: ...
 
     def finish(self, battle_id: int, result: Dict) -> None: ...
@@ -44,10 +56,20 @@ class BattleRepoPort(Protocol):
 
     def list_events(self, battle_id: int) -> List[Dict]: ...
 
+    def list_events_since(self, battle_id: int, after: int) -> List[Dict]: ...
+
+    def get_status(self, battle_id: int) -> str | None: ...
+
+    def find_active_battle(self, user_id: int, after_battle_id: int = 0) -> Dict | None: ...
+
     def get_replay(self, battle_id: int) -> Dict | None: ...
 
     def update_pending_actions(self, battle_id: int, pending_actions: Dict[str, Dict | None]) -> None: ...
 
+    def get_spectator_view(self, battle_id: int) -> Dict | None: ...
+
+    def list_battles_awaiting(self, user_id: int) -> List[int]: ...
+
 
 class LobbyPort(Protocol):
     def enqueue(self, user_id: int, pokemon_ids: List[int]) -> None: ...
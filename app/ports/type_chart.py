@@ -0,0 +1,7 @@
+from typing import Protocol
+
+
+class TypeChartPort(Protocol):
+    def current(self) -> tuple[str, dict[str, dict[str, float]]]: ...
+
+    def get(self, version: str) -> dict[str, dict[str, float]] | None: ...
@@ -0,0 +1,104 @@
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from app.adapters.notification_outbox import OutboxNotifier
+from app.adapters.repositories import BattleRepository, StatisticsRepository, UserRepository
+from app.adapters.type_chart import get_type_chart_store
+from app.application.use_cases import BotAutoPlayUC, PlayTurnUC
+from app.domain.entities import Pokemon
+from app.models import Battle, BattleEvent, NotificationOutbox
+
+
+class AutoResolveTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username="u1", password="pass12345")
+        self.other = get_user_model().objects.create_user(username="u2", password="pass12345")
+        self.bot_id = UserRepository().get_or_create_bot_user_id()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.repo = BattleRepository()
+
+    def _battle(self, p1: int, p2: int) -> int:
+        team_a = [
+            Pokemon(
+                id=4, name="charmander", types=["fire"], stats={"hp": 40, "attack": 52, "defense": 43, "speed": 65}
+            ),
+            Pokemon(id=7, name="squirtle", types=["water"], stats={"hp": 44, "attack": 48, "defense": 65, "speed": 43}),
+        ]
+        team_b = [
+            Pokemon(
+                id=1,
+                name="bulbasaur",
+                types=["grass", "poison"],
+                stats={"hp": 45, "attack": 49, "defense": 49, "speed": 45},
+            ),
+            Pokemon(
+                id=25, name="pikachu", types=["electric"], stats={"hp": 35, "attack": 55, "defense": 40, "speed": 90}
+            ),
+        ]
+        version = get_type_chart_store().current()[0]
+        return self.repo.create_battle(p1, p2, team_a, team_b, 7, version, ["a", "b"], {})
+
+    def test_resolves_the_battle_in_one_request_like_turn_by_turn_play(self):
+        auto_id = self._battle(self.user.id, self.bot_id)
+        manual_id = self._battle(self.user.id, self.bot_id)
+
+        response = self.client.post(f"/battles/{auto_id}/autoresolve")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["status"], "finished")
+
+        play = PlayTurnUC(self.repo, OutboxNotifier(), StatisticsRepository())
+        while True:
+            battle = self.repo.load_battle(manual_id)
+            if battle.status != "active":
+                break
+            role = battle.state["next_actor"]
+            user_id = battle.p1_id if role == "a" else battle.p2_id
+            play.execute(manual_id, user_id, BotAutoPlayUC.choose_action(battle, role, battle.state))
+
+        auto_turns = self.repo.list_events(auto_id)
+        self.assertEqual(len(auto_turns), response.json()["turns"])
+        self.assertEqual(auto_turns, self.repo.list_events(manual_id))
+        auto, manual = Battle.objects.get(id=auto_id).result, Battle.objects.get(id=manual_id).result
+        self.assertEqual(auto["outcome"], response.json()["outcome"])
+        self.assertEqual((auto["outcome"], auto["state"]), (manual["outcome"], manual["state"]))
+        self.assertEqual(len(auto["replay"]["turns"]), BattleEvent.objects.filter(battle_id=auto_id).count())
+        ended = NotificationOutbox.objects.filter(
+            event="battle_ended", payload__battle_id=auto_id, user_id__isnull=False
+        )
+        self.assertEqual(ended.count(), 2)
+
+    def test_only_participants_of_bot_battles_can_auto_resolve(self):
+        pvp_id = self._battle(self.user.id, self.other.id)
+        self.assertEqual(self.client.post(f"/battles/{pvp_id}/autoresolve").status_code, 400)
+
+        pve_id = self._battle(self.other.id, self.bot_id)
+        self.assertEqual(self.client.post(f"/battles/{pve_id}/autoresolve").status_code, 403)
+        self.assertEqual(self.client.post("/battles/999999/autoresolve").status_code, 404)
+        self.assertFalse(BattleEvent.objects.exists())
+
+    def test_finished_battles_are_rejected(self):
+        battle_id = self._battle(self.user.id, self.bot_id)
+        self.assertEqual(self.client.post(f"/battles/{battle_id}/autoresolve").status_code, 200)
+        response = self.client.post(f"/battles/{battle_id}/autoresolve")
+        self.assertEqual((response.status_code, response.json()["error"]), (400, "Battle is not active."))
+
+    def test_resolves_with_the_battle_row_locked(self):
+        battle_id = self._battle(self.user.id, self.bot_id)
+        load = BattleRepository.load_battle
+        with patch.object(BattleRepository, "load_battle", autospec=True, side_effect=load) as spy:
+            self.assertEqual(self.client.post(f"/battles/{battle_id}/autoresolve").status_code, 200)
+        self.assertTrue(spy.call_args.kwargs.get("for_update"))
+
+    def test_auto_pve_start_hands_no_move_to_the_bot_worker(self):
+        battle_id = self._battle(self.bot_id, self.user.id)
+        with patch("app.interfaces.rest.views.StartPveBattleUC") as start:
+            start.return_value.execute.return_value = {"status": "matched", "battle_id": battle_id}
+            response = self.client.post("/battle/pve", {"auto": True}, format="json")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("outcome", response.json())
+        self.assertIsNone(start.call_args.args[6])
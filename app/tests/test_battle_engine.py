@@ -109,12 +109,18 @@ class CatalogUCTests(SimpleTestCase):
             def __init__(self):
                 self.items = []
 
+            def get_species(self, _pokemon_ids):
+                return {}
+
+            def save_species(self, _pokemons):
+                return None
+
             def list_user_pokemon(self, _user_id):
                 return list(self.items)
 
-            def upsert_user_pokemon(self, _user_id, pokemon):
-                self.items.append(pokemon)
-                return pokemon
+            def upsert_user_pokemons(self, _user_id, pokemons):
+                self.items.extend(pokemons)
+                return list(pokemons)
 
         class FakePokeApi:
             def list_pokemon_ids(self, limit=20, offset=0):
@@ -128,6 +134,9 @@ class CatalogUCTests(SimpleTestCase):
                     stats={"hp": 10, "attack": 10, "defense": 10, "speed": 10},
                 )
 
+            def fetch_pokemons(self, pokemon_ids):
+                return [self.fetch_pokemon(pid) for pid in pokemon_ids]
+
             def fetch_type_chart(self, _attack_type: str):
                 return {}
 
@@ -0,0 +1,129 @@
+import threading
+import time
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase
+from rest_framework.test import APIClient
+
+from app.adapters.event_bus import EventBusLocal
+from app.adapters.repositories import BattleRepository
+from app.application.use_cases import WaitBattleEventsUC
+from app.domain.entities import BattleContext, BattleSeed, Pokemon
+from app.ports.events import battle_topic
+
+
+class _FakeRepo:
+    def __init__(self):
+        self.events: list[dict] = []
+        self.status = "active"
+        p = Pokemon(id=1, name="p", types=["normal"], stats={"hp": 10, "attack": 10, "defense": 10, "speed": 10})
+        self.battle = BattleContext(
+            id=7,
+            status="active",
+            p1_id=1,
+            p2_id=2,
+            p1_team=[p],
+            p2_team=[p],
+            p1_pokemon=p,
+            p2_pokemon=p,
+            seed=BattleSeed(1),
+            type_chart={},
+            pending_actions={"a": None, "b": None},
+            log=[],
+            state={},
+        )
+
+    def load_battle(self, _battle_id: int):
+        return self.battle
+
+    def list_events_since(self, _battle_id: int, after: int):
+        return self.events[after:]
+
+    def get_status(self, _battle_id: int):
+        return self.status
+
+
+class EventBusLocalTests(SimpleTestCase):
+    def test_wait_times_out_without_publish(self):
+        bus = EventBusLocal()
+        with bus.listen("battle:1") as sub:
+            self.assertFalse(sub.wait(0.01))
+
+    def test_publish_before_wait_is_not_lost(self):
+        bus = EventBusLocal()
+        with bus.listen("battle:1") as sub:
+            bus.publish("battle:1")
+            bus.publish("battle:2")
+            self.assertTrue(sub.wait(0))
+
+
+class WaitBattleEventsUCTests(SimpleTestCase):
+    def test_waiter_wakes_up_when_turn_is_published(self):
+        repo = _FakeRepo()
+        bus = EventBusLocal()
+        uc = WaitBattleEventsUC(repo, notifier=None, events=bus)
+
+        def _play():
+            time.sleep(0.05)
+            repo.events.append({"turn": 1, "actor": "a"})
+            bus.publish(battle_topic(7))
+
+        threading.Thread(target=_play).start()
+        started = time.monotonic()
+        result = uc.execute(7, 1, after=0, timeout=5)
+        self.assertLess(time.monotonic() - started, 2)
+        self.assertEqual(result["cursor"], 1)
+        self.assertEqual(result["events"], [{"turn": 1, "actor": "a"}])
+
+    def test_rejects_non_participant(self):
+        uc = WaitBattleEventsUC(_FakeRepo(), notifier=None, events=EventBusLocal())
+        with self.assertRaises(PermissionError):
+            uc.execute(7, 99, timeout=0)
+
+
+class BattleEventsApiTests(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.u1 = User.objects.create_user(username="u1", password="pass12345")
+        self.u2 = User.objects.create_user(username="u2", password="pass12345")
+        self.u3 = User.objects.create_user(username="u3", password="pass12345")
+        self.repo = BattleRepository()
+        team = [Pokemon(id=1, name="p", types=["normal"], stats={"hp": 10, "attack": 10, "defense": 10, "speed": 10})]
+        self.battle_id = self.repo.create_battle(
+            p1=self.u1.id,
+            p2=self.u2.id,
+            p1_team=team,
+            p2_team=team,
+            seed=123,
+            type_chart_version="",
+            order=["a", "b"],
+            initiative={"seed": 123, "winner": "a", "method": "speed", "a_speed": 10, "b_speed": 10},
+        )
+        self.repo.save_turn(self.battle_id, {"turn": 1, "actor": "a"})
+        self.client = APIClient()
+
+    def test_events_since_cursor(self):
+        self.client.force_authenticate(self.u1)
+        resp = self.client.get(f"/battles/{self.battle_id}/events?after=0&timeout=0")
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.json()["cursor"], 1)
+        self.assertEqual(resp.json()["events"], [{"turn": 1, "actor": "a"}])
+
+        resp = self.client.get(f"/battles/{self.battle_id}/events?after=1&timeout=0")
+        self.assertEqual(resp.json()["cursor"], 1)
+        self.assertEqual(resp.json()["events"], [])
+
+    def test_events_hidden_from_non_participant(self):
+        self.client.force_authenticate(self.u3)
+        resp = self.client.get(f"/battles/{self.battle_id}/events?timeout=0")
+        self.assertEqual(resp.status_code, 404)
+
+    def test_lobby_wait_reports_new_battle(self):
+        self.client.force_authenticate(self.u2)
+        resp = self.client.get("/lobby/wait?after=0&timeout=0")
+        self.assertEqual(resp.json()["status"], "matched")
+        self.assertEqual(resp.json()["battle_id"], self.battle_id)
+        self.assertEqual(resp.json()["role"], "b")
+
+        resp = self.client.get(f"/lobby/wait?after={self.battle_id}&timeout=0")
+        self.assertEqual(resp.json(), {"status": "waiting"})
@@ -0,0 +1,92 @@
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+
+from app.domain.entities import Pokemon
+from app.interfaces.workers.bot_teams import BotTeamPool
+
+
+def _pokemon(pid: int) -> Pokemon:
+    return Pokemon(
+        id=pid, name=f"p{pid}", types=["normal"], stats={"hp": 40, "attack": 40, "defense": 40, "speed": pid}
+    )
+
+
+class _FakePokeApi:
+    def __init__(self, total: int = 120):
+        self.total = total
+        self.list_calls: list[int] = []
+        self.fetch_calls: list[list[int]] = []
+
+    def list_pokemon_ids(self, limit: int = 20, offset: int = 0) -> list[int]:
+        self.list_calls.append(offset)
+        return list(range(offset + 1, min(offset + limit, self.total) + 1))
+
+    def fetch_pokemons(self, pokemon_ids: list[int]) -> list[Pokemon]:
+        self.fetch_calls.append(list(pokemon_ids))
+        return [_pokemon(pid) for pid in pokemon_ids]
+
+
+class BotTeamPoolTests(SimpleTestCase):
+    def setUp(self):
+        self.api = _FakePokeApi()
+        self.pool = BotTeamPool(size=8, seed=3, pokeapi=lambda: self.api)
+        patcher = patch.object(self.pool, "wake")
+        self.wake = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_refill_fetches_all_missing_teams_in_one_batch(self):
+        self.assertEqual(self.pool.refill(), 8)
+        self.assertEqual(self.pool.refill(), 0)
+        self.assertEqual(len(self.api.fetch_calls), 1)
+        self.assertEqual(self.pool.stats()["ready"], 8)
+
+    def test_take_skips_teams_that_share_species_with_the_player(self):
+        self.pool.refill()
+        first = list(self.pool._teams)[0]
+        exclude = {first[0].id}
+        team = self.pool.take(exclude)
+        self.assertEqual(len(team), 3)
+        self.assertEqual(len({p.id for p in team}), 3)
+        self.assertFalse({p.id for p in team} & exclude)
+        self.assertEqual(self.pool.stats()["ready"], 7)
+        self.wake.assert_called_once()
+
+    def test_empty_pool_misses_and_asks_for_a_refill(self):
+        self.assertIsNone(self.pool.take(set()))
+        self.assertEqual(self.pool.stats()["misses"], 1)
+        self.wake.assert_called_once()
+
+    def test_disabled_pool_never_serves(self):
+        pool = BotTeamPool(size=0, pokeapi=lambda: self.api)
+        self.assertIsNone(pool.take(set()))
+        self.assertIsNone(pool._thread)
+
+    def test_random_pages_past_the_end_lower_the_offset(self):
+        pool = BotTeamPool(size=4, seed=1, pokeapi=lambda: self.api)
+        for _ in range(5):
+            pool._teams.clear()
+            pool.refill()
+        self.assertLessEqual(pool._max_offset, self.api.total)
+        self.assertTrue(pool._seen_ids <= set(range(1, self.api.total + 1)))
+        self.assertGreater(pool.stats()["species_seen"], 50)
+
+    def test_run_keeps_going_after_an_unexpected_error(self):
+        pool = BotTeamPool(size=2, seed=2, pokeapi=lambda: self.api, poll_interval=0)
+        calls = []
+
+        def refill():
+            calls.append(1)
+            if len(calls) == 1:
+                raise KeyError("odd species")
+            pool.stop()
+            return 0
+
+        with (
+            patch.object(pool, "refill", side_effect=refill),
+            patch("app.interfaces.workers.bot_teams.close_old_connections"),
+        ):
+            with self.assertLogs("app.interfaces.workers.bot_teams", level="ERROR"):
+                pool.run()
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(pool.stats()["errors"], 1)
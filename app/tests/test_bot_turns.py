@@ -0,0 +1,150 @@
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from app.adapters.repositories import BattleRepository, UserRepository
+from app.adapters.type_chart import get_type_chart_store
+from app.application.use_cases import BotAutoPlayUC
+from app.domain.entities import Pokemon
+from app.interfaces.workers.bot_turns import BotTurnWorker, get_bot_worker
+
+
+class BotTurnWorkerTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username="u1", password="pass12345")
+        self.bot_id = UserRepository().get_or_create_bot_user_id()
+        self.team = [
+            Pokemon(id=1, name="p", types=["normal"], stats={"hp": 500, "attack": 10, "defense": 10, "speed": 10})
+        ]
+        self.repo = BattleRepository()
+        self.battle_id = self._battle(self.bot_id, self.user.id)
+
+    def _battle(self, p1: int, p2: int) -> int:
+        return self.repo.create_battle(
+            p1, p2, self.team, self.team, 1, get_type_chart_store().current()[0], ["a", "b"], {}
+        )
+
+    def test_sweep_plays_battles_waiting_on_the_bot(self):
+        worker = BotTurnWorker()
+        self.assertEqual(self.repo.list_battles_awaiting(self.bot_id), [self.battle_id])
+
+        self.assertEqual(worker.play_pending(sweep=True), 1)
+        self.assertEqual(self.repo.load_battle(self.battle_id).state["next_actor"], "b")
+        self.assertEqual(self.repo.list_battles_awaiting(self.bot_id), [])
+        self.assertEqual(worker.stats(), {"played": 1, "errors": 0, "queued": 0})
+
+    @override_settings(BOT_STRATEGY="lookahead", BOT_MOVE_BUDGET_MS=5)
+    def test_lookahead_strategy_plays_a_legal_move(self):
+        self.assertEqual(BotTurnWorker().play(self.battle_id), 1)
+        turn = self.repo.list_events(self.battle_id)[0]
+        self.assertEqual(turn["actor"], "a")
+        self.assertIn(turn["action"]["type"], {"attack", "defend", "buff", "debuff"})
+
+    @override_settings(BOT_WORKER="thread")
+    def test_only_the_bots_turns_are_queued_after_commit(self):
+        worker = BotTurnWorker()
+        with patch.object(worker, "wake") as wake, self.captureOnCommitCallbacks(execute=True) as callbacks:
+            worker.turn_passed(self.battle_id, self.user.id)
+            worker.turn_passed(self.battle_id, self.bot_id)
+
+        self.assertEqual(len(callbacks), 1)
+        wake.assert_called_once_with()
+        self.assertEqual(worker.stats()["queued"], 1)
+        self.assertEqual(worker.play_pending(), 1)
+
+    @override_settings(BOT_WORKER="off")
+    def test_nothing_is_queued_in_process_when_the_worker_is_off(self):
+        worker = BotTurnWorker()
+        with self.captureOnCommitCallbacks(execute=True):
+            worker.turn_passed(self.battle_id, self.bot_id)
+        self.assertEqual(worker.stats()["queued"], 0)
+
+    def test_reading_a_battle_does_not_play_the_bot(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+
+        response = client.get(f"/battles/{self.battle_id}")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.repo.load_battle(self.battle_id).state["next_actor"], "a")
+        self.assertEqual(self.repo.list_events(self.battle_id), [])
+
+    @override_settings(BOT_WORKER="thread", NOTIFY_OUTBOX_DISPATCHER="off")
+    def test_human_turn_hands_the_move_to_the_worker(self):
+        battle_id = self._battle(self.user.id, self.bot_id)
+        client = APIClient()
+        client.force_authenticate(self.user)
+        worker = get_bot_worker()
+
+        with patch.object(worker, "wake"), self.captureOnCommitCallbacks(execute=True):
+            response = client.post(f"/battle/{battle_id}/turn", {"type": "defend"}, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(worker.play_pending(), 1)
+        self.assertEqual([turn["actor"] for turn in self.repo.list_events(battle_id)], ["a", "b"])
+
+    def test_bot_moves_are_played_with_the_battle_row_locked(self):
+        load = BattleRepository.load_battle
+        with patch.object(BattleRepository, "load_battle", autospec=True, side_effect=load) as spy:
+            self.assertEqual(BotTurnWorker().play(self.battle_id), 1)
+        self.assertTrue(spy.call_args_list)
+        self.assertTrue(all(call.kwargs.get("for_update") for call in spy.call_args_list))
+
+    def test_one_broken_battle_does_not_stop_the_others(self):
+        other_id = self._battle(self.bot_id, self.user.id)
+        worker = BotTurnWorker()
+        execute = BotAutoPlayUC.execute
+
+        def flaky(uc, battle_id, *args, **kwargs):
+            if battle_id == self.battle_id:
+                raise KeyError("state")
+            return execute(uc, battle_id, *args, **kwargs)
+
+        with patch.object(BotAutoPlayUC, "execute", autospec=True, side_effect=flaky):
+            with self.assertLogs("app.interfaces.workers.bot_turns", level="ERROR"):
+                self.assertEqual(worker.play_pending(sweep=True), 1)
+        self.assertEqual(self.repo.list_battles_awaiting(self.bot_id), [self.battle_id])
+        self.assertEqual(self.repo.load_battle(other_id).state["next_actor"], "b")
+        self.assertEqual(worker.stats()["errors"], 1)
+
+    def test_run_keeps_going_after_a_failed_sweep(self):
+        worker = BotTurnWorker(poll_interval=0)
+        calls = []
+
+        def play_pending(sweep=False):
+            calls.append(sweep)
+            if len(calls) == 1:
+                raise RuntimeError("boom")
+            worker.stop()
+            return 0
+
+        with (
+            patch.object(worker, "play_pending", side_effect=play_pending),
+            patch("app.interfaces.workers.bot_turns.close_old_connections"),
+        ):
+            with self.assertLogs("app.interfaces.workers.bot_turns", level="ERROR"):
+                worker.run()
+        self.assertEqual(calls, [True, True])
+        self.assertEqual(worker.stats()["errors"], 1)
+
+    def test_run_sweeps_on_schedule_while_woken_continuously(self):
+        now = [0.0]
+        worker = BotTurnWorker(poll_interval=10, clock=lambda: now[0])
+        calls = []
+
+        def play_pending(sweep=False):
+            calls.append(sweep)
+            now[0] += 4
+            if len(calls) == 6:
+                worker.stop()
+            else:
+                # Another battle's turn arrives before the wait even starts.
+                worker._wakeup.set()
+            return 0
+
+        with (
+            patch.object(worker, "play_pending", side_effect=play_pending),
+            patch("app.interfaces.workers.bot_turns.close_old_connections"),
+        ):
+            worker.run()
+        self.assertEqual(calls, [True, False, False, True, False, False])
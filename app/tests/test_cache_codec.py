@@ -0,0 +1,60 @@
+import pickle
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import SimpleTestCase
+
+from app.adapters.cache import TOMBSTONE, _Envelope
+from app.adapters.cache_codec import MAGIC, SCHEMA_VERSION, CompactRedisSerializer
+from app.domain.entities import Pokemon
+
+
+class CompactRedisSerializerTests(SimpleTestCase):
+    def setUp(self):
+        self.serializer = CompactRedisSerializer()
+        self.pikachu = Pokemon(
+            id=25, name="pikachu", types=["electric"], stats={"hp": 35, "attack": 55, "defense": 40, "speed": 90}
+        )
+
+    def _roundtrip(self, value):
+        data = self.serializer.dumps(value)
+        return data, self.serializer.loads(data)
+
+    def test_cache_records_round_trip_compactly(self):
+        values = [
+            self.pikachu,
+            _Envelope(1700000000.5, self.pikachu),
+            [(1, "bulbasaur"), (10001, "deoxys-attack")],
+            _Envelope(1.0, [25, 26, 27]),
+            {"water": 2.0, "electric": 0.5, "ground": 0.0},
+        ]
+        for value in values:
+            data, decoded = self._roundtrip(value)
+            self.assertTrue(data.startswith(MAGIC), value)
+            self.assertEqual(decoded, value)
+            self.assertLess(len(data), len(pickle.dumps(value, pickle.HIGHEST_PROTOCOL)))
+        self.assertIs(self._roundtrip(TOMBSTONE)[1], TOMBSTONE)
+        self.assertEqual(self._roundtrip([])[1], [])
+
+    def test_other_values_fall_back_to_pickle_and_ints_stay_plain(self):
+        odd = Pokemon(id=1, name="x", types=["cosmic"], stats={"hp": 1, "attack": 1, "defense": 1, "speed": 1})
+        for value in (odd, {"a": "b"}, "token", {"fire": 70000.5}, [(1, "a\nb")]):
+            data, decoded = self._roundtrip(value)
+            self.assertFalse(data.startswith(MAGIC))
+            self.assertEqual(decoded, value)
+        self.assertEqual(self.serializer.dumps(7), 7)
+        self.assertEqual(self.serializer.loads(b"7"), 7)
+
+    def test_records_from_another_schema_version_read_as_misses(self):
+        data = bytearray(self.serializer.dumps(self.pikachu))
+        data[len(MAGIC)] = SCHEMA_VERSION + 1
+        with self.assertLogs("app.adapters.cache_codec", level="WARNING"):
+            self.assertIsNone(self.serializer.loads(bytes(data)))
+        with self.assertLogs("app.adapters.cache_codec", level="WARNING"):
+            self.assertIsNone(self.serializer.loads(MAGIC + b"\x01"))
+
+    def test_benchmark_command_reports_every_family(self):
+        out = StringIO()
+        call_command("bench_cache_codec", rounds=1, index_size=50, stdout=out)
+        for family in ("poke:{id}", "typechart:{type}", "pokelist:20:{offset}", "poke:index:v1"):
+            self.assertIn(family, out.getvalue())
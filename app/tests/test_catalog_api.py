@@ -5,7 +5,7 @@ from django.test import TestCase
 from rest_framework.test import APIClient
 
 from app.adapters.pokeapi_client import PokeApiHttp
-from app.models import UserPokemon
+from app.models import Species, UserPokemon
 
 
 class CatalogApiTests(TestCase):
@@ -16,20 +16,14 @@ class CatalogApiTests(TestCase):
         login = self.client.post("/auth/login", {"username": "ash", "password": "pikachu123"}, format="json").json()
         self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {login['access']}")
 
-        UserPokemon.objects.create(
-            user=self.user,
-            pokemon_id=1,
-            name="bulbasaur",
-            stats={"hp": 10, "attack": 10, "defense": 10, "speed": 10},
-            types=["grass"],
-        )
-        UserPokemon.objects.create(
-            user=self.user,
-            pokemon_id=2,
-            name="ivysaur",
-            stats={"hp": 10, "attack": 10, "defense": 10, "speed": 10},
-            types=["grass"],
-        )
+        for pid, name in ((1, "bulbasaur"), (2, "ivysaur")):
+            Species.objects.create(
+                id=pid,
+                name=name,
+                stats={"hp": 10, "attack": 10, "defense": 10, "speed": 10},
+                types=["grass"],
+            )
+        UserPokemon.objects.create(user=self.user, pokemon_id=1)
 
     def test_catalog_offset_nan_is_handled(self):
         with patch.object(PokeApiHttp, "list_pokemon_ids", autospec=True, return_value=[1, 2]):
@@ -57,3 +51,10 @@ class CatalogApiTests(TestCase):
         self.assertEqual(resp.status_code, 200)
         items = resp.json()
         self.assertEqual([p["id"] for p in items], [1, 2])
+
+    def test_catalog_browsing_does_not_write_user_pokemon(self):
+        with patch.object(PokeApiHttp, "list_pokemon_ids", autospec=True, return_value=[1, 2]):
+            with self.assertNumQueries(2):  # JWT user lookup + one species read
+                resp = self.client.get("/catalog?limit=20&offset=0")
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(UserPokemon.objects.filter(user=self.user).count(), 1)
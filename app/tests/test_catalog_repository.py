@@ -0,0 +1,41 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from app.adapters.cache import get_tiered_cache
+from app.adapters.repositories import CatalogRepository
+from app.domain.entities import Pokemon
+from app.models import Species, UserPokemon
+
+
+def _pokemon(pid: int) -> Pokemon:
+    return Pokemon(id=pid, name=f"p{pid}", types=["normal"], stats={"hp": 10, "attack": 10, "defense": 10, "speed": 10})
+
+
+class CatalogRepositoryBatchTests(TestCase):
+    def setUp(self):
+        get_tiered_cache().clear_local()
+        self.user = get_user_model().objects.create_user(username="ash", password="pikachu123")
+        self.repo = CatalogRepository()
+
+    def test_upsert_user_pokemons_costs_constant_queries(self):
+        pokemons = [_pokemon(pid) for pid in range(1, 51)]
+        # species insert + ownership insert + one species read
+        with self.assertNumQueries(3):
+            saved = self.repo.upsert_user_pokemons(self.user.id, pokemons)
+        self.assertEqual([p.id for p in saved], list(range(1, 51)))
+        self.assertEqual(UserPokemon.objects.filter(user=self.user).count(), 50)
+
+        with self.assertNumQueries(2):
+            self.repo.upsert_user_pokemons(self.user.id, pokemons)
+        self.assertEqual(UserPokemon.objects.filter(user=self.user).count(), 50)
+
+    def test_get_user_pokemons_is_one_ownership_query(self):
+        for pid in range(1, 51):
+            Species.objects.create(id=pid, name=f"p{pid}", stats=dict(_pokemon(pid).stats), types=["normal"])
+        UserPokemon.objects.bulk_create([UserPokemon(user=self.user, pokemon_id=pid) for pid in range(1, 26)])
+        self.repo.get_species(list(range(1, 51)))
+
+        with self.assertNumQueries(1):
+            owned = self.repo.get_user_pokemons(self.user.id, list(range(1, 51)))
+        self.assertEqual(sorted(owned), list(range(1, 26)))
+        self.assertEqual(owned[7].name, "p7")
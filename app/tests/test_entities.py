@@ -0,0 +1,60 @@
+import gc
+import pickle
+from dataclasses import FrozenInstanceError
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase
+
+from app.adapters.repositories import BattleRepository
+from app.domain.entities import Pokemon, Stats, _interned
+
+STATS = {"hp": 35, "attack": 55, "defense": 40, "speed": 90}
+
+
+class PokemonFlyweightTests(SimpleTestCase):
+    def test_of_returns_one_shared_instance_per_species(self):
+        a = Pokemon.of(25, "pikachu", ["electric"], STATS)
+        b = Pokemon.of(25, "pikachu", ("electric",), Stats(35, 55, 40, 90))
+        self.assertIs(a, b)
+        self.assertIsNot(a, Pokemon.of(25, "pikachu", ["electric"], {**STATS, "speed": 91}))
+
+    def test_instances_are_immutable_and_slotted(self):
+        p = Pokemon.of(25, "pikachu", ["electric"], STATS)
+        with self.assertRaises(FrozenInstanceError):
+            p.name = "raichu"
+        with self.assertRaises(AttributeError):
+            p.stats.hp = 1
+        self.assertFalse(hasattr(p, "__dict__"))
+        self.assertFalse(hasattr(p.stats, "__dict__"))
+
+    def test_stats_read_like_the_dict_they_replaced(self):
+        stats = Stats.from_mapping(STATS)
+        self.assertEqual(stats["speed"], 90)
+        self.assertEqual(dict(stats), STATS)
+        self.assertEqual(stats, STATS)
+        with self.assertRaises(KeyError):
+            stats["special"]
+
+    def test_unpickled_values_compare_equal(self):
+        p = Pokemon.of(25, "pikachu", ["electric"], STATS)
+        self.assertEqual(pickle.loads(pickle.dumps(p)), p)
+
+    def test_unused_species_leave_the_intern_table(self):
+        Pokemon.of(999001, "missingno", ["normal"], STATS)
+        gc.collect()
+        self.assertNotIn((999001, "missingno", ("normal",), Stats.from_mapping(STATS)), _interned)
+
+
+class BattleSharesPokemonTests(TestCase):
+    def test_loaded_battles_share_species_instances(self):
+        User = get_user_model()
+        u1 = User.objects.create_user(username="u1", password="pass12345")
+        u2 = User.objects.create_user(username="u2", password="pass12345")
+        team = [Pokemon.of(1, "bulbasaur", ["grass"], {"hp": 45, "attack": 49, "defense": 49, "speed": 45})]
+        repo = BattleRepository()
+        first = repo.create_battle(u1.id, u2.id, team, team, 1, "", ["a", "b"], {})
+        second = repo.create_battle(u2.id, u1.id, team, team, 2, "", ["a", "b"], {})
+
+        a, b = repo.load_battle(first), repo.load_battle(second)
+        self.assertIs(a.p1_team[0], team[0])
+        self.assertIs(a.p2_pokemon, b.p1_pokemon)
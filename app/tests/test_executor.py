@@ -0,0 +1,62 @@
+import threading
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase
+from rest_framework.test import APIClient
+
+from app.adapters.cache import get_tiered_cache
+from app.adapters.executor import BoundedExecutor, ExecutorSaturated
+from app.adapters.pokeapi_client import PokeApiHttp
+
+
+class BoundedExecutorTests(SimpleTestCase):
+    def test_map_keeps_order_and_uses_the_calling_thread(self):
+        executor = BoundedExecutor(max_workers=2, max_queue=2)
+        threads: set[str] = set()
+
+        def square(x: int) -> int:
+            threads.add(threading.current_thread().name)
+            return x * x
+
+        self.assertEqual(executor.map(square, range(10), max_parallel=3), [x * x for x in range(10)])
+        self.assertIn(threading.current_thread().name, threads)
+        self.assertEqual(executor.stats()["submitted"], 2)
+
+    def test_rejects_work_beyond_workers_plus_queue(self):
+        executor = BoundedExecutor(max_workers=1, max_queue=1)
+        release = threading.Event()
+        futures = [executor.submit(release.wait) for _ in range(2)]
+
+        with self.assertRaises(ExecutorSaturated):
+            executor.submit(release.wait)
+        with self.assertRaises(ExecutorSaturated):
+            executor.map(str, range(4), max_parallel=2)
+        stats = executor.stats()
+        self.assertEqual((stats["running"], stats["queued"], stats["rejected"]), (1, 1, 2))
+
+        release.set()
+        for future in futures:
+            future.result(timeout=2)
+        self.assertEqual(executor.submit(len, "ok").result(timeout=2), 2)
+
+    def test_errors_propagate_and_free_their_slot(self):
+        executor = BoundedExecutor(max_workers=1, max_queue=0)
+        with self.assertRaises(ZeroDivisionError):
+            executor.submit(lambda: 1 / 0).result(timeout=2)
+        self.assertEqual(executor.submit(len, "ok").result(timeout=2), 2)
+        self.assertEqual(executor.stats()["failed"], 1)
+
+
+class BackPressureApiTests(TestCase):
+    def test_saturated_pool_is_reported_as_503(self):
+        get_tiered_cache().clear_local()
+        client = APIClient()
+        client.force_authenticate(get_user_model().objects.create_user(username="ash", password="pikachu123"))
+        with (
+            patch.object(PokeApiHttp, "list_pokemon_ids", autospec=True, return_value=[1, 2]),
+            patch.object(PokeApiHttp, "fetch_pokemons", autospec=True, side_effect=ExecutorSaturated()),
+        ):
+            resp = client.get("/catalog?limit=2&offset=0")
+        self.assertEqual(resp.status_code, 503)
+        self.assertEqual(resp["Retry-After"], "1")
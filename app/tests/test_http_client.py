@@ -0,0 +1,143 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+from django.core.cache.backends.locmem import LocMemCache
+from django.test import SimpleTestCase
+
+from app.adapters.cache import TieredCache
+from app.adapters.http_client import CircuitOpenError, PooledHttpClient
+from app.adapters.pokeapi_client import PokeApiHttp
+
+
+class _StubPokeApi:
+    """Tiny local HTTP server: answers with queued statuses (then 200) and counts requests."""
+
+    def __init__(self):
+        self.statuses: list[int] = []
+        self.hits = 0
+        self.ports: set[int] = set()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                stub.hits += 1
+                stub.ports.add(self.client_address[1])
+                status = stub.statuses.pop(0) if stub.statuses else 200
+                body = json.dumps(
+                    {
+                        "id": 25,
+                        "name": "pikachu",
+                        "stats": [
+                            {"base_stat": 35, "stat": {"name": "hp"}},
+                            {"base_stat": 55, "stat": {"name": "attack"}},
+                            {"base_stat": 40, "stat": {"name": "defense"}},
+                            {"base_stat": 90, "stat": {"name": "speed"}},
+                        ],
+                        "types": [{"type": {"name": "electric"}}],
+                    }
+                ).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                return
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class PooledHttpClientTests(SimpleTestCase):
+    def setUp(self):
+        self.stub = _StubPokeApi()
+        self.addCleanup(self.stub.close)
+        self.clock = _Clock()
+        self.client = PooledHttpClient(
+            retries=2, failure_threshold=2, reset_seconds=30, clock=self.clock, sleep=lambda _s: None
+        )
+        self.addCleanup(self.client.session.close)
+
+    def test_reuses_one_keep_alive_connection(self):
+        for _ in range(3):
+            self.assertEqual(self.client.get_json(f"{self.stub.url}/pokemon/25")["name"], "pikachu")
+        self.assertEqual(self.stub.hits, 3)
+        self.assertEqual(len(self.stub.ports), 1)
+
+    def test_retries_server_errors_but_not_client_errors(self):
+        self.stub.statuses = [503, 500]
+        self.assertEqual(self.client.get_json(f"{self.stub.url}/pokemon/25")["id"], 25)
+        self.assertEqual(self.stub.hits, 3)
+
+        self.stub.statuses = [404]
+        with self.assertRaises(requests.HTTPError):
+            self.client.get(f"{self.stub.url}/pokemon/9999")
+        self.assertEqual(self.stub.hits, 4)
+
+        host = self.stub.url.split("//")[1]
+        stats = self.client.stats()[host]
+        self.assertEqual((stats["requests"], stats["retries"], stats["circuit"]), (4, 2, "closed"))
+
+    def test_breaker_opens_fails_fast_and_recovers_after_probe(self):
+        self.stub.statuses = [500] * 6
+        for _ in range(2):
+            with self.assertRaises(requests.HTTPError):
+                self.client.get(f"{self.stub.url}/pokemon/25")
+        self.assertEqual(self.stub.hits, 6)
+
+        with self.assertRaises(CircuitOpenError):
+            self.client.get(f"{self.stub.url}/pokemon/25")
+        self.assertEqual(self.stub.hits, 6)
+
+        self.clock.now += 30
+        self.assertEqual(self.client.get_json(f"{self.stub.url}/pokemon/25")["id"], 25)
+        host = self.stub.url.split("//")[1]
+        self.assertEqual(self.client.stats()[host]["circuit"], "closed")
+        self.assertEqual(self.client.stats()[host]["short_circuits"], 1)
+
+
+class PokeApiHttpResilienceTests(SimpleTestCase):
+    def test_serves_stale_copy_while_circuit_is_open(self):
+        stub = _StubPokeApi()
+        self.addCleanup(stub.close)
+        clock = _Clock()
+        client = PooledHttpClient(retries=0, failure_threshold=1, clock=clock, sleep=lambda _s: None)
+        self.addCleanup(client.session.close)
+        backend = LocMemCache("resilience-tests", {})
+        backend.clear()
+        api = PokeApiHttp(http=client, base_url=stub.url, tiered=TieredCache(backend, clock=clock))
+
+        self.assertEqual(api.fetch_pokemon(25).name, "pikachu")
+        stub.close()
+        client.session.close()  # drop the kept-alive connection too
+        # Past both lifetimes, with the upstream gone.
+        clock.now += 2 * 3600
+        backend.clear()
+
+        # The outdated copy is served while the background refresh fails and trips the breaker.
+        self.assertEqual(api.fetch_pokemon(25).name, "pikachu")
+        breaker = client.breaker(stub.url.split("//")[1])
+        deadline = time.monotonic() + 2
+        while breaker.state != "open" and time.monotonic() < deadline:
+            time.sleep(0.01)
+        with self.assertRaises(CircuitOpenError):
+            api.fetch_pokemon(26)
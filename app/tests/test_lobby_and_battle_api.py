@@ -7,8 +7,9 @@ from django.utils import timezone
 from rest_framework.test import APIClient
 
 from app.adapters.repositories import BattleRepository
+from app.adapters.type_chart import get_type_chart_store
 from app.domain.entities import Pokemon
-from app.models import Battle, UserPokemon
+from app.models import Battle, NotificationOutbox, Species
 from app.application.use_cases import BATTLE_TTL_SECONDS
 
 
@@ -17,6 +18,7 @@ class LobbyAndBattleApiTests(TestCase):
         User = get_user_model()
         self.u1 = User.objects.create_user(username="u1", password="pass12345")
         self.u2 = User.objects.create_user(username="u2", password="pass12345")
+        self.u3 = User.objects.create_user(username="u3", password="pass12345")
 
         self.c1 = APIClient()
         self.c2 = APIClient()
@@ -26,25 +28,23 @@ class LobbyAndBattleApiTests(TestCase):
         self.c2.credentials(HTTP_AUTHORIZATION=f"Bearer {t2['access']}")
 
         for pid, spd in ((1, 100), (2, 10), (3, 10)):
-            UserPokemon.objects.create(
-                user=self.u1,
-                pokemon_id=pid,
+            Species.objects.create(
+                id=pid,
                 name=f"u1p{pid}",
                 stats={"hp": 30, "attack": 50, "defense": 10, "speed": spd},
                 types=["normal"],
             )
         for pid, spd in ((4, 10), (5, 10), (6, 10)):
-            UserPokemon.objects.create(
-                user=self.u2,
-                pokemon_id=pid,
+            Species.objects.create(
+                id=pid,
                 name=f"u2p{pid}",
                 stats={"hp": 30, "attack": 10, "defense": 10, "speed": spd},
                 types=["normal"],
             )
 
     @patch("app.adapters.notification_client.requests.post")
-    @patch("app.adapters.pokeapi_client.PokeApiHttp.fetch_type_chart", return_value={})
-    def test_fast_lobby_creates_battle_and_enforces_turn_order(self, _type_chart, _notify_post):
+    @patch("app.adapters.pokeapi_client.PokeApiHttp.fetch_type_chart")
+    def test_fast_lobby_creates_battle_and_enforces_turn_order(self, type_chart, _notify_post):
         team1 = [1, 2, 3]
         team2 = [4, 5, 6]
 
@@ -65,6 +65,13 @@ class LobbyAndBattleApiTests(TestCase):
         self.assertEqual(r2.status_code, 200)
         self.assertEqual(r2.json()["status"], "matched")
         battle_id = int(r2.json()["battle_id"])
+        type_chart.assert_not_called()
+        version, chart = get_type_chart_store().current()
+        self.assertEqual(Battle.objects.get(id=battle_id).result["type_chart_version"], version)
+        self.assertEqual(BattleRepository().load_battle(battle_id).type_chart, chart)
+        started = NotificationOutbox.objects.filter(event="battle_started").values_list("user_id", flat=True)
+        self.assertEqual(sorted(started), sorted([self.u1.id, self.u2.id]))
+        _notify_post.assert_not_called()
 
         not_your_turn = self.c2.post(
             f"/battle/{battle_id}/turn", {"type": "attack", "attack_type": "normal"}, format="json"
@@ -75,6 +82,15 @@ class LobbyAndBattleApiTests(TestCase):
         self.assertEqual(a1.status_code, 200)
         self.assertEqual(a1.json()["status"], "resolved")
         self.assertEqual(a1.json()["turn"]["actor"], "a")
+        resolved = NotificationOutbox.objects.filter(event="turn_resolved")
+        self.assertEqual(
+            sorted(resolved.filter(user_id__isnull=False).values_list("user_id", flat=True)),
+            sorted([self.u1.id, self.u2.id]),
+        )
+        self.assertEqual(list(resolved.filter(user_id__isnull=True).values_list("battle_id", flat=True)), [battle_id])
+        payload = resolved.first().payload
+        self.assertEqual((payload["battle_id"], payload["actor"], payload["next_actor"]), (battle_id, "a", "b"))
+        self.assertNotIn("state", payload)
 
         a_twice = self.c1.post(f"/battle/{battle_id}/turn", {"type": "attack", "attack_type": "normal"}, format="json")
         self.assertEqual(a_twice.status_code, 409)
@@ -84,9 +100,18 @@ class LobbyAndBattleApiTests(TestCase):
         self.assertEqual(b1.json()["status"], "resolved")
         self.assertEqual(b1.json()["turn"]["actor"], "b")
 
+        spectator = APIClient()
+        spectator.force_authenticate(self.u3)
+        watched = spectator.get(f"/battles/{battle_id}/spectate")
+        self.assertEqual(watched.status_code, 200)
+        self.assertEqual(watched.json()["players"]["a"]["username"], "u1")
+        self.assertEqual([t["actor"] for t in watched.json()["turns"]], ["a", "b"])
+        self.assertEqual(watched.json()["ws"], f"/ws/spectate?battle_id={battle_id}")
+        self.assertNotIn("replay", watched.json())
+        self.assertEqual(spectator.get("/battles/999999/spectate").status_code, 404)
+
     @patch("app.adapters.notification_client.requests.post")
-    @patch("app.adapters.pokeapi_client.PokeApiHttp.fetch_type_chart", return_value={})
-    def test_code_lobby_join_or_create_and_match(self, _type_chart, _notify_post):
+    def test_code_lobby_join_or_create_and_match(self, _notify_post):
         team1 = [1, 2, 3]
         team2 = [4, 5, 6]
 
@@ -117,7 +142,7 @@ class LobbyAndBattleApiTests(TestCase):
             p1_team=p1_team,
             p2_team=p2_team,
             seed=123,
-            type_chart={},
+            type_chart_version="",
             order=["a", "b"],
             initiative={"seed": 123, "winner": "a", "method": "speed", "a_speed": 10, "b_speed": 10},
         )
@@ -131,3 +156,13 @@ class LobbyAndBattleApiTests(TestCase):
         self.assertEqual(resp.json()["status"], "finished")
         self.assertTrue(resp.json()["outcome"]["draw"])
         self.assertEqual(resp.json()["outcome"]["reason"], "timeout")
+        ended = NotificationOutbox.objects.filter(event="battle_ended", user_id__isnull=False).values_list(
+            "user_id", "payload"
+        )
+        self.assertEqual(
+            sorted(ended),
+            [
+                (uid, {"battle_id": battle_id, "draw": True, "reason": "timeout"})
+                for uid in sorted([self.u1.id, self.u2.id])
+            ],
+        )
@@ -1,25 +1,105 @@
-from unittest.mock import Mock, patch
+from unittest.mock import Mock
 
+import redis
+import requests
 from django.test import SimpleTestCase, override_settings
 
-from app.adapters.notification_client import NotificationHttp
+from app.adapters.notification_client import MAX_BATCH, NotificationHttp
+from app.adapters.notification_outbox import notify_transport
+from app.adapters.notification_redis import NotificationRedis
+from app.ports.notification import Notification
 
 
 class NotificationHttpTests(SimpleTestCase):
     @override_settings(NOTIFICATION_SERVICE_URL="http://notify.test", NOTIFICATION_SERVICE_TOKEN="secret")
-    @patch("app.adapters.notification_client.requests.post")
-    def test_send_posts_with_bearer_token(self, post: Mock):
-        client = NotificationHttp()
+    def test_send_posts_with_bearer_token(self):
+        session = Mock()
+        client = NotificationHttp(session=session)
         client.send(10, "battle_started", {"battle_id": 123})
 
-        post.assert_called_once()
-        args, kwargs = post.call_args
+        session.post.assert_called_once()
+        args, kwargs = session.post.call_args
         self.assertEqual(args[0], "http://notify.test/notify")
         self.assertEqual(kwargs["headers"]["Authorization"], "Bearer secret")
         self.assertEqual(kwargs["json"]["user_id"], 10)
         self.assertEqual(kwargs["json"]["event"], "battle_started")
 
-    @patch("app.adapters.notification_client.requests.post", side_effect=Exception("boom"))
-    def test_send_swallows_errors(self, _post: Mock):
-        client = NotificationHttp(base_url="http://notify.test", token="secret")
+    def test_send_swallows_errors(self):
+        session = Mock()
+        session.post.side_effect = Exception("boom")
+        client = NotificationHttp(base_url="http://notify.test", token="secret", session=session)
         client.send(10, "battle_started", {"battle_id": 1})
+        client.send_many([Notification(10, "battle_started", {"battle_id": 1})])
+
+    def test_deliver_raises_on_error_status(self):
+        session = Mock()
+        session.post.return_value.raise_for_status.side_effect = requests.HTTPError("503 Server Error")
+        client = NotificationHttp(base_url="http://notify.test", token="secret", session=session)
+        with self.assertRaises(requests.HTTPError):
+            client.deliver(10, "battle_started", {"battle_id": 1})
+
+    def test_deliver_many_posts_one_batch_per_chunk(self):
+        session = Mock()
+        session.post.return_value.json.side_effect = [{"rejected": [1]}, {"rejected": []}]
+        client = NotificationHttp(base_url="http://notify.test", token="secret", session=session)
+        notifications = [Notification(i, "battle_ended", {"battle_id": 1}) for i in range(MAX_BATCH + 1)]
+
+        self.assertEqual(client.deliver_many(notifications), [1])
+        self.assertEqual(session.post.call_count, 2)
+        args, kwargs = session.post.call_args_list[0]
+        self.assertEqual(args[0], "http://notify.test/notify/batch")
+        self.assertEqual(len(kwargs["json"]), MAX_BATCH)
+        self.assertEqual(kwargs["json"][0], {"user_id": 0, "event": "battle_ended", "payload": {"battle_id": 1}})
+
+    def test_battle_topic_events_carry_battle_id_instead_of_user(self):
+        session = Mock()
+        session.post.return_value.json.return_value = {"rejected": []}
+        client = NotificationHttp(base_url="http://notify.test", token="secret", session=session)
+
+        client.deliver_many([Notification.for_battle(7, "turn_resolved", {"turn": 1})])
+        self.assertEqual(
+            session.post.call_args.kwargs["json"], [{"battle_id": 7, "event": "turn_resolved", "payload": {"turn": 1}}]
+        )
+
+    def test_uses_the_shared_keep_alive_session(self):
+        self.assertIs(NotificationHttp().session, NotificationHttp().session)
+
+
+class NotificationRedisTests(SimpleTestCase):
+    def test_deliver_many_publishes_per_user_channels_in_one_pipeline(self):
+        client = Mock()
+        notifier = NotificationRedis(client=client)
+
+        self.assertEqual(
+            notifier.deliver_many([Notification(3, "victory", {"battle_id": 1}), Notification(4, "defeat", {})]), []
+        )
+        pipe = client.pipeline.return_value
+        client.pipeline.assert_called_once_with(transaction=False)
+        self.assertEqual(
+            [c.args for c in pipe.publish.call_args_list],
+            [
+                ("pokus:notify:user:3", '{"event": "victory", "payload": {"battle_id": 1}}'),
+                ("pokus:notify:user:4", '{"event": "defeat", "payload": {}}'),
+            ],
+        )
+        pipe.execute.assert_called_once_with()
+
+    def test_battle_topic_events_go_to_the_battle_channel(self):
+        client = Mock()
+        NotificationRedis(client=client).deliver_many([Notification.for_battle(7, "turn_resolved", {"turn": 1})])
+        client.pipeline.return_value.publish.assert_called_once_with(
+            "pokus:notify:battle:7", '{"event": "turn_resolved", "payload": {"turn": 1}}'
+        )
+
+    def test_send_swallows_redis_errors(self):
+        client = Mock()
+        client.pipeline.return_value.execute.side_effect = redis.ConnectionError("down")
+        NotificationRedis(client=client).send(3, "victory", {})
+
+    def test_transport_follows_settings_and_falls_back_to_http(self):
+        with self.settings(NOTIFY_TRANSPORT="redis", REDIS_URL="redis://localhost:6379/0"):
+            self.assertIsInstance(notify_transport(), NotificationRedis)
+        with self.settings(NOTIFY_TRANSPORT="redis", REDIS_URL=None):
+            self.assertIsInstance(notify_transport(), NotificationHttp)
+        with self.settings(NOTIFY_TRANSPORT="http", REDIS_URL="redis://localhost:6379/0"):
+            self.assertIsInstance(notify_transport(), NotificationHttp)
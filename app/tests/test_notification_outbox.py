@@ -0,0 +1,157 @@
+from datetime import timedelta
+from unittest.mock import Mock, patch
+
+import redis
+import requests
+from django.db import transaction
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from app.adapters.notification_outbox import OutboxDispatcher, OutboxNotifier
+from app.models import NotificationOutbox
+from app.ports.notification import Notification
+
+
+class _Clock:
+    def __init__(self):
+        self.now = timezone.now()
+
+    def __call__(self):
+        return self.now
+
+
+@override_settings(NOTIFY_OUTBOX_DISPATCHER="off")
+class OutboxNotifierTests(TestCase):
+    def test_send_many_queues_one_row_per_notification(self):
+        OutboxNotifier().send_many([Notification(1, "victory", {"battle_id": 2}), Notification(3, "defeat", {})])
+        self.assertEqual(
+            list(NotificationOutbox.objects.order_by("id").values_list("user_id", "event")),
+            [(1, "victory"), (3, "defeat")],
+        )
+
+    def test_send_only_queues_a_row(self):
+        OutboxNotifier().send(7, "battle_started", {"battle_id": 1})
+        row = NotificationOutbox.objects.get()
+        self.assertEqual(
+            (row.user_id, row.event, row.payload, row.attempts), (7, "battle_started", {"battle_id": 1}, 0)
+        )
+
+    def test_rolled_back_change_drops_its_notifications(self):
+        with self.assertRaises(RuntimeError):
+            with transaction.atomic():
+                OutboxNotifier().send(7, "battle_ended", {"battle_id": 1})
+                raise RuntimeError("battle write failed")
+        self.assertFalse(NotificationOutbox.objects.exists())
+
+    @override_settings(NOTIFY_OUTBOX_DISPATCHER="thread")
+    @patch("app.adapters.notification_outbox.get_outbox_dispatcher")
+    def test_commit_wakes_the_dispatcher(self, get_dispatcher: Mock):
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            OutboxNotifier().send(7, "victory", {"battle_id": 1})
+        get_dispatcher.return_value.wake.assert_not_called()
+
+        for callback in callbacks:
+            callback()
+        get_dispatcher.return_value.wake.assert_called_once_with()
+
+
+class OutboxDispatcherTests(TestCase):
+    def setUp(self):
+        self.clock = _Clock()
+        self.transport = Mock()
+        self.transport.deliver_many.return_value = []
+
+    def _dispatcher(self, **kwargs) -> OutboxDispatcher:
+        return OutboxDispatcher(transport=self.transport, clock=self.clock, **{"max_attempts": 3, **kwargs})
+
+    def _queue(self, count: int) -> None:
+        for i in range(count):
+            NotificationOutbox.objects.create(
+                user_id=i, event="battle_ended", payload={"battle_id": i}, available_at=self.clock.now
+            )
+
+    def test_drain_delivers_in_batches_and_deletes_sent_rows(self):
+        self._queue(5)
+        dispatcher = self._dispatcher(batch_size=2)
+
+        self.assertEqual(dispatcher.drain_once(), 2)
+        dispatcher.drain()
+
+        self.assertEqual(self.transport.deliver_many.call_count, 3)
+        self.assertEqual(
+            self.transport.deliver_many.call_args_list[0].args[0],
+            [Notification(0, "battle_ended", {"battle_id": 0}), Notification(1, "battle_ended", {"battle_id": 1})],
+        )
+        self.assertFalse(NotificationOutbox.objects.exists())
+        self.assertEqual(dispatcher.stats()["sent"], 5)
+
+    def test_failures_back_off_and_give_up_after_max_attempts(self):
+        self._queue(1)
+        self.transport.deliver_many.side_effect = requests.ConnectionError("notify down")
+        dispatcher = self._dispatcher()
+
+        self.assertEqual(dispatcher.drain_once(), 1)
+        row = NotificationOutbox.objects.get()
+        self.assertEqual((row.attempts, row.last_error), (1, "notify down"))
+        self.assertEqual(row.available_at, self.clock.now + timedelta(seconds=2))
+        self.assertEqual(dispatcher.drain_once(), 0)
+
+        for _ in range(2):
+            self.clock.now += timedelta(minutes=5)
+            dispatcher.drain_once()
+        self.clock.now += timedelta(minutes=5)
+        self.assertEqual(dispatcher.drain_once(), 0)
+        self.assertEqual(NotificationOutbox.objects.get().attempts, 3)
+        self.assertEqual(
+            dispatcher.stats(), {"sent": 0, "retried": 2, "dead": 1, "errors": 0, "queued": 0, "dead_letters": 1}
+        )
+
+    def test_redis_transport_errors_are_retried_too(self):
+        self._queue(2)
+        self.transport.deliver_many.side_effect = redis.ConnectionError("redis down")
+
+        self.assertEqual(self._dispatcher().drain_once(), 2)
+        self.assertEqual(set(NotificationOutbox.objects.values_list("attempts", "last_error")), {(1, "redis down")})
+
+    def test_rows_the_service_rejects_are_not_retried(self):
+        self._queue(3)
+        self.transport.deliver_many.return_value = [1]
+        dispatcher = self._dispatcher()
+
+        self.assertEqual(dispatcher.drain_once(), 3)
+        row = NotificationOutbox.objects.get()
+        self.assertEqual((row.user_id, row.attempts, row.last_error), (1, 3, "Rejected by the notify service."))
+        self.assertEqual(
+            dispatcher.stats(), {"sent": 2, "retried": 0, "dead": 1, "errors": 0, "queued": 0, "dead_letters": 1}
+        )
+
+    def test_claimed_rows_are_leased_until_the_dispatcher_reports_back(self):
+        self._queue(1)
+        dispatcher = self._dispatcher()
+        claimed = dispatcher._claim()
+
+        self.assertEqual(len(claimed), 1)
+        self.assertEqual(dispatcher._claim(), [])
+        self.clock.now += timedelta(seconds=31)
+        self.assertEqual(len(dispatcher._claim()), 1)
+
+    def test_run_survives_an_unexpected_error(self):
+        self._queue(1)
+        dispatcher = self._dispatcher(poll_interval=0)
+        calls = []
+
+        def deliver(notifications):
+            calls.append(notifications)
+            if len(calls) == 1:
+                self.clock.now += timedelta(seconds=31)
+                raise KeyError("odd payload")
+            dispatcher.stop()
+            return []
+
+        self.transport.deliver_many.side_effect = deliver
+        # Inside TestCase's transaction this would close the test's connection.
+        with patch("app.adapters.notification_outbox.close_old_connections"):
+            with self.assertLogs("app.adapters.notification_outbox", level="ERROR"):
+                dispatcher.run()
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(dispatcher.stats()["errors"], 1)
@@ -1,19 +1,25 @@
+import time
 from unittest.mock import Mock, patch
 
+import requests
+from django.core.cache.backends.locmem import LocMemCache
 from django.test import SimpleTestCase, override_settings
 
+from app.adapters.cache import POKEMON, TieredCache
 from app.adapters.pokeapi_client import PokeApiHttp
+from app.domain.entities import Pokemon
 
 
 @override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
 class PokeApiHttpTests(SimpleTestCase):
     def _resp(self, payload: dict):
         resp = Mock()
+        resp.status_code = 200
         resp.raise_for_status = Mock()
         resp.json = Mock(return_value=payload)
         return resp
 
-    @patch("app.adapters.pokeapi_client.requests.get")
+    @patch("app.adapters.http_client.requests.Session.get")
     def test_search_pokemon_ids_matches_substring_and_uses_cached_index(self, get: Mock):
         get.return_value = self._resp(
             {
@@ -31,7 +37,7 @@ class PokeApiHttpTests(SimpleTestCase):
         self.assertEqual(api.search_pokemon_ids("saur", limit=50, offset=1), [2, 3])
         self.assertEqual(get.call_count, 1)
 
-    @patch("app.adapters.pokeapi_client.requests.get")
+    @patch("app.adapters.http_client.requests.Session.get")
     def test_list_pokemon_ids_parses_urls(self, get: Mock):
         get.return_value = self._resp(
             {
@@ -44,7 +50,7 @@ class PokeApiHttpTests(SimpleTestCase):
         api = PokeApiHttp()
         self.assertEqual(api.list_pokemon_ids(limit=20, offset=0), [25, 26])
 
-    @patch("app.adapters.pokeapi_client.requests.get")
+    @patch("app.adapters.http_client.requests.Session.get")
     def test_fetch_pokemon_by_name_parses_stats_types_and_caches(self, get: Mock):
         get.return_value = self._resp(
             {
@@ -63,12 +69,12 @@ class PokeApiHttpTests(SimpleTestCase):
         p = api.fetch_pokemon_by_name("pikachu")
         self.assertEqual(p.id, 25)
         self.assertEqual(p.name, "pikachu")
-        self.assertEqual(p.types, ["electric"])
+        self.assertEqual(p.types, ("electric",))
         self.assertEqual(p.stats["hp"], 35)
         self.assertEqual(api.fetch_pokemon_by_name("pikachu").id, 25)
         self.assertEqual(get.call_count, 1)
 
-    @patch("app.adapters.pokeapi_client.requests.get")
+    @patch("app.adapters.http_client.requests.Session.get")
     def test_fetch_type_chart_parses_damage_relations(self, get: Mock):
         get.return_value = self._resp(
             {
@@ -84,3 +90,88 @@ class PokeApiHttpTests(SimpleTestCase):
         self.assertEqual(chart["grass"], 2.0)
         self.assertEqual(chart["fire"], 0.5)
         self.assertEqual(chart["ghost"], 0.0)
+
+    def test_fetch_pokemons_reads_cache_in_one_batch_and_fetches_only_misses(self):
+        backend = LocMemCache("batch-tests", {})
+        backend.clear()
+        tiered = TieredCache(backend)
+        cached = Pokemon(
+            id=1, name="bulbasaur", types=["grass"], stats={"hp": 45, "attack": 49, "defense": 49, "speed": 45}
+        )
+        tiered.set(POKEMON, "poke:1", cached)
+        tiered.clear_local()
+
+        def get_json(url, timeout):
+            pid = int(url.rstrip("/").split("/")[-1])
+            return {
+                "id": pid,
+                "name": f"p{pid}",
+                "stats": [{"base_stat": 1, "stat": {"name": n}} for n in ("hp", "attack", "defense", "speed")],
+                "types": [{"type": {"name": "normal"}}],
+            }
+
+        http = Mock()
+        http.get_json.side_effect = get_json
+        api = PokeApiHttp(http=http, base_url="http://stub", tiered=tiered)
+
+        pokemons = api.fetch_pokemons([3, 1, 2])
+        self.assertEqual([p.name for p in pokemons], ["p3", "bulbasaur", "p2"])
+        self.assertEqual(
+            sorted(c.args[0] for c in http.get_json.call_args_list), ["http://stub/pokemon/2", "http://stub/pokemon/3"]
+        )
+        self.assertEqual(sorted(backend.get_many(["poke:2", "poke:3"])), ["poke:2", "poke:3"])
+
+    def _pokemon_payload(self, pokemon_id: int, name: str) -> dict:
+        return {
+            "id": pokemon_id,
+            "name": name,
+            "stats": [{"base_stat": 1, "stat": {"name": n}} for n in ("hp", "attack", "defense", "speed")],
+            "types": [{"type": {"name": "normal"}}],
+        }
+
+    def test_missing_pokemon_is_tombstoned(self):
+        backend = LocMemCache("tombstone-tests", {})
+        backend.clear()
+        not_found = requests.HTTPError(response=Mock(status_code=404))
+        http = Mock()
+        http.get_json.side_effect = not_found
+        api = PokeApiHttp(http=http, base_url="http://stub", tiered=TieredCache(backend))
+
+        for _ in range(2):
+            with self.assertRaisesMessage(ValueError, "Pokémon not found."):
+                api.fetch_pokemon(99999)
+        with self.assertRaisesMessage(ValueError, "Pokémon not found."):
+            api.fetch_pokemons([99999])
+        self.assertEqual(http.get_json.call_count, 1)
+
+        # Another worker reads the tombstone from the shared tier instead of asking upstream.
+        other = PokeApiHttp(http=http, base_url="http://stub", tiered=TieredCache(backend))
+        with self.assertRaises(ValueError):
+            other.fetch_pokemon(99999)
+        self.assertEqual(http.get_json.call_count, 1)
+
+    def test_soft_expired_pokemon_is_served_stale_and_refreshed_in_background(self):
+        backend = LocMemCache("swr-tests", {})
+        backend.clear()
+        now = [1000.0]
+
+        def clock() -> float:
+            return now[0]
+
+        http = Mock()
+        http.get_json.return_value = self._pokemon_payload(1, "bulbasaur")
+        PokeApiHttp(
+            http=http, base_url="http://stub", tiered=TieredCache(backend, clock=clock, wall_clock=clock)
+        ).fetch_pokemon(1)
+
+        now[0] += POKEMON.soft_timeout + 1
+        http.get_json.return_value = self._pokemon_payload(1, "bulbasaur-v2")
+        tiered = TieredCache(backend, clock=clock, wall_clock=clock)
+        api = PokeApiHttp(http=http, base_url="http://stub", tiered=tiered)
+        self.assertEqual(api.fetch_pokemon(1).name, "bulbasaur")
+
+        deadline = time.monotonic() + 5
+        while tiered.get(POKEMON, "poke:1") is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(api.fetch_pokemon(1).name, "bulbasaur-v2")
+        self.assertEqual(http.get_json.call_count, 2)
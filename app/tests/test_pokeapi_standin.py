@@ -0,0 +1,39 @@
+import requests
+from django.core.cache.backends.locmem import LocMemCache
+from django.test import SimpleTestCase, override_settings
+
+from app.adapters.cache import TieredCache
+from app.adapters.http_client import PooledHttpClient
+from app.adapters.pokeapi_client import PokeApiHttp
+from app.adapters.pokeapi_standin import PokeApiStandin
+
+
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+class PokeApiStandinTests(SimpleTestCase):
+    def _api(self, standin: PokeApiStandin) -> PokeApiHttp:
+        backend = LocMemCache("standin-tests", {})
+        backend.clear()
+        http = PooledHttpClient(retries=0, sleep=lambda _s: None)
+        self.addCleanup(http.session.close)
+        return PokeApiHttp(http=http, base_url=standin.url, tiered=TieredCache(backend))
+
+    def test_pokeapi_client_reads_the_bundled_dataset(self):
+        standin = PokeApiStandin().start()
+        self.addCleanup(standin.close)
+        api = self._api(standin)
+
+        pikachu = api.fetch_pokemon(25)
+        self.assertEqual((pikachu.name, pikachu.types, pikachu.stats["speed"]), ("pikachu", ("electric",), 90))
+        self.assertEqual(api.fetch_pokemon_by_name("Bulbasaur").id, 1)
+        self.assertEqual(api.list_pokemon_ids(limit=3, offset=3), [4, 5, 6])
+        self.assertEqual(api.fetch_type_chart("electric"), standin.type_chart["electric"])
+        with self.assertRaisesMessage(ValueError, "Pokémon not found."):
+            api.fetch_pokemon(9999)
+
+    def test_injected_errors_reach_the_client(self):
+        standin = PokeApiStandin(error_rate=1.0, seed=1).start()
+        self.addCleanup(standin.close)
+
+        with self.assertRaises(requests.RequestException):
+            self._api(standin).fetch_pokemon(25)
+        self.assertEqual(standin.stats(), {"requests": 1, "errors": 1})
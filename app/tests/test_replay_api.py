@@ -32,7 +32,7 @@ class ReplayApiTests(TestCase):
             p1_team=p1_team,
             p2_team=p2_team,
             seed=123,
-            type_chart={},
+            type_chart_version="",
             order=["a", "b"],
             initiative={"seed": 123, "winner": "a", "method": "speed", "a_speed": 10, "b_speed": 10},
         )
@@ -0,0 +1,46 @@
+from django.test import SimpleTestCase
+
+from app.adapters.search_index import NameSearchIndex
+
+_ENTRIES = [
+    (1, "bulbasaur"),
+    (2, "ivysaur"),
+    (3, "venusaur"),
+    (4, "charmander"),
+    (5, "charmeleon"),
+    (6, "charizard"),
+    (25, "pikachu"),
+    (26, "raichu"),
+    (122, "mr-mime"),
+    (151, "mew"),
+    (150, "mewtwo"),
+]
+
+
+class NameSearchIndexTests(SimpleTestCase):
+    def setUp(self):
+        self.index = NameSearchIndex(_ENTRIES)
+
+    def test_ranks_exact_before_prefix_before_substring(self):
+        self.assertEqual(self.index.search("mew"), [151, 150])
+        self.assertEqual(self.index.search("chu"), [25, 26])
+        self.assertEqual(self.index.search("char"), [4, 5, 6])
+
+    def test_substring_matches_are_ordered_by_id(self):
+        self.assertEqual(self.index.search("saur"), [1, 2, 3])
+        self.assertEqual(self.index.search("saur", limit=2, offset=1), [2, 3])
+
+    def test_tolerates_typos_after_direct_matches(self):
+        self.assertEqual(self.index.search("pikahcu"), [25])
+        self.assertEqual(self.index.search("charmender"), [4])
+        self.assertEqual(self.index.search("charmender", fuzzy=False), [])
+        self.assertEqual(self.index.search("bulbasuar")[:1], [1])
+
+    def test_short_queries_are_not_fuzzy(self):
+        self.assertEqual(self.index.search("mxw"), [])
+        self.assertEqual(self.index.search("mr"), [122])
+
+    def test_normalises_query_and_handles_empty_index(self):
+        self.assertEqual(self.index.search("  PIKACHU "), [25])
+        self.assertEqual(self.index.search(""), [])
+        self.assertEqual(NameSearchIndex([]).search("pika"), [])
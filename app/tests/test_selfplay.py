@@ -0,0 +1,61 @@
+import gzip
+import json
+import tempfile
+from pathlib import Path
+
+from django.test import SimpleTestCase
+
+from app.adapters import selfplay
+from app.domain.entities import Pokemon
+
+CHART = {"fire": {"grass": 2.0, "water": 0.5}, "water": {"fire": 2.0}, "grass": {"water": 2.0, "fire": 0.5}}
+SPECIES = [
+    Pokemon(id=i + 1, name=f"p{i}", types=types, stats={"hp": 60 + i, "attack": 50, "defense": 45, "speed": 40 + i})
+    for i, types in enumerate([["fire"], ["water"], ["grass"], ["water", "grass"], ["fire", "water"], ["grass"]])
+]
+
+
+class SelfPlayTests(SimpleTestCase):
+    def setUp(self):
+        selfplay._init_worker(SPECIES, CHART)
+        self.addCleanup(selfplay._init_worker, (), {})
+
+    def test_chunk_is_reproducible_and_counts_its_rows(self):
+        battles, rows, data = selfplay.play_chunk(7, 0, 20, team_size=2)
+        self.assertEqual(selfplay.play_chunk(7, 0, 20, team_size=2), (battles, rows, data))
+        self.assertNotEqual(selfplay.play_chunk(8, 0, 20, team_size=2)[2], data)
+
+        lines = [json.loads(line) for line in gzip.decompress(data).decode().splitlines()]
+        self.assertEqual(battles, 20)
+        self.assertEqual(len(lines), rows)
+        self.assertEqual({row["battle"] for row in lines}, set(range(20)))
+        for row in lines:
+            self.assertIn(row["winner"], ("a", "b"))
+            if row["action"] == "attack":
+                self.assertIn("dmg", row)
+
+    def test_epsilon_plays_non_attack_moves(self):
+        _, _, data = selfplay.play_chunk(3, 0, 20, team_size=3, epsilon=1.0)
+        actions = {json.loads(line)["action"] for line in gzip.decompress(data).decode().splitlines()}
+        self.assertTrue(actions - {"attack"})
+
+    def test_generate_writes_every_battle_in_order(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "out.ndjson.gz"
+            progress = []
+            with path.open("wb") as out:
+                played, rows = selfplay.generate(
+                    out, SPECIES, CHART, 1200, workers=1, seed=5, team_size=2, on_chunk=lambda b, r: progress.append(b)
+                )
+            read = list(selfplay.read_rows(path))
+
+        self.assertEqual(played, 1200)
+        self.assertEqual(len(read), rows)
+        self.assertEqual(progress, [500, 1000, 1200])
+        battles = [row["battle"] for row in read]
+        self.assertEqual(battles, sorted(battles))
+        self.assertEqual(set(battles), set(range(1200)))
+
+    def test_generate_needs_enough_species(self):
+        with self.assertRaises(ValueError):
+            selfplay.generate(None, SPECIES[:2], CHART, 10, team_size=3)
@@ -0,0 +1,101 @@
+import random
+
+from django.test import SimpleTestCase
+
+from app.application.use_cases import PlayTurnUC
+from app.domain.entities import BattleContext, BattleSeed, Pokemon
+from app.domain.lookahead import LookaheadBot
+from app.domain.simulation import BattleSim, SimState
+
+CHART = {"fire": {"grass": 2.0, "water": 0.5}, "water": {"fire": 2.0}, "grass": {"water": 2.0, "fire": 0.5}}
+
+
+def _team(*specs) -> list[Pokemon]:
+    return [
+        Pokemon(id=i + 1, name=f"p{i}", types=types, stats={"hp": hp, "attack": atk, "defense": 40, "speed": spd})
+        for i, (types, hp, atk, spd) in enumerate(specs)
+    ]
+
+
+class BattleSimTests(SimpleTestCase):
+    def setUp(self):
+        self.team_a = _team((["fire"], 60, 55, 70), (["water"], 70, 50, 45))
+        self.team_b = _team((["grass"], 65, 50, 60), (["water", "grass"], 60, 52, 35))
+        self.battle = BattleContext(
+            id=1,
+            status="active",
+            p1_id=1,
+            p2_id=2,
+            p1_team=self.team_a,
+            p2_team=self.team_b,
+            p1_pokemon=self.team_a[0],
+            p2_pokemon=self.team_b[0],
+            seed=BattleSeed(11),
+            type_chart=CHART,
+            pending_actions={"a": None, "b": None},
+            log=[],
+            state={},
+        )
+
+    def test_matches_play_turn_action_for_action(self):
+        uc = PlayTurnUC(None, None, None)
+        sim = BattleSim(self.team_a, self.team_b, CHART)
+        state = {"turn": 0, "phase": 0, "order": ["a", "b"], "next_actor": "a"}
+        sim_state = SimState.new(self.team_a, self.team_b, ["a", "b"])
+        script = [{"type": "buff"}, {"type": "defend"}, {"type": "switch", "to": 1}, {"type": "debuff"}]
+
+        for i in range(200):
+            role = state["next_actor"]
+            action = script[i] if i < len(script) else sim.best_attack(sim_state, role)
+            turn, state = uc.advance(self.battle, state, role, action)
+            sim.step(sim_state, action, random.Random(turn["rng_seed"]))
+
+            expected = SimState.from_state(self.team_a, self.team_b, state)
+            for side in ("a", "b"):
+                mine, theirs = sim_state.side(side), expected.side(side)
+                self.assertEqual(
+                    (mine.active, mine.hp, round(mine.atk_mod, 9), mine.atk_turns, mine.defend),
+                    (theirs.active, theirs.hp, round(theirs.atk_mod, 9), theirs.atk_turns, theirs.defend),
+                    f"action {i}",
+                )
+            self.assertEqual((sim_state.next_actor, sim_state.winner), (expected.next_actor, expected.winner))
+            if state.get("finished"):
+                break
+        self.assertTrue(sim_state.finished)
+
+    def test_clones_are_independent(self):
+        sim = BattleSim(self.team_a, self.team_b, CHART)
+        state = SimState.new(self.team_a, self.team_b, ["a", "b"])
+        branch = state.clone()
+        sim.playout(branch, random.Random(1))
+
+        self.assertTrue(branch.finished)
+        self.assertEqual(state.a.hp, [60, 70])
+        self.assertEqual(state.b.hp, [65, 60])
+        self.assertIsNone(state.winner)
+
+
+class LookaheadBotTests(SimpleTestCase):
+    def test_stays_within_the_time_budget(self):
+        ticks = iter(range(10_000))
+        bot = LookaheadBot(budget_ms=20, seed=1, clock=lambda: next(ticks) / 1000)
+        team_a, team_b = _team((["fire"], 60, 55, 70)), _team((["grass"], 65, 50, 60), (["water"], 60, 52, 35))
+        sim = BattleSim(team_a, team_b, CHART)
+        state = SimState.new(team_a, team_b, ["b", "a"])
+
+        action = bot.choose(sim, state)
+        self.assertIn(action, sim.legal_actions(state, "b"))
+        # One read to set the deadline and one per rollout after the first round; none after the deadline.
+        self.assertEqual(next(ticks), 21)
+        self.assertEqual(bot.rollouts, len(sim.legal_actions(state, "b")) + 19)
+
+    def test_takes_the_knockout_instead_of_setting_up(self):
+        # a moves first and finishes b's last Pokémon with almost any hit; b's next hit would finish a.
+        team_a = _team((["fire"], 50, 60, 50))
+        team_b = _team((["grass"], 30, 200, 40))
+        sim = BattleSim(team_a, team_b, CHART)
+        state = SimState.new(team_a, team_b, ["a", "b"])
+
+        self.assertEqual(
+            LookaheadBot(budget_ms=20, seed=3).choose(sim, state), {"type": "attack", "attack_type": "fire"}
+        )
@@ -0,0 +1,139 @@
+import threading
+import time
+from unittest.mock import Mock, patch
+
+from django.core.cache.backends.locmem import LocMemCache
+from django.test import SimpleTestCase
+
+from app.adapters.cache import POKEMON, TieredCache
+from app.adapters.pokeapi_client import PokeApiHttp, _flight
+from app.adapters.single_flight import SingleFlight
+
+_PIKACHU = {
+    "id": 25,
+    "name": "pikachu",
+    "stats": [
+        {"base_stat": 35, "stat": {"name": "hp"}},
+        {"base_stat": 55, "stat": {"name": "attack"}},
+        {"base_stat": 40, "stat": {"name": "defense"}},
+        {"base_stat": 90, "stat": {"name": "speed"}},
+    ],
+    "types": [{"type": {"name": "electric"}}],
+}
+
+
+def _backend(name: str) -> LocMemCache:
+    backend = LocMemCache(name, {})
+    backend.clear()
+    return backend
+
+
+class SingleFlightTests(SimpleTestCase):
+    def _run_concurrently(self, flight: SingleFlight, fn, n: int = 8) -> list:
+        results: list = []
+        barrier = threading.Barrier(n)
+
+        def call():
+            barrier.wait()
+            try:
+                results.append(flight.do("k", fn))
+            except Exception as exc:
+                results.append(exc)
+
+        threads = [threading.Thread(target=call) for _ in range(n)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        return results
+
+    def test_concurrent_callers_share_one_load(self):
+        calls = []
+
+        def load():
+            calls.append(1)
+            time.sleep(0.1)
+            return "value"
+
+        results = self._run_concurrently(SingleFlight(_backend("flight-a")), load)
+        self.assertEqual(results, ["value"] * 8)
+        self.assertEqual(len(calls), 1)
+
+    def test_failure_reaches_every_waiter(self):
+        def load():
+            time.sleep(0.1)
+            raise RuntimeError("upstream down")
+
+        results = self._run_concurrently(SingleFlight(_backend("flight-b")), load)
+        self.assertEqual(len(results), 8)
+        self.assertTrue(all(isinstance(r, RuntimeError) for r in results))
+
+    def test_waits_for_the_worker_holding_the_shared_lock(self):
+        backend = _backend("flight-c")
+        backend.add("flight:k", "other-worker", timeout=10)
+        threading.Timer(0.1, lambda: backend.set("k", "from-other-worker")).start()
+
+        load = Mock(return_value="ours")
+        value = SingleFlight(backend, poll_seconds=0.01).do("k", load, check=lambda: backend.get("k"))
+        self.assertEqual(value, "from-other-worker")
+        load.assert_not_called()
+
+    def test_loads_itself_when_lock_holder_gives_up(self):
+        backend = _backend("flight-d")
+        backend.add("flight:k", "other-worker", timeout=10)
+        threading.Timer(0.05, lambda: backend.delete("flight:k")).start()
+
+        value = SingleFlight(backend, poll_seconds=0.01).do("k", lambda: "ours", check=lambda: backend.get("k"))
+        self.assertEqual(value, "ours")
+
+
+class PokeApiBatchFlightTests(SimpleTestCase):
+    def test_batch_stores_each_species_before_releasing_its_lock(self):
+        flight_backend = _backend("batch-flight")
+        tiered = TieredCache(_backend("batch-l2"))
+        http = Mock()
+        http.get_json.return_value = _PIKACHU
+        api = PokeApiHttp(http=http, base_url="http://stub", tiered=tiered)
+        seen_at_release = []
+        delete = flight_backend.delete
+
+        def release(key, *args, **kwargs):
+            # What another worker polling check() would see the moment the lock goes away.
+            seen_at_release.append((key, tiered.get(POKEMON, "poke:25")))
+            return delete(key, *args, **kwargs)
+
+        with patch.object(_flight, "backend", flight_backend), patch.object(flight_backend, "delete", release):
+            self.assertEqual([p.name for p in api.fetch_pokemons([25])], ["pikachu"])
+
+        self.assertEqual(len(seen_at_release), 1)
+        self.assertEqual(seen_at_release[0][0], "flight:poke:25")
+        self.assertEqual(seen_at_release[0][1].name, "pikachu")
+
+
+class PokeApiStaleWhileRevalidateTests(SimpleTestCase):
+    def test_expired_entry_is_served_while_one_refresh_runs(self):
+        backend = _backend("swr")
+        now = [100.0]
+        tiered = TieredCache(backend, clock=lambda: now[0])
+        http = Mock()
+        http.get_json.return_value = _PIKACHU
+        api = PokeApiHttp(http=http, base_url="http://stub", tiered=tiered)
+        api.fetch_pokemon(25)
+
+        refreshed = threading.Event()
+
+        def slow_refresh(*_args, **_kwargs):
+            time.sleep(0.1)
+            refreshed.set()
+            return dict(_PIKACHU, name="pikachu-refreshed")
+
+        http.get_json.side_effect = slow_refresh
+        now[0] += 2 * 3600
+        backend.clear()
+
+        self.assertEqual([api.fetch_pokemon(25).name for _ in range(5)], ["pikachu"] * 5)
+        self.assertTrue(refreshed.wait(2))
+        while _flight.in_flight("poke:25"):
+            time.sleep(0.01)
+        self.assertEqual(api.fetch_pokemon(25).name, "pikachu-refreshed")
+        self.assertEqual(http.get_json.call_count, 2)
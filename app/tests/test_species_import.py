@@ -0,0 +1,79 @@
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from app.adapters.pokeapi_local import PokeApiLocal
+from app.models import Species, TypeEffectiveness, UserPokemon
+
+
+class ImportSpeciesCommandTests(TestCase):
+    def test_imports_bundled_dataset_and_serves_it_offline(self):
+        out = StringIO()
+        call_command("import_species", stdout=out)
+        self.assertIn("Imported 151 species", out.getvalue())
+
+        api = PokeApiLocal()
+        pikachu = api.fetch_pokemon(25)
+        self.assertEqual(pikachu.name, "pikachu")
+        self.assertEqual(pikachu.types, ("electric",))
+        self.assertEqual(pikachu.stats["speed"], 90)
+        self.assertEqual(api.fetch_pokemon_by_name("Bulbasaur").id, 1)
+        self.assertEqual(api.search_pokemon_ids("saur"), [1, 2, 3])
+        self.assertEqual(api.list_pokemon_ids(limit=3, offset=3), [4, 5, 6])
+        self.assertEqual(api.fetch_type_chart("electric")["ground"], 0.0)
+        with self.assertRaises(ValueError):
+            api.fetch_pokemon(9999)
+
+    def test_reimport_is_idempotent(self):
+        call_command("import_species", stdout=StringIO())
+        call_command("import_species", stdout=StringIO())
+        self.assertEqual(Species.objects.count(), 151)
+        self.assertEqual(TypeEffectiveness.objects.filter(attack_type="fire", defender_type="grass").count(), 1)
+
+    def test_imports_csv_species_and_type_matrix(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            species_csv = Path(tmp) / "species.csv"
+            species_csv.write_text("id,name,types,hp,attack,defense,speed\n25,pikachu,electric,35,55,40,90\n")
+            types_csv = Path(tmp) / "types.csv"
+            types_csv.write_text("attack_type,defender_type,multiplier\nelectric,water,2\n")
+            call_command("import_species", str(species_csv), types=str(types_csv), stdout=StringIO())
+
+        self.assertEqual(Species.objects.get(id=25).stats["attack"], 55)
+        self.assertEqual(PokeApiLocal().fetch_type_chart("electric"), {"water": 2.0})
+
+    def test_renamed_species_owned_by_a_user_does_not_abort_the_import(self):
+        user = get_user_model().objects.create_user(username="ash", password="pikachu123")
+        owned = Species.objects.create(id=9000, name="pikachu", stats={"hp": 1}, types=["electric"])
+        gone = Species.objects.create(id=9001, name="raichu", stats={"hp": 1}, types=["electric"])
+        UserPokemon.objects.create(user=user, pokemon=owned)
+
+        call_command("import_species", stdout=StringIO())
+
+        self.assertEqual(Species.objects.get(name="pikachu").id, 25)
+        self.assertEqual(Species.objects.get(id=owned.id).name, "pikachu#9000")
+        self.assertTrue(UserPokemon.objects.filter(user=user, pokemon_id=owned.id).exists())
+        self.assertFalse(Species.objects.filter(id=gone.id).exists())
+        self.assertEqual(Species.objects.count(), 152)
+
+
+@override_settings(POKEAPI_SOURCE="local")
+class LocalCatalogApiTests(TestCase):
+    def setUp(self):
+        call_command("import_species", stdout=StringIO())
+        self.user = get_user_model().objects.create_user(username="ash", password="pikachu123")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_catalog_page_is_served_from_local_store(self):
+        resp = self.client.get("/catalog?limit=3&offset=0")
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual([p["name"] for p in resp.json()], ["bulbasaur", "ivysaur", "venusaur"])
+
+    def test_unknown_pokemon_is_404(self):
+        resp = self.client.get("/catalog/9999")
+        self.assertEqual(resp.status_code, 404)
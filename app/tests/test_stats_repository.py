@@ -2,7 +2,7 @@ from django.contrib.auth import get_user_model
 from django.test import TestCase
 
 from app.adapters.repositories import StatisticsRepository
-from app.models import Battle, UserPokemon
+from app.models import Battle, Species, UserPokemon
 
 
 class StatisticsRepositoryTests(TestCase):
@@ -12,13 +12,13 @@ class StatisticsRepositoryTests(TestCase):
         self.u2 = User.objects.create_user(username="u2", password="pass12345")
 
         for pid in (1, 2, 3, 4):
-            UserPokemon.objects.create(
-                user=self.u1,
-                pokemon_id=pid,
+            Species.objects.create(
+                id=pid,
                 name=f"p{pid}",
                 stats={"hp": 10, "attack": 10, "defense": 10, "speed": 10},
                 types=["normal"],
             )
+            UserPokemon.objects.create(user=self.u1, pokemon_id=pid)
 
     def test_top_pokemons_counts_whole_team_not_only_lead(self):
         Battle.objects.create(
@@ -0,0 +1,105 @@
+from django.contrib.auth import get_user_model
+from django.core.cache.backends.locmem import LocMemCache
+from django.test import SimpleTestCase, TestCase
+from rest_framework.test import APIClient
+
+from app.adapters.cache import TOMBSTONE, CacheFamily, TieredCache
+from app.adapters.event_bus import EventBusLocal
+
+_FAMILY = CacheFamily("test", timeout=60, local_timeout=10, max_entries=2, clone=dict)
+_SWR_FAMILY = CacheFamily("swr", timeout=600, local_timeout=600, clone=dict, soft_timeout=60, negative_timeout=5)
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TieredCacheTests(SimpleTestCase):
+    def setUp(self):
+        self.backend = LocMemCache("tiered-tests", {})
+        self.backend.clear()
+        self.clock = _Clock()
+        self.tiered = TieredCache(self.backend, EventBusLocal(), clock=self.clock, wall_clock=self.clock)
+
+    def test_second_read_is_served_from_process_memory(self):
+        self.tiered.set(_FAMILY, "test:1", {"a": 1})
+        self.backend.clear()
+
+        value = self.tiered.get(_FAMILY, "test:1")
+        self.assertEqual(value, {"a": 1})
+        value["a"] = 2
+        self.assertEqual(self.tiered.get(_FAMILY, "test:1"), {"a": 1})
+        self.assertEqual(self.tiered.stats()["test"]["l1_hits"], 2)
+
+    def test_falls_back_to_shared_tier_and_counts_misses(self):
+        self.backend.set("test:1", {"a": 1})
+        self.assertEqual(self.tiered.get_many(_FAMILY, ["test:1", "test:2"]), {"test:1": {"a": 1}})
+        self.assertEqual(self.tiered.get(_FAMILY, "test:1"), {"a": 1})
+
+        counters = self.tiered.stats()["test"]
+        self.assertEqual((counters["l1_hits"], counters["l2_hits"], counters["misses"]), (1, 1, 1))
+
+    def test_local_tier_is_bounded_lru_with_ttl(self):
+        self.tiered.set_many(_FAMILY, {"test:1": {}, "test:2": {}})
+        self.tiered.get(_FAMILY, "test:1")
+        self.tiered.set(_FAMILY, "test:3", {})
+        self.backend.clear()
+
+        self.assertEqual(set(self.tiered.get_many(_FAMILY, ["test:1", "test:2", "test:3"])), {"test:1", "test:3"})
+        self.assertEqual(self.tiered.stats()["test"]["evictions"], 1)
+
+        self.clock.now += 11
+        self.assertIsNone(self.tiered.get(_FAMILY, "test:1"))
+
+    def test_invalidate_retires_entries_in_every_process(self):
+        other = TieredCache(self.backend, EventBusLocal(), version_check_seconds=5, clock=self.clock)
+        self.tiered.set(_FAMILY, "test:1", {"a": 1})
+        self.assertEqual(other.get(_FAMILY, "test:1"), {"a": 1})
+
+        self.tiered.invalidate(_FAMILY)
+        self.assertIsNone(self.tiered.get(_FAMILY, "test:1"))
+
+        # The other worker keeps its copy until it notices the version bump.
+        self.assertEqual(other.get(_FAMILY, "test:1"), {"a": 1})
+        self.clock.now += 5
+        self.assertIsNone(other.get(_FAMILY, "test:1"))
+
+    def test_entries_past_soft_deadline_are_only_served_stale(self):
+        other = TieredCache(self.backend, EventBusLocal(), clock=self.clock, wall_clock=self.clock)
+        self.tiered.set(_SWR_FAMILY, "swr:1", {"a": 1})
+        self.assertEqual(other.get(_SWR_FAMILY, "swr:1"), {"a": 1})
+
+        self.clock.now += 61
+        fresh = TieredCache(self.backend, EventBusLocal(), clock=self.clock, wall_clock=self.clock)
+        for tiered in (self.tiered, other, fresh):
+            self.assertIsNone(tiered.get(_SWR_FAMILY, "swr:1"))
+            self.assertEqual(tiered.get_stale(_SWR_FAMILY, "swr:1"), {"a": 1})
+        self.assertEqual(fresh.stats()["swr"]["misses"], 1)
+
+    def test_tombstones_survive_the_shared_tier_and_expire_quickly(self):
+        self.tiered.set_missing(_SWR_FAMILY, ["swr:404"])
+        other = TieredCache(self.backend, EventBusLocal(), clock=self.clock, wall_clock=self.clock)
+        self.assertIs(other.get(_SWR_FAMILY, "swr:404"), TOMBSTONE)
+        self.assertIs(other.get(_SWR_FAMILY, "swr:404"), TOMBSTONE)
+        self.assertEqual(other.stats()["swr"]["negative_hits"], 2)
+
+        self.clock.now += 6
+        self.backend.clear()  # LocMemCache expires on real time; the shared copy was written with a 5 s timeout.
+        self.assertIsNone(other.get(_SWR_FAMILY, "swr:404"))
+        self.assertIsNone(other.get_stale(_SWR_FAMILY, "swr:404"))
+
+
+class MetricsApiTests(TestCase):
+    def test_metrics_are_admin_only(self):
+        client = APIClient()
+        client.force_authenticate(get_user_model().objects.create_user(username="ash", password="pikachu123"))
+        self.assertEqual(client.get("/metrics").status_code, 403)
+
+        client.force_authenticate(get_user_model().objects.create_superuser(username="oak", password="pallet123"))
+        resp = client.get("/metrics")
+        self.assertEqual(resp.status_code, 200)
+        self.assertIn("cache", resp.json())
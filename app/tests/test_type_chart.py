@@ -0,0 +1,102 @@
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from app.adapters.repositories import BattleRepository
+from app.adapters.type_chart import TypeChartStore, chart_version, get_type_chart_store, write_type_chart
+from app.domain.entities import Pokemon
+from app.models import Battle
+
+
+class TypeChartStoreTests(TestCase):
+    def test_bundled_chart_covers_every_type(self):
+        version, chart = get_type_chart_store().current()
+        self.assertEqual(version, chart_version(chart))
+        self.assertEqual(len(chart), 18)
+        self.assertEqual(chart["electric"]["ground"], 0.0)
+
+    def test_rebuild_keeps_earlier_versions(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "type_chart.json"
+            v1, created = write_type_chart(path, {"fire": {"grass": 2.0}})
+            self.assertTrue(created)
+            self.assertEqual(write_type_chart(path, {"fire": {"grass": 2.0}}), (v1, False))
+            v2, _ = write_type_chart(path, {"fire": {"grass": 2.0, "water": 0.5}})
+
+            store = TypeChartStore(path)
+            self.assertNotEqual(v1, v2)
+            self.assertEqual(store.current()[0], v2)
+            self.assertEqual(store.get(v1), {"fire": {"grass": 2.0}})
+            self.assertIsNone(store.get("unknown"))
+
+    def test_versions_built_after_loading_are_read_from_the_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "type_chart.json"
+            write_type_chart(path, {"fire": {"grass": 2.0}})
+            store = TypeChartStore(path)
+            v2, _ = write_type_chart(path, {"fire": {"grass": 2.0, "water": 0.5}})
+
+            self.assertEqual(store.get(v2), {"fire": {"grass": 2.0, "water": 0.5}})
+
+    def test_missing_file_fails_only_when_a_chart_is_needed(self):
+        store = TypeChartStore("/nonexistent/type_chart.json")
+        self.assertIsNone(store.get("abc"))
+        with self.assertRaises(RuntimeError):
+            store.current()
+
+    def test_build_command_writes_and_reloads_chart(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            dataset = Path(tmp) / "dump.json"
+            dataset.write_text(json.dumps({"species": [], "type_chart": {"Water": {"Fire": 2}}}))
+            output = Path(tmp) / "type_chart.json"
+            with override_settings(TYPE_CHART_PATH=output):
+                out = StringIO()
+                call_command("build_type_chart", str(dataset), output=str(output), stdout=out)
+                version, chart = get_type_chart_store().current()
+
+        self.assertIn(f"Type chart {version} built (1 attack types)", out.getvalue())
+        self.assertEqual(chart, {"water": {"fire": 2.0}})
+
+
+class BattleTypeChartTests(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.u1 = User.objects.create_user(username="u1", password="pass12345")
+        self.u2 = User.objects.create_user(username="u2", password="pass12345")
+        self.team = [
+            Pokemon(id=1, name="bulbasaur", types=["grass"], stats={"hp": 45, "attack": 49, "defense": 49, "speed": 45})
+        ]
+
+    def test_battle_stores_only_the_version(self):
+        version, chart = get_type_chart_store().current()
+        repo = BattleRepository()
+        battle_id = repo.create_battle(
+            self.u1.id, self.u2.id, self.team, self.team, 1, version, ["a", "b"], {"winner": "a"}
+        )
+
+        result = Battle.objects.get(id=battle_id).result
+        self.assertNotIn("type_chart", result)
+        self.assertEqual(result["type_chart_version"], version)
+        self.assertIs(repo.load_battle(battle_id).type_chart, chart)
+
+    def test_unversioned_battles_keep_their_inline_chart(self):
+        repo = BattleRepository()
+        battle_id = repo.create_battle(self.u1.id, self.u2.id, self.team, self.team, 1, "", ["a", "b"], {})
+        battle = Battle.objects.get(id=battle_id)
+        battle.result.pop("type_chart_version")
+        battle.result["type_chart"] = {"grass": {"water": 2.0}}
+        battle.save(update_fields=["result"])
+
+        self.assertEqual(repo.load_battle(battle_id).type_chart, {"grass": {"water": 2.0}})
+
+    def test_unknown_version_fails_instead_of_using_an_empty_chart(self):
+        repo = BattleRepository()
+        battle_id = repo.create_battle(self.u1.id, self.u2.id, self.team, self.team, 1, "0123456789ab", ["a", "b"], {})
+
+        with self.assertRaisesMessage(RuntimeError, "Unknown type chart version '0123456789ab'"):
+            repo.load_battle(battle_id)
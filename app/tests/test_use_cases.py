@@ -1,25 +1,54 @@
+import time
+from unittest.mock import Mock, patch
+
 from django.test import SimpleTestCase
 
-from app.application.use_cases import CodeLobbyUC, PlayTurnUC, RegisterUserUC, SearchPokemonUC, SetTeamUC, BotAutoPlayUC
+from app.application.use_cases import (
+    BATTLE_TTL_SECONDS,
+    BotAutoPlayUC,
+    CodeLobbyUC,
+    ExpireBattleUC,
+    PlayTurnUC,
+    RegisterUserUC,
+    SearchPokemonUC,
+    SetTeamUC,
+    StartPveBattleUC,
+)
 from app.domain.entities import BattleContext, BattleSeed, Pokemon
+from app.interfaces.workers.bot_teams import BotTeamPool
+from app.ports.notification import Notification
 
 
 class _FakeCatalog:
     def __init__(self):
+        self.species: dict[int, Pokemon] = {}
         self.items: dict[int, Pokemon] = {}
         self.active: int | None = None
         self.active_team: list[int] = []
 
+    def get_species(self, pokemon_ids: list[int]):
+        return {pid: self.species[pid] for pid in pokemon_ids if pid in self.species}
+
+    def save_species(self, pokemons: list[Pokemon]) -> None:
+        for pokemon in pokemons:
+            self.species.setdefault(int(pokemon.id), pokemon)
+
     def list_user_pokemon(self, _user_id: int):
         return list(self.items.values())
 
     def get_user_pokemon(self, _user_id: int, pokemon_id: int):
         return self.items.get(int(pokemon_id))
 
+    def get_user_pokemons(self, _user_id: int, pokemon_ids: list[int]):
+        return {int(pid): self.items[int(pid)] for pid in pokemon_ids if int(pid) in self.items}
+
     def upsert_user_pokemon(self, _user_id: int, pokemon: Pokemon):
         self.items[int(pokemon.id)] = pokemon
         return pokemon
 
+    def upsert_user_pokemons(self, user_id: int, pokemons: list[Pokemon]):
+        return [self.upsert_user_pokemon(user_id, pokemon) for pokemon in pokemons]
+
     def set_active(self, _user_id: int, pokemon_id: int) -> None:
         self.active = int(pokemon_id)
 
@@ -40,6 +69,9 @@ class _FakePokeApi:
             id=pid, name=f"p{pid}", types=["normal"], stats={"hp": 10, "attack": 10, "defense": 10, "speed": 10}
         )
 
+    def fetch_pokemons(self, pokemon_ids: list[int]) -> list[Pokemon]:
+        return [self.fetch_pokemon(pid) for pid in pokemon_ids]
+
     def list_pokemon_ids(self, limit: int = 20, offset: int = 0) -> list[int]:
         return list(range(int(offset) + 1, int(offset) + 1 + int(limit)))
 
@@ -63,6 +95,41 @@ class _FakeUsers:
         self.next_id += 1
         return uid, username
 
+    def get_or_create_bot_user_id(self) -> int:
+        return 99
+
+
+class _FakeBattles:
+    def __init__(self):
+        self.finished: dict[int, dict] = {}
+        self.created: list[tuple] = []
+
+    def list_events(self, _battle_id: int) -> list:
+        return []
+
+    def finish(self, battle_id: int, result: dict) -> None:
+        self.finished[battle_id] = result
+
+    def create_battle(self, p1, p2, p1_team, p2_team, seed, type_chart_version, order, initiative) -> int:
+        self.created.append((p1, p2, p1_team, p2_team))
+        return len(self.created)
+
+
+class _FakeCharts:
+    def current(self):
+        return "v1", {}
+
+
+class _FakeNotifier:
+    def __init__(self):
+        self.calls: list[list[Notification]] = []
+
+    def send(self, user_id: int, event: str, payload: dict) -> None:
+        self.calls.append([Notification(user_id, event, payload)])
+
+    def send_many(self, notifications: list[Notification]) -> None:
+        self.calls.append(list(notifications))
+
 
 class UseCaseUnitTests(SimpleTestCase):
     def test_set_team_sets_active_team_and_active_pokemon(self):
@@ -87,6 +154,14 @@ class UseCaseUnitTests(SimpleTestCase):
         results = uc.execute(user_id=1, query="25")
         self.assertEqual([p.id for p in results], [25])
 
+    def test_search_stores_species_without_claiming_ownership(self):
+        catalog = _FakeCatalog()
+        uc = SearchPokemonUC(catalog, _FakePokeApi())
+        results = uc.execute(user_id=1, query="saur")
+        self.assertEqual([p.id for p in results], [1, 2, 3])
+        self.assertEqual(sorted(catalog.species), [1, 2, 3])
+        self.assertEqual(catalog.items, {})
+
     def test_code_lobby_normalizes_code(self):
         self.assertEqual(CodeLobbyUC._normalize_code("7"), "0007")
         self.assertEqual(CodeLobbyUC._normalize_code(7), "0007")
@@ -125,3 +200,84 @@ class UseCaseUnitTests(SimpleTestCase):
         uc = PlayTurnUC(repo=None, notifier=None, stats=None)
         with self.assertRaises(ValueError):
             uc._normalize_action(battle, "a", {"type": "attack", "attack_type": "water"}, p)
+
+    def test_expired_battle_notifies_players_and_spectators_in_one_call(self):
+        p = Pokemon(id=1, name="p", types=["fire"], stats={"hp": 10, "attack": 10, "defense": 10, "speed": 10})
+        battle = BattleContext(
+            id=5,
+            status="active",
+            p1_id=1,
+            p2_id=2,
+            p1_team=[p],
+            p2_team=[p],
+            p1_pokemon=p,
+            p2_pokemon=p,
+            seed=BattleSeed(1),
+            type_chart={},
+            pending_actions={"a": None, "b": None},
+            log=[],
+            state={},
+            created_at=int(time.time()) - BATTLE_TTL_SECONDS - 1,
+        )
+        repo, notifier = _FakeBattles(), _FakeNotifier()
+
+        self.assertTrue(ExpireBattleUC(repo, notifier).expire_if_needed(battle))
+        payload = {"battle_id": 5, "draw": True, "reason": "timeout"}
+        self.assertEqual(
+            notifier.calls,
+            [
+                [
+                    Notification(1, "battle_ended", payload),
+                    Notification(2, "battle_ended", payload),
+                    Notification.for_battle(5, "battle_ended", payload),
+                ]
+            ],
+        )
+        self.assertEqual(repo.finished[5]["outcome"], {"draw": True, "reason": "timeout"})
+
+
+class StartPveWithPoolTests(SimpleTestCase):
+    def setUp(self):
+        self.catalog = _FakeCatalog()
+        self.catalog.save_species(_FakePokeApi().fetch_pokemons([1, 2, 3]))
+        self.catalog.set_active_team(7, [1, 2, 3])
+        self.battles = _FakeBattles()
+        self.api = Mock(wraps=_FakePokeApi())
+
+    def _uc(self, pool: BotTeamPool) -> StartPveBattleUC:
+        return StartPveBattleUC(
+            self.catalog, self.battles, _FakeNotifier(), self.api, _FakeUsers(), _FakeCharts(), teams=pool
+        )
+
+    def test_ready_team_is_used_without_touching_pokeapi(self):
+        pool = BotTeamPool(size=2, seed=5, pokeapi=_FakePokeApi)
+        with patch.object(pool, "wake"):
+            pool.refill()
+            result = self._uc(pool).execute(user_id=7)
+
+        self.assertEqual(result["battle_id"], 1)
+        self.assertEqual(self.api.mock_calls, [])
+        bot_team = self.battles.created[0][2]
+        self.assertEqual(len(bot_team), 3)
+        self.assertFalse({p.id for p in bot_team} & {1, 2, 3})
+
+    def test_cold_pool_falls_back_to_fetching_a_team(self):
+        pool = BotTeamPool(size=2, pokeapi=_FakePokeApi)
+        with patch.object(pool, "wake"):
+            self._uc(pool).execute(user_id=7)
+
+        self.api.fetch_pokemons.assert_called_once()
+        self.assertFalse({p.id for p in self.battles.created[0][2]} & {1, 2, 3})
+
+    def test_prefetched_team_leaves_pokeapi_out_of_execute(self):
+        pool = BotTeamPool(size=0, pokeapi=_FakePokeApi)
+        self.catalog.species.clear()
+        uc = self._uc(pool)
+        bot_team = uc.prefetch(7, [1, 2, 3])
+        self.api.reset_mock()
+
+        uc.execute(7, [1, 2, 3], bot_team=bot_team)
+
+        self.assertEqual(self.api.mock_calls, [])
+        self.assertIs(self.battles.created[0][2], bot_team)
+        self.assertEqual(sorted(self.catalog.species), [1, 2, 3])
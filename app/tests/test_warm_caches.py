@@ -0,0 +1,47 @@
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import SimpleTestCase, override_settings
+
+from app.adapters.cache import POKEMON, TYPE_CHART, get_tiered_cache
+from app.adapters.pokeapi_standin import PokeApiStandin
+
+
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+class WarmCachesCommandTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        get_tiered_cache().clear_local()
+        self.standin = PokeApiStandin().start()
+        self.addCleanup(self.standin.close)
+
+    def test_fills_species_type_charts_and_pages_then_is_idempotent(self):
+        with override_settings(POKEAPI_BASE_URL=self.standin.url):
+            out = StringIO()
+            call_command("warm_caches", limit=30, concurrency=4, batch=10, stdout=out)
+            first_run = self.standin.stats()["requests"]
+
+            output = out.getvalue()
+            self.assertIn("species: 30 total, 0 already cached, 30 fetched, 0 failed", output)
+            self.assertIn("species: 10/30 (", output)
+            self.assertIn("catalog pages: 2 total", output)
+            # 1 index + 30 species + the types of the first 30 species + 2 pages.
+            self.assertGreater(first_run, 33)
+
+            tiered = get_tiered_cache()
+            tiered.clear_local()
+            self.assertEqual(tiered.get(POKEMON, "poke:25").name, "pikachu")
+            self.assertEqual(tiered.get(TYPE_CHART, "typechart:electric")["ground"], 0.0)
+
+            out = StringIO()
+            call_command("warm_caches", limit=30, stdout=out)
+            self.assertIn("species: 30 total, 30 already cached, 0 fetched", out.getvalue())
+            self.assertEqual(self.standin.stats()["requests"], first_run)
+
+    @override_settings(POKEAPI_SOURCE="local")
+    def test_local_source_has_nothing_to_warm(self):
+        out = StringIO()
+        call_command("warm_caches", stdout=out)
+        self.assertIn("nothing to warm", out.getvalue())
+        self.assertEqual(self.standin.stats()["requests"], 0)
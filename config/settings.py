@@ -107,13 +107,39 @@ SIMPLE_JWT = {
 
 NOTIFICATION_SERVICE_URL = os.environ.get("NOTIFY_URL", "http://notify:8081")
 NOTIFICATION_SERVICE_TOKEN = os.environ.get("NOTIFY_TOKEN", "notify-secret")
+# Notifications go through the NotificationOutbox table. "thread" drains it from a background thread in every web
+# process; "off" leaves that to a separate `manage.py dispatch_notifications` worker.
+NOTIFY_OUTBOX_DISPATCHER = os.environ.get("NOTIFY_OUTBOX_DISPATCHER", "thread").lower()
+NOTIFY_OUTBOX_BATCH = int(os.environ.get("NOTIFY_OUTBOX_BATCH", "100"))
+NOTIFY_OUTBOX_MAX_ATTEMPTS = int(os.environ.get("NOTIFY_OUTBOX_MAX_ATTEMPTS", "8"))
+# "thread": each web process plays bot moves in a background thread; "off": run `manage.py play_bot_turns` instead.
+BOT_WORKER = os.environ.get("BOT_WORKER", "thread").lower()
+# "heuristic": best type multiplier; "lookahead": Monte Carlo rollouts within BOT_MOVE_BUDGET_MS per move.
+BOT_STRATEGY = os.environ.get("BOT_STRATEGY", "heuristic").lower()
+BOT_MOVE_BUDGET_MS = float(os.environ.get("BOT_MOVE_BUDGET_MS", "20"))
+# Bot teams kept ready per web process for PvE starts; 0 resolves the bot team inline on every start.
+BOT_TEAM_POOL_SIZE = int(os.environ.get("BOT_TEAM_POOL_SIZE", "32"))
+# "redis" PUBLISHes to per-user channels every notify replica subscribes to (needs REDIS_URL); "http" posts to
+# NOTIFY_URL and is what is used whenever Redis is not configured.
+NOTIFY_TRANSPORT = os.environ.get("NOTIFY_TRANSPORT", "http").lower()
 REDIS_URL = os.environ.get("REDIS_URL")
+# "http" fetches species from pokeapi.co; "local" serves the tables filled by `manage.py import_species`.
+POKEAPI_SOURCE = os.environ.get("POKEAPI_SOURCE", "http").lower()
+# Point at `manage.py pokeapi_standin` for offline load tests.
+POKEAPI_BASE_URL = os.environ.get("POKEAPI_BASE_URL", "https://pokeapi.co/api/v2")
+# Shared outbound I/O pool per process; beyond workers + queue, fan-out requests are shed with 503.
+IO_EXECUTOR_WORKERS = int(os.environ.get("IO_EXECUTOR_WORKERS", "16"))
+IO_EXECUTOR_QUEUE = int(os.environ.get("IO_EXECUTOR_QUEUE", "64"))
+# Versioned type chart written by `manage.py build_type_chart` and loaded once per process.
+TYPE_CHART_PATH = Path(os.environ.get("TYPE_CHART_PATH", BASE_DIR / "app" / "data" / "type_chart.json"))
 
 if REDIS_URL:
     CACHES = {
         "default": {
             "BACKEND": "django.core.cache.backends.redis.RedisCache",
             "LOCATION": REDIS_URL,
+            # Struct-packed Pokémon/index/type-chart records instead of pickles (`app/adapters/cache_codec.py`).
+            "OPTIONS": {"serializer": "app.adapters.cache_codec.CompactRedisSerializer"},
         }
     }
 else:
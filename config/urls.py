@@ -27,11 +27,16 @@ urlpatterns = [
     path("lobby", api.enter_lobby, name="lobby"),
     path("lobby/code", api.code_lobby, name="lobby_code"),
     path("lobby/code/close", api.close_code_lobby, name="lobby_code_close"),
+    path("lobby/wait", api.lobby_wait, name="lobby_wait"),
     path("battle/start", api.start_battle, name="battle_start"),
     path("battle/pve", api.battle_pve, name="battle_pve"),
     path("battle/<int:battle_id>/turn", api.play_turn, name="battle_turn"),
     path("battles", api.history, name="history"),
     path("battles/<int:battle_id>", api.battle_detail, name="battle_detail"),
     path("battles/<int:battle_id>/replay", api.replay, name="replay"),
+    path("battles/<int:battle_id>/events", api.battle_events, name="battle_events"),
+    path("battles/<int:battle_id>/spectate", api.battle_spectate, name="battle_spectate"),
+    path("battles/<int:battle_id>/autoresolve", api.battle_autoresolve, name="battle_autoresolve"),
     path("stats/me", api.stats, name="stats"),
+    path("metrics", api.metrics, name="metrics"),
 ]
@@ -3,3 +3,18 @@ from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
 application = get_wsgi_application()
+
+# Only server processes load this module. Background workers start with them rather than on first use, so work left
+# queued by a restart or by a process that died is picked up by the first poll.
+from django.conf import settings  # noqa: E402
+
+from app.adapters.notification_outbox import get_outbox_dispatcher  # noqa: E402
+from app.interfaces.workers.bot_teams import get_bot_team_pool  # noqa: E402
+from app.interfaces.workers.bot_turns import get_bot_worker  # noqa: E402
+
+if settings.NOTIFY_OUTBOX_DISPATCHER == "thread":
+    get_outbox_dispatcher().wake()
+if settings.BOT_WORKER == "thread":
+    get_bot_worker().wake()
+if get_bot_team_pool().size > 0:
+    get_bot_team_pool().wake()
@@ -14,4 +14,10 @@ done
 
 python manage.py collectstatic --noinput
 
-exec gunicorn config.wsgi:application -b 0.0.0.0:8000
+if [ "${WARM_CACHES_ON_START:-0}" = "1" ]; then
+  # Best effort: a slow or unreachable PokeAPI must not keep the web workers from starting.
+  python manage.py warm_caches --verbosity 0 ${WARM_CACHES_ARGS:-} || echo "Cache warm-up failed; starting anyway."
+fi
+
+exec gunicorn config.wsgi:application -b 0.0.0.0:8000 \
+  --worker-class gthread --workers "${GUNICORN_WORKERS:-2}" --threads "${GUNICORN_THREADS:-16}"
@@ -87,7 +87,8 @@ export function NotificationsProvider({ children }: { children: React.ReactNode
         else if (msg.event === 'battle_ended') toast('Battle ended', { description: `Battle #${msg.payload?.battle_id}` })
         else if (msg.event === 'victory') toast('Victory', { description: `Battle #${msg.payload?.battle_id}` })
         else if (msg.event === 'defeat') toast('Defeat', { description: `Battle #${msg.payload?.battle_id}` })
-        else toast(msg.event)
+        // turn_resolved drives BattlePage refreshes; the page shows its own "Your turn" toast.
+        else if (msg.event !== 'turn_resolved') toast(msg.event)
       } catch {
         return
       }
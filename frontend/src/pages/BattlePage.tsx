@@ -3,6 +3,7 @@ import { Link, useParams } from 'react-router-dom'
 import { toast } from 'sonner'
 
 import { useAuth } from '@/app/auth'
+import { useNotifications } from '@/app/notifications'
 import type { BattleListItem, BattleOutcome, BattleTurnRecord, Pokemon, ReplayResponse, TurnSubmitResponse } from '@/app/types'
 import { PokemonImage } from '@/components/pokemon/PokemonImage'
 import { Badge } from '@/components/ui/badge'
@@ -337,6 +338,7 @@ export function BattlePage() {
   const { battleId } = useParams()
   const id = Number(battleId)
   const { apiFetch } = useAuth()
+  const { connected, last } = useNotifications()
 
   const session = useMemo(() => (Number.isFinite(id) ? loadBattleSession(id) : null), [id])
   const storedRole = session?.role ?? null
@@ -500,7 +502,8 @@ export function BattlePage() {
 
     let alive = true
     let inFlight = false
-    const pollMs = 1000
+    // With the WebSocket up, turn_resolved pushes drive refreshes and polling is only a safety net.
+    const pollMs = connected ? 10000 : 1000
 
     const interval = window.setInterval(() => {
       if (!alive || inFlight) return
@@ -527,7 +530,13 @@ export function BattlePage() {
       alive = false
       window.clearInterval(interval)
     }
-  }, [battle, id, refreshBattle, refreshReplay, role, state.finished, state.nextActor, turns.length])
+  }, [battle, connected, id, refreshBattle, refreshReplay, role, state.finished, state.nextActor, turns.length])
+
+  useEffect(() => {
+    if (!Number.isFinite(id)) return
+    if (last?.event !== 'turn_resolved' || Number(last.payload.battle_id) !== id) return
+    refresh().catch(() => undefined)
+  }, [id, last, refresh])
 
   const actionDisabled =
     submitting ||
@@ -10,26 +10,55 @@ import (
 	"strings"
 )
 
+// maxBatchEvents caps one POST /notify/batch; the Django client (MAX_BATCH) splits larger batches.
+const maxBatchEvents = 500
+
+// NotifyRequest targets one user, or with BattleID set, everyone spectating that battle.
 type NotifyRequest struct {
-	UserID  int                    `json:"user_id"`
-	Event   string                 `json:"event"`
-	Payload map[string]interface{} `json:"payload"`
+	UserID   int                    `json:"user_id"`
+	BattleID int                    `json:"battle_id"`
+	Event    string                 `json:"event"`
+	Payload  map[string]interface{} `json:"payload"`
 }
 
-func HttpNotify(hub *Hub, c *gin.Context) {
+func authorized(c *gin.Context) bool {
 	expectedToken := os.Getenv("NOTIFY_TOKEN")
 	if expectedToken == "" {
 		c.JSON(http.StatusInternalServerError, gin.H{"error": "NOTIFY_TOKEN is not configured"})
-		return
+		return false
 	}
 	auth := c.GetHeader("Authorization")
 	if !strings.HasPrefix(auth, "Bearer ") {
 		c.JSON(http.StatusUnauthorized, gin.H{"error": "unauthorized"})
-		return
+		return false
 	}
 	token := strings.TrimPrefix(auth, "Bearer ")
 	if subtle.ConstantTimeCompare([]byte(token), []byte(expectedToken)) != 1 {
 		c.JSON(http.StatusUnauthorized, gin.H{"error": "unauthorized"})
+		return false
+	}
+	return true
+}
+
+func supportedEvent(event string) bool {
+	switch event {
+	case "battle_started", "battle_ended", "victory", "defeat", "turn_resolved":
+		return true
+	}
+	return false
+}
+
+func publish(hub *Hub, req NotifyRequest) {
+	body, _ := json.Marshal(gin.H{"event": req.Event, "payload": req.Payload})
+	if req.BattleID > 0 {
+		hub.broadcast <- Message{Topic: battleTopic(req.BattleID), Payload: body}
+		return
+	}
+	hub.broadcast <- Message{UserID: fmt.Sprint(req.UserID), Payload: body}
+}
+
+func HttpNotify(hub *Hub, c *gin.Context) {
+	if !authorized(c) {
 		return
 	}
 
@@ -38,13 +67,37 @@ func HttpNotify(hub *Hub, c *gin.Context) {
 		c.JSON(http.StatusBadRequest, gin.H{"error": err.Error()})
 		return
 	}
-	switch req.Event {
-	case "battle_started", "battle_ended", "victory", "defeat":
-	default:
+	if !supportedEvent(req.Event) {
 		c.JSON(http.StatusBadRequest, gin.H{"error": "unsupported event"})
 		return
 	}
-	body, _ := json.Marshal(gin.H{"event": req.Event, "payload": req.Payload})
-	hub.broadcast <- Message{UserID: fmt.Sprint(req.UserID), Payload: body}
+	publish(hub, req)
 	c.JSON(http.StatusOK, gin.H{"status": "sent"})
 }
+
+// HttpNotifyBatch accepts a JSON array of events. Events with an unsupported type are skipped and their indexes
+// returned in "rejected", so one bad event does not make the sender retry the whole batch.
+func HttpNotifyBatch(hub *Hub, c *gin.Context) {
+	if !authorized(c) {
+		return
+	}
+
+	var reqs []NotifyRequest
+	if err := c.BindJSON(&reqs); err != nil {
+		c.JSON(http.StatusBadRequest, gin.H{"error": err.Error()})
+		return
+	}
+	if len(reqs) == 0 || len(reqs) > maxBatchEvents {
+		c.JSON(http.StatusBadRequest, gin.H{"error": fmt.Sprintf("batch must hold 1..%d events", maxBatchEvents)})
+		return
+	}
+	rejected := []int{}
+	for i, req := range reqs {
+		if !supportedEvent(req.Event) {
+			rejected = append(rejected, i)
+			continue
+		}
+		publish(hub, req)
+	}
+	c.JSON(http.StatusOK, gin.H{"status": "sent", "sent": len(reqs) - len(rejected), "rejected": rejected})
+}
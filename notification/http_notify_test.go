@@ -83,3 +83,145 @@ func TestHttpNotify_BroadcastsToConnectedClient(t *testing.T) {
 		t.Fatal("timed out waiting for ws message")
 	}
 }
+
+func TestHttpNotifyBatch_BroadcastsValidEventsAndReportsRejected(t *testing.T) {
+	t.Setenv("NOTIFY_TOKEN", "secret")
+	gin.SetMode(gin.TestMode)
+
+	hub := NewHub()
+	go hub.Run()
+
+	client := &Client{hub: hub, conn: nil, send: make(chan []byte, 4), userID: "1"}
+	hub.register <- client
+
+	r := gin.New()
+	r.POST("/notify/batch", func(c *gin.Context) { HttpNotifyBatch(hub, c) })
+
+	w := httptest.NewRecorder()
+	req := httptest.NewRequest("POST", "/notify/batch", bytes.NewBufferString(`[
+		{"user_id":1,"event":"battle_ended","payload":{"battle_id":7}},
+		{"user_id":1,"event":"nope","payload":{}},
+		{"user_id":1,"event":"victory","payload":{"battle_id":7}}
+	]`))
+	req.Header.Set("Authorization", "Bearer secret")
+	req.Header.Set("Content-Type", "application/json")
+	r.ServeHTTP(w, req)
+
+	if w.Code != http.StatusOK {
+		t.Fatalf("expected %d, got %d (%s)", http.StatusOK, w.Code, w.Body.String())
+	}
+	var resp struct {
+		Sent     int   `json:"sent"`
+		Rejected []int `json:"rejected"`
+	}
+	if err := json.Unmarshal(w.Body.Bytes(), &resp); err != nil {
+		t.Fatalf("invalid json response: %v", err)
+	}
+	if resp.Sent != 2 || len(resp.Rejected) != 1 || resp.Rejected[0] != 1 {
+		t.Fatalf("unexpected response %s", w.Body.String())
+	}
+
+	for _, want := range []string{"battle_ended", "victory"} {
+		select {
+		case msg := <-client.send:
+			var body map[string]interface{}
+			if err := json.Unmarshal(msg, &body); err != nil {
+				t.Fatalf("invalid json message: %v", err)
+			}
+			if body["event"] != want {
+				t.Fatalf("expected event %s, got %v", want, body["event"])
+			}
+		case <-time.After(1 * time.Second):
+			t.Fatal("timed out waiting for ws message")
+		}
+	}
+}
+
+func TestHttpNotifyBatch_RejectsEmptyBatch(t *testing.T) {
+	t.Setenv("NOTIFY_TOKEN", "secret")
+	gin.SetMode(gin.TestMode)
+	hub := NewHub()
+
+	r := gin.New()
+	r.POST("/notify/batch", func(c *gin.Context) { HttpNotifyBatch(hub, c) })
+
+	w := httptest.NewRecorder()
+	req := httptest.NewRequest("POST", "/notify/batch", bytes.NewBufferString(`[]`))
+	req.Header.Set("Authorization", "Bearer secret")
+	req.Header.Set("Content-Type", "application/json")
+	r.ServeHTTP(w, req)
+
+	if w.Code != http.StatusBadRequest {
+		t.Fatalf("expected %d, got %d", http.StatusBadRequest, w.Code)
+	}
+}
+
+func TestHttpNotify_AcceptsTurnResolved(t *testing.T) {
+	t.Setenv("NOTIFY_TOKEN", "secret")
+	gin.SetMode(gin.TestMode)
+
+	hub := NewHub()
+	go hub.Run()
+
+	client := &Client{hub: hub, conn: nil, send: make(chan []byte, 1), userID: "2"}
+	hub.register <- client
+
+	r := gin.New()
+	r.POST("/notify", func(c *gin.Context) { HttpNotify(hub, c) })
+
+	w := httptest.NewRecorder()
+	req := httptest.NewRequest("POST", "/notify", bytes.NewBufferString(`{"user_id":2,"event":"turn_resolved","payload":{"battle_id":5,"turn":1,"actor":"a","next_actor":"b"}}`))
+	req.Header.Set("Authorization", "Bearer secret")
+	req.Header.Set("Content-Type", "application/json")
+	r.ServeHTTP(w, req)
+
+	if w.Code != http.StatusOK {
+		t.Fatalf("expected %d, got %d (%s)", http.StatusOK, w.Code, w.Body.String())
+	}
+	select {
+	case msg := <-client.send:
+		var body struct {
+			Event   string                 `json:"event"`
+			Payload map[string]interface{} `json:"payload"`
+		}
+		if err := json.Unmarshal(msg, &body); err != nil {
+			t.Fatalf("invalid json message: %v", err)
+		}
+		if body.Event != "turn_resolved" || body.Payload["next_actor"] != "b" {
+			t.Fatalf("unexpected message %s", msg)
+		}
+	case <-time.After(1 * time.Second):
+		t.Fatal("timed out waiting for ws message")
+	}
+}
+
+func TestHttpNotifyBatch_PublishesBattleEventsToSpectators(t *testing.T) {
+	t.Setenv("NOTIFY_TOKEN", "secret")
+	gin.SetMode(gin.TestMode)
+
+	hub := NewHub()
+	go hub.Run()
+	spectator := &Client{hub: hub, send: make(chan []byte, 1), topic: battleTopic(5)}
+	hub.subscribe <- spectator
+
+	r := gin.New()
+	r.POST("/notify/batch", func(c *gin.Context) { HttpNotifyBatch(hub, c) })
+
+	w := httptest.NewRecorder()
+	req := httptest.NewRequest("POST", "/notify/batch", bytes.NewBufferString(`[{"battle_id":5,"event":"turn_resolved","payload":{"turn":1}}]`))
+	req.Header.Set("Authorization", "Bearer secret")
+	req.Header.Set("Content-Type", "application/json")
+	r.ServeHTTP(w, req)
+
+	if w.Code != http.StatusOK {
+		t.Fatalf("expected %d, got %d", http.StatusOK, w.Code)
+	}
+	select {
+	case msg := <-spectator.send:
+		if string(msg) != `{"event":"turn_resolved","payload":{"turn":1}}` {
+			t.Fatalf("unexpected message %s", msg)
+		}
+	case <-time.After(time.Second):
+		t.Fatal("timed out waiting for spectator message")
+	}
+}
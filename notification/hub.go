@@ -1,26 +1,49 @@
 package main
 
+import (
+	"fmt"
+	"sync/atomic"
+)
+
+// Message goes either to one user's socket (UserID) or to every subscriber of a topic (Topic), never both.
 type Message struct {
 	UserID  string
+	Topic   string
 	Payload []byte
 }
 
 type Hub struct {
-	register   chan *Client
-	unregister chan *Client
-	broadcast  chan Message
-	clients    map[string]*Client
+	register    chan *Client
+	unregister  chan *Client
+	subscribe   chan *Client
+	unsubscribe chan *Client
+	broadcast   chan Message
+	clients     map[string]*Client
+	topics      map[string]map[*Client]struct{}
+	spectators  atomic.Int64
 }
 
 func NewHub() *Hub {
 	return &Hub{
-		register:   make(chan *Client),
-		unregister: make(chan *Client),
-		broadcast:  make(chan Message),
-		clients:    map[string]*Client{},
+		register:    make(chan *Client),
+		unregister:  make(chan *Client),
+		subscribe:   make(chan *Client),
+		unsubscribe: make(chan *Client),
+		broadcast:   make(chan Message),
+		clients:     map[string]*Client{},
+		topics:      map[string]map[*Client]struct{}{},
 	}
 }
 
+func battleTopic(battleID int) string {
+	return fmt.Sprintf("battle:%d", battleID)
+}
+
+// Spectators is the number of sockets currently subscribed to any topic.
+func (h *Hub) Spectators() int64 {
+	return h.spectators.Load()
+}
+
 func (h *Hub) Run() {
 	for {
 		select {
@@ -29,10 +52,50 @@ func (h *Hub) Run() {
 		case c := <-h.unregister:
 			delete(h.clients, c.userID)
 			close(c.send)
+		case c := <-h.subscribe:
+			subs, ok := h.topics[c.topic]
+			if !ok {
+				subs = map[*Client]struct{}{}
+				h.topics[c.topic] = subs
+			}
+			subs[c] = struct{}{}
+			h.spectators.Add(1)
+		case c := <-h.unsubscribe:
+			h.dropSubscriber(c)
 		case msg := <-h.broadcast:
-			if client, ok := h.clients[msg.UserID]; ok {
+			if msg.Topic != "" {
+				h.fanOut(msg)
+			} else if client, ok := h.clients[msg.UserID]; ok {
 				client.send <- msg.Payload
 			}
 		}
 	}
 }
+
+// fanOut never blocks on a subscriber: one whose buffer is full is disconnected, so a slow viewer cannot delay the
+// rest of the topic or the players' own notifications.
+func (h *Hub) fanOut(msg Message) {
+	for c := range h.topics[msg.Topic] {
+		select {
+		case c.send <- msg.Payload:
+		default:
+			h.dropSubscriber(c)
+		}
+	}
+}
+
+func (h *Hub) dropSubscriber(c *Client) {
+	subs, ok := h.topics[c.topic]
+	if !ok {
+		return
+	}
+	if _, ok := subs[c]; !ok {
+		return
+	}
+	delete(subs, c)
+	if len(subs) == 0 {
+		delete(h.topics, c.topic)
+	}
+	close(c.send)
+	h.spectators.Add(-1)
+}
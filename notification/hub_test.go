@@ -23,3 +23,59 @@ func TestHub_UnregisterRemovesClientAndClosesChannel(t *testing.T) {
 		t.Fatal("timed out waiting for channel close")
 	}
 }
+
+func TestHub_FansOutTopicMessagesToEverySubscriber(t *testing.T) {
+	hub := NewHub()
+	go hub.Run()
+
+	player := &Client{hub: hub, send: make(chan []byte, 1), userID: "1"}
+	hub.register <- player
+	spectators := []*Client{
+		{hub: hub, send: make(chan []byte, 1), topic: battleTopic(7)},
+		{hub: hub, send: make(chan []byte, 1), topic: battleTopic(7)},
+	}
+	other := &Client{hub: hub, send: make(chan []byte, 1), topic: battleTopic(8)}
+	for _, c := range append(spectators, other) {
+		hub.subscribe <- c
+	}
+
+	hub.broadcast <- Message{Topic: battleTopic(7), Payload: []byte("turn")}
+	for _, c := range spectators {
+		select {
+		case msg := <-c.send:
+			if string(msg) != "turn" {
+				t.Fatalf("unexpected message %s", msg)
+			}
+		case <-time.After(time.Second):
+			t.Fatal("timed out waiting for topic message")
+		}
+	}
+	if len(other.send) != 0 || len(player.send) != 0 {
+		t.Fatal("topic message leaked outside its topic")
+	}
+	if got := hub.Spectators(); got != 3 {
+		t.Fatalf("expected 3 spectators, got %d", got)
+	}
+}
+
+func TestHub_DropsSpectatorsThatFallBehind(t *testing.T) {
+	hub := NewHub()
+	go hub.Run()
+
+	slow := &Client{hub: hub, send: make(chan []byte, 1), topic: battleTopic(7)}
+	hub.subscribe <- slow
+	hub.broadcast <- Message{Topic: battleTopic(7), Payload: []byte("1")}
+	hub.broadcast <- Message{Topic: battleTopic(7), Payload: []byte("2")}
+	// The socket's read pump still unsubscribes afterwards; that must not close the channel twice.
+	hub.unsubscribe <- slow
+
+	if msg := <-slow.send; string(msg) != "1" {
+		t.Fatalf("unexpected message %s", msg)
+	}
+	if _, ok := <-slow.send; ok {
+		t.Fatal("expected the slow spectator's channel to be closed")
+	}
+	if got := hub.Spectators(); got != 0 {
+		t.Fatalf("expected no spectators, got %d", got)
+	}
+}
@@ -0,0 +1,169 @@
+package main
+
+import (
+	"bufio"
+	"encoding/json"
+	"errors"
+	"fmt"
+	"io"
+	"log"
+	"net"
+	"net/url"
+	"strconv"
+	"strings"
+	"time"
+)
+
+// userChannelPrefix and battleChannelPrefix match USER_CHANNEL_PREFIX and BATTLE_CHANNEL_PREFIX in
+// app/adapters/notification_redis.py.
+const (
+	userChannelPrefix   = "pokus:notify:user:"
+	battleChannelPrefix = "pokus:notify:battle:"
+)
+
+// SubscribeRedis forwards the events Django publishes on per-user and per-battle Redis channels to the hub,
+// reconnecting with backoff for as long as the process runs. Every replica subscribes and delivers to the WebSockets
+// it holds, so replicas can sit behind a plain load balancer.
+func SubscribeRedis(hub *Hub, redisURL string) {
+	backoff := time.Second
+	for {
+		started := time.Now()
+		err := subscribeOnce(hub, redisURL)
+		if time.Since(started) > time.Minute {
+			backoff = time.Second
+		}
+		log.Printf("redis subscription lost: %v; reconnecting in %s", err, backoff)
+		time.Sleep(backoff)
+		if backoff < 30*time.Second {
+			backoff *= 2
+		}
+	}
+}
+
+func subscribeOnce(hub *Hub, redisURL string) error {
+	u, err := url.Parse(redisURL)
+	if err != nil {
+		return err
+	}
+	addr := u.Host
+	if u.Port() == "" {
+		addr = net.JoinHostPort(u.Hostname(), "6379")
+	}
+	conn, err := net.DialTimeout("tcp", addr, 5*time.Second)
+	if err != nil {
+		return err
+	}
+	defer conn.Close()
+	r := bufio.NewReader(conn)
+
+	if password, ok := u.User.Password(); ok {
+		args := []string{"AUTH", password}
+		if name := u.User.Username(); name != "" {
+			args = []string{"AUTH", name, password}
+		}
+		if err := writeCommand(conn, args...); err != nil {
+			return err
+		}
+		if _, err := readReply(r); err != nil {
+			return err
+		}
+	}
+	if err := writeCommand(conn, "PSUBSCRIBE", userChannelPrefix+"*", battleChannelPrefix+"*"); err != nil {
+		return err
+	}
+	for {
+		reply, err := readReply(r)
+		if err != nil {
+			return err
+		}
+		items, ok := reply.([]interface{})
+		if !ok || len(items) != 4 || items[0] != "pmessage" {
+			continue
+		}
+		channel, _ := items[2].(string)
+		data, _ := items[3].(string)
+		forwardRedisMessage(hub, channel, []byte(data))
+	}
+}
+
+// forwardRedisMessage hands one published {"event", "payload"} document to the hub as is.
+func forwardRedisMessage(hub *Hub, channel string, data []byte) bool {
+	target, ok := redisTarget(channel)
+	if !ok {
+		return false
+	}
+	var msg struct {
+		Event string `json:"event"`
+	}
+	if err := json.Unmarshal(data, &msg); err != nil || !supportedEvent(msg.Event) {
+		return false
+	}
+	target.Payload = data
+	hub.broadcast <- target
+	return true
+}
+
+func redisTarget(channel string) (Message, bool) {
+	if userID := strings.TrimPrefix(channel, userChannelPrefix); userID != channel && userID != "" {
+		return Message{UserID: userID}, true
+	}
+	if id, err := strconv.Atoi(strings.TrimPrefix(channel, battleChannelPrefix)); err == nil && id > 0 {
+		return Message{Topic: battleTopic(id)}, true
+	}
+	return Message{}, false
+}
+
+func writeCommand(w io.Writer, args ...string) error {
+	var b strings.Builder
+	fmt.Fprintf(&b, "*%d\r\n", len(args))
+	for _, arg := range args {
+		fmt.Fprintf(&b, "$%d\r\n%s\r\n", len(arg), arg)
+	}
+	_, err := io.WriteString(w, b.String())
+	return err
+}
+
+// readReply parses one RESP2 reply: simple string, error, integer, bulk string or array.
+func readReply(r *bufio.Reader) (interface{}, error) {
+	line, err := r.ReadString('\n')
+	if err != nil {
+		return nil, err
+	}
+	if len(line) < 3 || !strings.HasSuffix(line, "\r\n") {
+		return nil, errors.New("redis: malformed reply")
+	}
+	kind, body := line[0], line[1:len(line)-2]
+	switch kind {
+	case '+':
+		return body, nil
+	case '-':
+		return nil, errors.New("redis: " + body)
+	case ':':
+		return strconv.ParseInt(body, 10, 64)
+	case '$':
+		n, err := strconv.Atoi(body)
+		if err != nil || n < 0 {
+			return nil, err
+		}
+		buf := make([]byte, n+2)
+		if _, err := io.ReadFull(r, buf); err != nil {
+			return nil, err
+		}
+		return string(buf[:n]), nil
+	case '*':
+		n, err := strconv.Atoi(body)
+		if err != nil || n < 0 {
+			return nil, err
+		}
+		items := make([]interface{}, 0, n)
+		for i := 0; i < n; i++ {
+			item, err := readReply(r)
+			if err != nil {
+				return nil, err
+			}
+			items = append(items, item)
+		}
+		return items, nil
+	}
+	return nil, fmt.Errorf("redis: unexpected reply type %q", kind)
+}
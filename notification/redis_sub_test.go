@@ -0,0 +1,91 @@
+package main
+
+import (
+	"bufio"
+	"net"
+	"strings"
+	"testing"
+	"time"
+)
+
+func TestReadReply_ParsesPmessage(t *testing.T) {
+	var raw strings.Builder
+	_ = writeCommand(&raw, "pmessage", userChannelPrefix+"*", userChannelPrefix+"42", `{"event":"victory"}`)
+	reply, err := readReply(bufio.NewReader(strings.NewReader(raw.String())))
+	if err != nil {
+		t.Fatalf("unexpected error: %v", err)
+	}
+	items := reply.([]interface{})
+	if len(items) != 4 || items[0] != "pmessage" || items[2] != userChannelPrefix+"42" || items[3] != `{"event":"victory"}` {
+		t.Fatalf("unexpected reply %#v", reply)
+	}
+}
+
+func TestSubscribeOnce_ForwardsPublishedEventsToHub(t *testing.T) {
+	ln, err := net.Listen("tcp", "127.0.0.1:0")
+	if err != nil {
+		t.Fatal(err)
+	}
+	defer ln.Close()
+
+	commands := make(chan []interface{}, 1)
+	go func() {
+		conn, err := ln.Accept()
+		if err != nil {
+			return
+		}
+		defer conn.Close()
+		cmd, _ := readReply(bufio.NewReader(conn))
+		commands <- cmd.([]interface{})
+		payload := `{"event":"battle_started","payload":{"battle_id":9}}`
+		_ = writeCommand(conn, "psubscribe", userChannelPrefix+"*")
+		_ = writeCommand(conn, "pmessage", userChannelPrefix+"*", userChannelPrefix+"nope", `{"event":"nope"}`)
+		_ = writeCommand(conn, "pmessage", userChannelPrefix+"*", userChannelPrefix+"7", payload)
+		time.Sleep(time.Second)
+	}()
+
+	hub := NewHub()
+	go hub.Run()
+	client := &Client{hub: hub, conn: nil, send: make(chan []byte, 1), userID: "7"}
+	hub.register <- client
+	go func() { _ = subscribeOnce(hub, "redis://"+ln.Addr().String()+"/0") }()
+
+	select {
+	case cmd := <-commands:
+		if len(cmd) != 3 || cmd[0] != "PSUBSCRIBE" || cmd[1] != userChannelPrefix+"*" || cmd[2] != battleChannelPrefix+"*" {
+			t.Fatalf("unexpected command %#v", cmd)
+		}
+	case <-time.After(time.Second):
+		t.Fatal("timed out waiting for PSUBSCRIBE")
+	}
+	select {
+	case msg := <-client.send:
+		if !strings.Contains(string(msg), `"battle_id":9`) {
+			t.Fatalf("unexpected message %s", msg)
+		}
+	case <-time.After(time.Second):
+		t.Fatal("timed out waiting for forwarded event")
+	}
+}
+
+func TestForwardRedisMessage_RoutesBattleChannelsToTopic(t *testing.T) {
+	hub := NewHub()
+	go hub.Run()
+	spectator := &Client{hub: hub, send: make(chan []byte, 1), topic: battleTopic(3)}
+	hub.subscribe <- spectator
+
+	if forwardRedisMessage(hub, battleChannelPrefix+"x", []byte(`{"event":"turn_resolved"}`)) {
+		t.Fatal("expected a malformed battle channel to be ignored")
+	}
+	if !forwardRedisMessage(hub, battleChannelPrefix+"3", []byte(`{"event":"turn_resolved"}`)) {
+		t.Fatal("expected the battle event to be forwarded")
+	}
+	select {
+	case msg := <-spectator.send:
+		if string(msg) != `{"event":"turn_resolved"}` {
+			t.Fatalf("unexpected message %s", msg)
+		}
+	case <-time.After(time.Second):
+		t.Fatal("timed out waiting for forwarded event")
+	}
+}
@@ -1,16 +1,28 @@
 package main
 
-import "github.com/gin-gonic/gin"
+import (
+	"github.com/gin-gonic/gin"
+	"os"
+)
 
 func SetupRouter() *gin.Engine {
 	r := gin.Default()
 	hub := NewHub()
 	go hub.Run()
+	if redisURL := os.Getenv("REDIS_URL"); redisURL != "" {
+		go SubscribeRedis(hub, redisURL)
+	}
 	r.GET("/ws", func(c *gin.Context) {
 		ServeWs(hub, c)
 	})
+	r.GET("/ws/spectate", func(c *gin.Context) {
+		ServeSpectate(hub, c)
+	})
 	r.POST("/notify", func(c *gin.Context) {
 		HttpNotify(hub, c)
 	})
+	r.POST("/notify/batch", func(c *gin.Context) {
+		HttpNotifyBatch(hub, c)
+	})
 	return r
 }
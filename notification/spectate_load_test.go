@@ -0,0 +1,103 @@
+package main
+
+import (
+	"bytes"
+	"net/http"
+	"net/http/httptest"
+	"os"
+	"sort"
+	"strconv"
+	"strings"
+	"sync"
+	"testing"
+	"time"
+
+	"github.com/gin-gonic/gin"
+	"github.com/gorilla/websocket"
+)
+
+// TestSpectateLoad_FansOutOneTurnToManySockets opens NOTIFY_LOAD_CLIENTS (default 10000) spectator sockets on one
+// battle, posts a single turn_resolved and reports how long each socket took to receive it. Each socket is two file
+// descriptors in this process, so raise `ulimit -n` first:
+//
+//	ulimit -n 65536 && NOTIFY_LOAD_TEST=1 go test -run SpectateLoad -v
+func TestSpectateLoad_FansOutOneTurnToManySockets(t *testing.T) {
+	if os.Getenv("NOTIFY_LOAD_TEST") != "1" {
+		t.Skip("set NOTIFY_LOAD_TEST=1 to run the spectator fan-out load test")
+	}
+	clients := 10000
+	if n, err := strconv.Atoi(os.Getenv("NOTIFY_LOAD_CLIENTS")); err == nil && n > 0 {
+		clients = n
+	}
+	t.Setenv("NOTIFY_TOKEN", "secret")
+	t.Setenv("REDIS_URL", "")
+	gin.SetMode(gin.ReleaseMode)
+
+	hub := NewHub()
+	go hub.Run()
+	r := gin.New()
+	r.GET("/ws/spectate", func(c *gin.Context) { ServeSpectate(hub, c) })
+	r.POST("/notify/batch", func(c *gin.Context) { HttpNotifyBatch(hub, c) })
+	srv := httptest.NewServer(r)
+	defer srv.Close()
+
+	wsURL := "ws" + strings.TrimPrefix(srv.URL, "http") + "/ws/spectate?battle_id=1"
+	conns := make([]*websocket.Conn, 0, clients)
+	defer func() {
+		for _, conn := range conns {
+			_ = conn.Close()
+		}
+	}()
+	dialStarted := time.Now()
+	for i := 0; i < clients; i++ {
+		conn, _, err := websocket.DefaultDialer.Dial(wsURL, nil)
+		if err != nil {
+			t.Fatalf("dial %d: %v", i, err)
+		}
+		conns = append(conns, conn)
+	}
+	for hub.Spectators() < int64(clients) {
+		time.Sleep(10 * time.Millisecond)
+	}
+	t.Logf("%d spectators connected in %s", clients, time.Since(dialStarted))
+
+	arrivals := make([]time.Time, clients)
+	var wg sync.WaitGroup
+	for i, conn := range conns {
+		wg.Add(1)
+		go func(i int, conn *websocket.Conn) {
+			defer wg.Done()
+			_ = conn.SetReadDeadline(time.Now().Add(60 * time.Second))
+			if _, _, err := conn.ReadMessage(); err == nil {
+				arrivals[i] = time.Now()
+			}
+		}(i, conn)
+	}
+
+	body := `[{"battle_id":1,"event":"turn_resolved","payload":{"battle_id":1,"turn":1}}]`
+	req, _ := http.NewRequest("POST", srv.URL+"/notify/batch", bytes.NewBufferString(body))
+	req.Header.Set("Authorization", "Bearer secret")
+	req.Header.Set("Content-Type", "application/json")
+	sent := time.Now()
+	resp, err := http.DefaultClient.Do(req)
+	if err != nil {
+		t.Fatal(err)
+	}
+	_ = resp.Body.Close()
+	wg.Wait()
+
+	latencies := make([]time.Duration, 0, clients)
+	for _, at := range arrivals {
+		if !at.IsZero() {
+			latencies = append(latencies, at.Sub(sent))
+		}
+	}
+	if len(latencies) != clients {
+		t.Fatalf("%d of %d spectators did not receive the turn", clients-len(latencies), clients)
+	}
+	sort.Slice(latencies, func(i, j int) bool { return latencies[i] < latencies[j] })
+	t.Logf(
+		"one publish reached %d spectators: p50 %s, p99 %s, max %s",
+		clients, latencies[clients/2], latencies[clients*99/100], latencies[clients-1],
+	)
+}
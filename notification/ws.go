@@ -4,6 +4,20 @@ import (
 	"github.com/gin-gonic/gin"
 	"github.com/gorilla/websocket"
 	"net/http"
+	"strconv"
+	"time"
+)
+
+// spectatorBuffer is how many undelivered events a spectator may fall behind before the hub disconnects it.
+const spectatorBuffer = 64
+
+const (
+	// writeWait bounds each write, so a peer that stopped reading cannot park its writePump forever.
+	writeWait = 10 * time.Second
+	// pongWait is how long readPump waits for any frame, pongs included, before dropping the connection.
+	pongWait = 60 * time.Second
+	// pingPeriod must stay below pongWait so a live peer always answers in time.
+	pingPeriod = pongWait * 9 / 10
 )
 
 var upgrader = websocket.Upgrader{
@@ -15,6 +29,7 @@ type Client struct {
 	conn   *websocket.Conn
 	send   chan []byte
 	userID string
+	topic  string
 }
 
 func ServeWs(hub *Hub, c *gin.Context) {
@@ -28,13 +43,64 @@ func ServeWs(hub *Hub, c *gin.Context) {
 	go client.writePump()
 }
 
+// ServeSpectate subscribes a read-only socket to one battle's topic; it receives the same turn_resolved and
+// battle_ended events the players get, published once per turn however many spectators there are.
+func ServeSpectate(hub *Hub, c *gin.Context) {
+	battleID, err := strconv.Atoi(c.Query("battle_id"))
+	if err != nil || battleID <= 0 {
+		c.JSON(http.StatusBadRequest, gin.H{"error": "battle_id is required"})
+		return
+	}
+	conn, err := upgrader.Upgrade(c.Writer, c.Request, nil)
+	if err != nil {
+		return
+	}
+	client := &Client{hub: hub, conn: conn, send: make(chan []byte, spectatorBuffer), topic: battleTopic(battleID)}
+	hub.subscribe <- client
+	go client.writePump()
+	go client.readPump()
+}
+
 func (c *Client) writePump() {
+	ticker := time.NewTicker(pingPeriod)
 	defer func() {
+		ticker.Stop()
 		_ = c.conn.Close()
 	}()
-	for msg := range c.send {
-		if err := c.conn.WriteMessage(websocket.TextMessage, msg); err != nil {
-			break
+	for {
+		select {
+		case msg, ok := <-c.send:
+			_ = c.conn.SetWriteDeadline(time.Now().Add(writeWait))
+			if !ok {
+				_ = c.conn.WriteMessage(websocket.CloseMessage, []byte{})
+				return
+			}
+			if err := c.conn.WriteMessage(websocket.TextMessage, msg); err != nil {
+				return
+			}
+		case <-ticker.C:
+			_ = c.conn.SetWriteDeadline(time.Now().Add(writeWait))
+			if err := c.conn.WriteMessage(websocket.PingMessage, nil); err != nil {
+				return
+			}
+		}
+	}
+}
+
+// readPump discards whatever a spectator sends and unsubscribes it once the connection is gone or stops answering
+// pings.
+func (c *Client) readPump() {
+	defer func() {
+		c.hub.unsubscribe <- c
+	}()
+	c.conn.SetReadLimit(512)
+	_ = c.conn.SetReadDeadline(time.Now().Add(pongWait))
+	c.conn.SetPongHandler(func(string) error {
+		return c.conn.SetReadDeadline(time.Now().Add(pongWait))
+	})
+	for {
+		if _, _, err := c.conn.ReadMessage(); err != nil {
+			return
 		}
 	}
 }